@@ -0,0 +1,204 @@
+"""
+Batch Converter Module
+Konversi inkremental sekumpulan file Excel (filter sheet, cek manifest, jadwal
+ke worker pool), dipakai oleh command line dan mode watch folder
+"""
+
+import os
+import time
+from xlsx_metadata import XlsxMetadataReader
+from excel_reader import ExcelReader
+from conversion_manifest import ConversionManifest, options_hash, file_hash
+from conversion_scheduler import estimate_sheet_cost, output_filename
+from sheet_filter import SheetFilter
+from job_queue import run_job, DEFAULT_MAX_ATTEMPTS
+
+
+def read_sheets_info(file_path):
+    """Nama sheet dan used range tanpa memuat sel (sama seperti aplikasi GUI)"""
+    try:
+        reader = XlsxMetadataReader(file_path)
+    except Exception as e:
+        print(f"⚠️  Metadata scan failed, loading full workbook: {str(e)}")
+        reader = ExcelReader(file_path, read_only=True)
+
+    try:
+        return reader.get_sheets_info()
+    finally:
+        reader.close()
+
+
+def batch_options_hash(method, converter_settings):
+    """
+    Hash opsi converter untuk manifest
+
+    Args:
+        method (str): 'direct' atau 'table'
+        converter_settings (dict): Argumen constructor converter
+
+    Returns:
+        str: Hash opsi (berubah jika opsi atau gambar watermark berubah)
+    """
+    watermark_image = (converter_settings.get('enable_watermark') and
+                       converter_settings.get('watermark_mode', 'image') == 'image')
+    return options_hash(
+        method=method,
+        watermark_hash=file_hash("watermark.png") if watermark_image else None,
+        **converter_settings
+    )
+
+
+def convert_batch(excel_files, output_directory, scheduler, sheet_filter=None, folder_prefix=False, force=False,
+                  job_queue=None, max_attempts=DEFAULT_MAX_ATTEMPTS):
+    """
+    Konversi file Excel, hanya sheet yang berubah sejak run terakhir
+
+    Setiap file mendapat folder output sendiri (nama file tanpa ekstensi) dengan
+    manifest konversi; sheet yang belum berubah dilewati
+
+    Args:
+        excel_files (list): Path file Excel
+        output_directory (str): Folder output
+        scheduler (ConversionScheduler): Scheduler yang menjalankan konversi
+            (boleh pool yang sudah berjalan, isolate=True jika memakai job_queue)
+        sheet_filter (SheetFilter): Aturan sheet yang diabaikan (default aturan aplikasi)
+        folder_prefix (bool): Beri prefix nama folder pada nama file PDF
+        force (bool): Buat ulang semua sheet
+        job_queue (JobQueue): Optional, simpan sheet yang dikonversi sebagai job di antrian
+            SQLite (bisa dilanjutkan jika proses berhenti, sheet gagal dicoba ulang)
+        max_attempts (int): Batas percobaan per sheet jika memakai job_queue
+
+    Returns:
+        dict: Ringkasan dengan key 'files', 'sheets' (status dan waktu per sheet) dan 'totals'
+            (ditambah 'job_id' jika memakai job_queue)
+    """
+    start = time.perf_counter()
+    sheet_filter = sheet_filter or SheetFilter()
+    options_digest = batch_options_hash(scheduler.method, scheduler.converter_settings)
+
+    summary = {'files': [], 'sheets': []}
+    file_entries = {}
+    readable_files = []  # (file_path, file_output_dir, prefix, sheet_costs)
+
+    for file_path in excel_files:
+        file_path = os.path.abspath(file_path)
+        folder_name = os.path.splitext(os.path.basename(file_path))[0]
+        file_output_dir = os.path.join(output_directory, folder_name)
+        prefix = folder_name if folder_prefix else ""
+        file_entry = {'file': file_path, 'output_dir': os.path.abspath(file_output_dir),
+                      'sheets': 0, 'converted': 0, 'skipped': 0, 'failed': 0, 'error': None}
+        summary['files'].append(file_entry)
+        file_entries[file_path] = file_entry
+
+        try:
+            sheets_info = {sheet_name: info for sheet_name, info in read_sheets_info(file_path).items()
+                           if not sheet_filter.is_ignored(sheet_name)}
+        except Exception as e:
+            file_entry['error'] = str(e)
+            print(f"❌ Error reading {os.path.basename(file_path)}: {str(e)}")
+            continue
+
+        file_entry['sheets'] = len(sheets_info)
+        if sheets_info:
+            os.makedirs(file_output_dir, exist_ok=True)
+            sheet_costs = {sheet_name: estimate_sheet_cost(info) for sheet_name, info in sheets_info.items()}
+            readable_files.append((file_path, file_output_dir, prefix, sheet_costs))
+
+    # Hash dan konversi memakai pool yang sama: dibuat di sini untuk satu batch,
+    # atau pool yang sudah berjalan (mode watch)
+    total_sheets = sum(len(sheet_costs) for _, _, _, sheet_costs in readable_files)
+    started_here = total_sheets > 0 and not scheduler.started
+    if started_here:
+        scheduler.start(total_sheets)
+
+    manifests = {}  # {file_path: (manifest, content_hashes)}
+    # Hasil terakhir per sheet (percobaan ulang menimpa hasil gagal sebelumnya)
+    final_results = {}
+
+    def on_result(result):
+        final_results[(result['file_path'], result['sheet_name'])] = result
+
+    try:
+        # Sheet di-parse untuk hash di worker pool, bukan serial di proses ini
+        all_hashes = scheduler.hash_sheets([(file_path, list(sheet_costs), sheet_costs)
+                                            for file_path, _, _, sheet_costs in readable_files])
+
+        scheduled_files = []
+        for file_path, file_output_dir, prefix, sheet_costs in readable_files:
+            file_entry = file_entries[file_path]
+            manifest = ConversionManifest(file_output_dir)
+            content_hashes = all_hashes[file_path]
+            manifests[file_path] = (manifest, content_hashes)
+
+            sheets_to_convert = list(sheet_costs)
+            if not force:
+                pending = []
+                for sheet_name in sheets_to_convert:
+                    output_path = os.path.join(file_output_dir,
+                                               output_filename(scheduler.method, file_path, sheet_name, prefix))
+                    if manifest.needs_rebuild(sheet_name, content_hashes[sheet_name], options_digest, output_path):
+                        pending.append(sheet_name)
+                    else:
+                        summary['sheets'].append({'file': file_path, 'sheet': sheet_name, 'status': 'skipped',
+                                                  'output': os.path.abspath(output_path), 'seconds': 0.0,
+                                                  'error': None})
+                file_entry['skipped'] = len(sheets_to_convert) - len(pending)
+                sheets_to_convert = pending
+
+            if sheets_to_convert:
+                scheduled_files.append((file_path, sheets_to_convert, file_output_dir, prefix,
+                                        {sheet_name: sheet_costs[sheet_name] for sheet_name in sheets_to_convert}))
+
+        if scheduled_files and job_queue is not None:
+            tasks = [{
+                'file_path': file_path,
+                'sheet_name': sheet_name,
+                'output_directory': file_output_dir,
+                'folder_prefix': prefix,
+                'cost': sheet_costs[sheet_name],
+                'content_hash': manifests[file_path][1][sheet_name],
+                'options_hash': options_digest
+            } for file_path, sheet_names, file_output_dir, prefix, sheet_costs in scheduled_files
+                for sheet_name in sheet_names]
+            summary['job_id'] = job_queue.create_job(scheduler.method, scheduler.converter_settings, tasks)
+            run_job(job_queue, summary['job_id'], scheduler, max_attempts, on_result)
+        elif scheduled_files:
+            scheduler.run(scheduled_files, on_result)
+
+    finally:
+        if started_here:
+            scheduler.shutdown()
+
+    for (file_path, sheet_name), result in final_results.items():
+        file_entry = file_entries[file_path]
+        manifest, content_hashes = manifests[file_path]
+        if result['success']:
+            file_entry['converted'] += 1
+            manifest.record(sheet_name, file_path, content_hashes[sheet_name], options_digest, result['output_file'])
+        else:
+            file_entry['failed'] += 1
+            manifest.forget(sheet_name)
+
+        summary['sheets'].append({
+            'file': file_path,
+            'sheet': sheet_name,
+            'status': 'converted' if result['success'] else 'failed',
+            'output': os.path.abspath(result['output_file']) if result['output_file'] else None,
+            'seconds': round(result['seconds'], 4),
+            'attempts': result.get('attempts', 1),
+            'error': result['error']
+        })
+
+    for manifest, _ in manifests.values():
+        manifest.save()
+
+    summary['totals'] = {
+        'files': len(excel_files),
+        'sheets': sum(entry['sheets'] for entry in summary['files']),
+        'converted': sum(entry['converted'] for entry in summary['files']),
+        'skipped': sum(entry['skipped'] for entry in summary['files']),
+        'failed': sum(entry['failed'] for entry in summary['files']),
+        'file_errors': sum(1 for entry in summary['files'] if entry['error']),
+        'seconds': round(time.perf_counter() - start, 3)
+    }
+    return summary
@@ -0,0 +1,162 @@
+"""
+Benchmark render engine tabel: platypus Table vs CanvasGridRenderer
+
+Penggunaan:
+    python benchmark_render_engines.py                       # tabel sintetis
+    python benchmark_render_engines.py --rows 2000 --cols 8
+    python benchmark_render_engines.py --excel sample_data.xlsx
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+from reportlab.lib import colors
+from reportlab.lib.units import mm
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.platypus import SimpleDocTemplate
+from canvas_grid_renderer import RENDER_ENGINES
+from pdf_converter import PDFConverter
+
+
+def make_synthetic_data(num_rows, num_cols, seed=0):
+    """
+    Data tabel acak mirip slip gaji (teks komponen dan angka)
+
+    Args:
+        num_rows (int): Jumlah baris termasuk header
+        num_cols (int): Jumlah kolom
+        seed (int): Seed random agar hasil bisa diulang
+
+    Returns:
+        list: Data tabel
+    """
+    rnd = random.Random(seed)
+    data = [[f"Kolom {col_idx + 1}" for col_idx in range(num_cols)]]
+    for row_idx in range(1, num_rows):
+        data.append([
+            f"Komponen {row_idx}-{col_idx}" if col_idx % 2 == 0 else str(rnd.randint(100000, 9999999))
+            for col_idx in range(num_cols)
+        ])
+    return data
+
+
+def make_synthetic_formatting(num_rows, num_cols, seed=0):
+    """Command per sel seperti hasil _apply_excel_formatting (bold, warna, alignment)"""
+    rnd = random.Random(seed)
+    cell_commands = []
+    for row_idx in range(1, num_rows):
+        for col_idx in range(num_cols):
+            if col_idx % 2 == 1:
+                cell_commands.append(('ALIGN', (col_idx, row_idx), (col_idx, row_idx), 'RIGHT'))
+            if rnd.random() < 0.1:
+                cell_commands.append(('FONTNAME', (col_idx, row_idx), (col_idx, row_idx), 'Helvetica-Bold'))
+            if rnd.random() < 0.05:
+                cell_commands.append(('BACKGROUND', (col_idx, row_idx), (col_idx, row_idx), colors.Color(1, 1, 0.8)))
+    return cell_commands
+
+
+def build_pdf(converter, data, cell_commands, output_file):
+    """Build satu PDF tabel dengan engine milik converter"""
+    num_cols = len(data[0])
+    page_size = landscape(A4) if num_cols > 5 else A4
+    doc = SimpleDocTemplate(output_file, pagesize=page_size, rightMargin=20*mm, leftMargin=20*mm,
+                            topMargin=20*mm, bottomMargin=20*mm)
+    table_style = converter._create_simple_table_style(len(data))
+    for command in converter.style_compiler.merge_cell_commands(cell_commands):
+        table_style.add(*command)
+    available_width = page_size[0] - 40*mm
+    table = converter._create_table(data, table_style, [available_width / num_cols] * num_cols)
+    doc.build([table])
+
+
+def benchmark_synthetic(num_rows, num_cols, repeat, output_dir):
+    """
+    Ukur waktu build PDF tabel sintetis untuk setiap engine
+
+    Returns:
+        dict: {engine: (detik terbaik, ukuran PDF)}
+    """
+    data = make_synthetic_data(num_rows, num_cols)
+    cell_commands = make_synthetic_formatting(num_rows, num_cols)
+    results = {}
+
+    for engine in RENDER_ENGINES:
+        converter = PDFConverter(render_engine=engine)
+        output_file = os.path.join(output_dir, f"synthetic_{engine}.pdf")
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            build_pdf(converter, data, cell_commands, output_file)
+            timings.append(time.perf_counter() - start)
+        results[engine] = (min(timings), os.path.getsize(output_file))
+
+    return results
+
+
+def benchmark_excel(excel_file, repeat, output_dir):
+    """
+    Ukur waktu konversi semua sheet Excel dengan PDFConverterDirect untuk setiap engine
+
+    Returns:
+        dict: {engine: (detik terbaik, total ukuran PDF)}
+    """
+    from pdf_converter_direct import PDFConverterDirect
+    from excel_reader import ExcelReader
+
+    reader = ExcelReader(excel_file)
+    sheet_names = reader.get_sheet_names()
+    reader.close()
+
+    results = {}
+    for engine in RENDER_ENGINES:
+        converter = PDFConverterDirect(enable_watermark=False, use_slip_templates=False, render_engine=engine)
+        engine_dir = os.path.join(output_dir, engine)
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            converter.convert_excel_to_pdf_direct(excel_file, sheet_names, engine_dir)
+            timings.append(time.perf_counter() - start)
+        total_size = sum(os.path.getsize(os.path.join(root, name))
+                         for root, _, files in os.walk(engine_dir) for name in files)
+        results[engine] = (min(timings), total_size)
+
+    return results
+
+
+def main(argv=None):
+    """Jalankan benchmark dan tampilkan perbandingan engine"""
+    parser = argparse.ArgumentParser(description="Bandingkan render engine 'table' dan 'canvas'")
+    parser.add_argument('--rows', type=int, default=1000, help="Jumlah baris tabel sintetis")
+    parser.add_argument('--cols', type=int, default=6, help="Jumlah kolom tabel sintetis")
+    parser.add_argument('--repeat', type=int, default=3, help="Jumlah ulangan, waktu terbaik yang dipakai")
+    parser.add_argument('--excel', default=None, help="Benchmark file Excel (semua sheet) alih-alih tabel sintetis")
+    parser.add_argument('--output-dir', default=None, help="Folder output PDF (default: folder sementara)")
+    args = parser.parse_args(argv)
+
+    output_dir = args.output_dir or tempfile.mkdtemp(prefix='render-bench-')
+    os.makedirs(output_dir, exist_ok=True)
+
+    if args.excel:
+        print(f"📊 Benchmark: {args.excel}")
+        results = benchmark_excel(args.excel, args.repeat, output_dir)
+    else:
+        print(f"📊 Benchmark: tabel sintetis {args.rows} x {args.cols}")
+        results = benchmark_synthetic(args.rows, args.cols, args.repeat, output_dir)
+
+    print(f"{'Engine':<10}{'Waktu (s)':>12}{'Ukuran (KB)':>14}")
+    for engine, (seconds, size) in results.items():
+        print(f"{engine:<10}{seconds:>12.3f}{size / 1024:>14.1f}")
+
+    table_time = results['table'][0]
+    canvas_time = results['canvas'][0]
+    if canvas_time > 0:
+        print(f"⚡ Canvas engine {table_time / canvas_time:.2f}x dibanding Table")
+    print(f"📁 Output: {output_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,406 @@
+"""
+Canvas Grid Renderer Module
+Alternatif platypus Table untuk sheet dengan grid tetap: posisi sel dihitung
+sekali dari lebar kolom dan tinggi baris, lalu background, teks dan garis
+digambar langsung ke canvas (fill dan garis digabung menjadi path)
+"""
+
+from collections import namedtuple
+from reportlab.lib import colors
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.platypus import Flowable, TableStyle
+
+RENDER_ENGINES = ('table', 'canvas')
+
+# Atribut style sel, default sama dengan CellStyle reportlab
+GridCellStyle = namedtuple('GridCellStyle', [
+    'fontname', 'fontsize', 'leading', 'color', 'alignment', 'valign',
+    'left_padding', 'right_padding', 'top_padding', 'bottom_padding'
+])
+_DEFAULT_CELL_STYLE = GridCellStyle('Helvetica', 10, 12, colors.black, 'LEFT', 'BOTTOM', 6, 6, 3, 3)
+
+# Op TableStyle -> (index atribut GridCellStyle, konversi nilai)
+_CELL_OPS = {
+    'FONTNAME': (0, None), 'FACE': (0, None),
+    'FONTSIZE': (1, None), 'SIZE': (1, None),
+    'LEADING': (2, None),
+    'TEXTCOLOR': (3, lambda value: colors.toColor(value, colors.Color(0, 0, 0))),
+    'ALIGN': (4, None), 'ALIGNMENT': (4, None),
+    'VALIGN': (5, None),
+    'LEFTPADDING': (6, None), 'RIGHTPADDING': (7, None),
+    'TOPPADDING': (8, None), 'BOTTOMPADDING': (9, None),
+}
+_LINE_OPS = ('GRID', 'BOX', 'OUTLINE', 'INNERGRID', 'LINEBELOW', 'LINEABOVE', 'LINEBEFORE', 'LINEAFTER')
+_ALIGNMENTS = ('LEFT', 'CENTER', 'CENTRE', 'RIGHT')
+
+
+def _color_key(color):
+    """Key hashable untuk mengelompokkan fill dengan warna sama"""
+    return (color.__class__, color.rgba())
+
+
+class _GridLayout:
+    def __init__(self, data, style, col_widths):
+        """
+        Hitung style per sel, tinggi baris dan posisi kolom (sekali per tabel)
+
+        Args:
+            data (list): Data tabel (list of lists)
+            style (TableStyle): Style tabel
+            col_widths (list): Lebar setiap kolom
+        """
+        self.values = [["" if value is None else str(value) for value in row] for row in data]
+        self.num_rows = len(self.values)
+        self.num_cols = len(self.values[0]) if self.values else 0
+        if len(col_widths) != self.num_cols:
+            raise Exception(f"Jumlah lebar kolom ({len(col_widths)}) tidak sama dengan jumlah kolom ({self.num_cols})")
+
+        self.col_positions = [0]
+        for width in col_widths:
+            self.col_positions.append(self.col_positions[-1] + width)
+        self.width = self.col_positions[-1]
+
+        commands = style.getCommands() if isinstance(style, TableStyle) else list(style or [])
+
+        # Satu grid per atribut, command range diterapkan dengan slice assignment
+        attribute_grids = [[[default] * self.num_cols for _ in range(self.num_rows)]
+                           for default in _DEFAULT_CELL_STYLE]
+        self.background_commands = []
+        self.line_commands = []
+        self._fill_colors = {}  # {key warna: Color}, warna sama memakai object yang sama
+
+        for command in commands:
+            op = command[0]
+            sc, sr, ec, er = self._normalize_range(command)
+            if op == 'BACKGROUND':
+                self.background_commands.append((op, sc, sr, ec, er, self._fill_color(command[3])))
+            elif op == 'ROWBACKGROUNDS':
+                cycle = [colors.toColorOrNone(value) for value in command[3]]
+                self.background_commands.append((op, sc, sr, ec, er, [self._check_fill(color) for color in cycle]))
+            elif op in _LINE_OPS:
+                self.line_commands.append(self._line_command(command, sc, sr, ec, er))
+            elif op in _CELL_OPS:
+                index, convert = _CELL_OPS[op]
+                value = command[3]
+                if convert:
+                    value = convert(value)
+                if index == 4 and value not in _ALIGNMENTS:
+                    raise Exception(f"Alignment '{value}' tidak didukung canvas engine")
+                grid = attribute_grids[index]
+                for row_idx in range(sr, er + 1):
+                    grid[row_idx][sc:ec + 1] = [value] * (ec - sc + 1)
+            elif op == 'FONT':
+                values = command[3:]
+                for row_idx in range(sr, er + 1):
+                    attribute_grids[0][row_idx][sc:ec + 1] = [values[0]] * (ec - sc + 1)
+                    if len(values) > 1:
+                        leading = values[2] if len(values) > 2 else values[1] * 1.2
+                        attribute_grids[1][row_idx][sc:ec + 1] = [values[1]] * (ec - sc + 1)
+                        attribute_grids[2][row_idx][sc:ec + 1] = [leading] * (ec - sc + 1)
+            else:
+                raise Exception(f"Command '{op}' tidak didukung canvas engine")
+
+        # Style sel yang identik memakai object yang sama
+        interned = {}
+        self.cell_styles = []
+        for row_idx in range(self.num_rows):
+            row_styles = []
+            for values in zip(*(grid[row_idx] for grid in attribute_grids)):
+                cell_style = interned.get(values)
+                if cell_style is None:
+                    cell_style = interned[values] = GridCellStyle(*values)
+                row_styles.append(cell_style)
+            self.cell_styles.append(row_styles)
+
+        # Tinggi baris seperti Table: leading * jumlah baris teks + padding
+        self.row_heights = []
+        for row, row_styles in zip(self.values, self.cell_styles):
+            height = 0
+            for value, cell_style in zip(row, row_styles):
+                cell_height = ((cell_style.leading or 1.2 * cell_style.fontsize) * (value.count('\n') + 1)
+                               + cell_style.top_padding + cell_style.bottom_padding)
+                if cell_height > height:
+                    height = cell_height
+            self.row_heights.append(height)
+
+    def _normalize_range(self, command):
+        """Range command dengan index negatif di-resolve dan dibatasi ke ukuran tabel"""
+        (sc, sr), (ec, er) = command[1:3]
+        if isinstance(sr, str) or isinstance(er, str):
+            raise Exception(f"Baris khusus '{sr}' tidak didukung canvas engine")
+        if sc < 0: sc += self.num_cols
+        if ec < 0: ec += self.num_cols
+        if sr < 0: sr += self.num_rows
+        if er < 0: er += self.num_rows
+        return max(0, sc), max(0, sr), min(self.num_cols - 1, ec), min(self.num_rows - 1, er)
+
+    def _fill_color(self, value):
+        if callable(value) or isinstance(value, (list, tuple)):
+            raise Exception("Background gradient/callable tidak didukung canvas engine")
+        return self._check_fill(colors.toColorOrNone(value))
+
+    def _check_fill(self, color):
+        # Fill digabung per warna akhir sel, hanya benar untuk warna tanpa transparansi
+        if color is None:
+            return None
+        if getattr(color, 'alpha', 1) != 1:
+            raise Exception("Background transparan tidak didukung canvas engine")
+        return self._fill_colors.setdefault(_color_key(color), color)
+
+    def _line_command(self, command, sc, sr, ec, er):
+        values = list(command[3:])
+        weight, color = values[0], colors.toColor(values[1])
+        cap = values[2] if len(values) > 2 else 1
+        dash = values[3] if len(values) > 3 else None
+        join = values[4] if len(values) > 4 else 1
+        count = values[5] if len(values) > 5 else 1
+        if isinstance(cap, str) or isinstance(join, str):
+            raise Exception("Line cap/join berupa nama tidak didukung canvas engine")
+        if count not in (None, 1):
+            raise Exception("Garis ganda tidak didukung canvas engine")
+        return (command[0], sc, sr, ec, er, (weight, color, cap, tuple(dash) if dash else None, join))
+
+
+class CanvasGridRenderer(Flowable):
+    def __init__(self, data, style=None, col_widths=None):
+        """
+        Initialize renderer, layout dihitung sekali untuk seluruh tabel
+
+        Args:
+            data (list): Data tabel (list of lists)
+            style (TableStyle): Style tabel (op yang sama dengan platypus Table;
+                SPAN, gradient dan baris khusus tidak didukung)
+            col_widths (list): Lebar kolom tetap
+        """
+        Flowable.__init__(self)
+        if not data:
+            raise Exception("Data tabel kosong")
+        if col_widths is None:
+            raise Exception("Canvas engine membutuhkan lebar kolom tetap")
+        self._setup(_GridLayout(data, style, col_widths), 0, len(data))
+
+    @classmethod
+    def _from_layout(cls, layout, start_row, end_row):
+        """Potongan baris dari layout yang sama (hasil split)"""
+        piece = cls.__new__(cls)
+        Flowable.__init__(piece)
+        piece._setup(layout, start_row, end_row)
+        return piece
+
+    def _setup(self, layout, start_row, end_row):
+        self.layout = layout
+        self.start_row = start_row
+        self.end_row = end_row
+        self.hAlign = 'CENTER'
+        self.width = layout.width
+        self.height = sum(layout.row_heights[start_row:end_row])
+
+    def wrap(self, availWidth, availHeight):
+        return self.width, self.height
+
+    def split(self, availWidth, availHeight):
+        """Pecah per baris seperti Table (baris tidak pernah dipotong)"""
+        height = 0
+        split_row = self.start_row
+        for row_height in self.layout.row_heights[self.start_row:self.end_row]:
+            if height + row_height > availHeight:
+                break
+            height += row_height
+            split_row += 1
+
+        if split_row == self.start_row:
+            return []
+        if split_row == self.end_row:
+            return [self]
+        return [
+            self._from_layout(self.layout, self.start_row, split_row),
+            self._from_layout(self.layout, split_row, self.end_row)
+        ]
+
+    def draw(self):
+        # Posisi y tepi atas setiap baris (index lokal), paling bawah = 0
+        row_positions = [self.height]
+        for row_height in self.layout.row_heights[self.start_row:self.end_row]:
+            row_positions.append(row_positions[-1] - row_height)
+
+        canv = self.canv
+        canv.saveState()
+        self._draw_backgrounds(canv, row_positions)
+        self._draw_text(canv, row_positions)
+        self._draw_lines(canv, row_positions)
+        canv.restoreState()
+
+    def _draw_backgrounds(self, canv, row_positions):
+        """Fill akhir setiap sel, satu path per warna dengan run horizontal digabung"""
+        layout = self.layout
+        start_row, end_row = self.start_row, self.end_row
+        fills = [[None] * layout.num_cols for _ in range(end_row - start_row)]
+
+        for op, sc, sr, ec, er, value in layout.background_commands:
+            first, last = max(sr, start_row), min(er, end_row - 1)
+            for row_idx in range(first, last + 1):
+                if op == 'ROWBACKGROUNDS':
+                    # Table mengulang siklus warna dari baris pertama setiap potongan
+                    color = value[(row_idx - first) % len(value)]
+                else:
+                    color = value
+                if color is not None:
+                    fills[row_idx - start_row][sc:ec + 1] = [color] * (ec - sc + 1)
+
+        paths = {}
+        col_positions = layout.col_positions
+        for local_row, row_fills in enumerate(fills):
+            y = row_positions[local_row + 1]
+            height = row_positions[local_row] - y
+            col_idx = 0
+            while col_idx < layout.num_cols:
+                color = row_fills[col_idx]
+                run_end = col_idx
+                while run_end + 1 < layout.num_cols and row_fills[run_end + 1] is color:
+                    run_end += 1
+                if color is not None:
+                    key = _color_key(color)
+                    if key not in paths:
+                        paths[key] = (color, canv.beginPath())
+                    x = col_positions[col_idx]
+                    paths[key][1].rect(x, y, col_positions[run_end + 1] - x, height)
+                col_idx = run_end + 1
+
+        for color, path in paths.values():
+            canv.setFillColor(color)
+            canv.drawPath(path, stroke=0, fill=1)
+
+    def _draw_text(self, canv, row_positions):
+        """Teks semua sel dalam satu text object"""
+        layout = self.layout
+        col_positions = layout.col_positions
+        text = canv.beginText()
+        current_font = current_color = None
+
+        for local_row, row_idx in enumerate(range(self.start_row, self.end_row)):
+            row_top = row_positions[local_row]
+            row_bottom = row_positions[local_row + 1]
+            row_height = row_top - row_bottom
+            for col_idx, (value, cell_style) in enumerate(zip(layout.values[row_idx], layout.cell_styles[row_idx])):
+                if not value:
+                    continue
+
+                font = (cell_style.fontname, cell_style.fontsize, cell_style.leading)
+                if font != current_font:
+                    text.setFont(*font)
+                    current_font = font
+                if cell_style.color != current_color:
+                    text.setFillColor(cell_style.color)
+                    current_color = cell_style.color
+
+                lines = value.split('\n')
+                leading, fontsize = cell_style.leading, cell_style.fontsize
+                if cell_style.valign == 'TOP':
+                    y = row_top - cell_style.top_padding - fontsize
+                elif cell_style.valign == 'MIDDLE':
+                    y = row_bottom + (cell_style.bottom_padding + row_height - cell_style.top_padding
+                                      + len(lines) * leading) / 2.0 - fontsize
+                else:
+                    y = row_bottom + cell_style.bottom_padding + len(lines) * leading - fontsize
+
+                col_left = col_positions[col_idx]
+                col_width = col_positions[col_idx + 1] - col_left
+                for line in lines:
+                    if cell_style.alignment == 'LEFT':
+                        x = col_left + cell_style.left_padding
+                    elif cell_style.alignment == 'RIGHT':
+                        x = col_left + col_width - cell_style.right_padding - stringWidth(line, *font[:2])
+                    else:
+                        x = (col_left + (col_width + cell_style.left_padding - cell_style.right_padding) * 0.5
+                             - stringWidth(line, *font[:2]) * 0.5)
+                    text.setTextOrigin(x, y)
+                    text.textOut(line)
+                    y -= leading
+
+        canv.drawText(text)
+
+    def _line_segments(self, op, sc, sr, ec, er, row_positions):
+        """
+        Segmen garis satu command untuk potongan ini, mengikuti cara Table
+        memecah command garis saat split
+
+        Returns:
+            list: List (x0, y0, x1, y1)
+        """
+        start_row, end_row = self.start_row, self.end_row
+        col_positions = self.layout.col_positions
+        segments = []
+
+        # Garis horizontal: index batas b = tepi atas baris b
+        if op == 'LINEABOVE':
+            boundaries = range(sr, er + 1)
+        elif op == 'LINEBELOW':
+            boundaries = range(sr + 1, er + 2)
+        elif op in ('GRID', 'INNERGRID'):
+            boundaries = range(sr + 1, er + 1)
+        else:
+            boundaries = ()
+        # Garis di dalam range muncul di kedua sisi potongan
+        boundaries = [b for b in boundaries if start_row <= b <= end_row]
+        if op in ('GRID', 'BOX', 'OUTLINE'):
+            # Tepi luar hanya di potongan yang memuat baris tepi tersebut
+            if start_row <= sr < end_row:
+                boundaries.append(sr)
+            if start_row <= er < end_row:
+                boundaries.append(er + 1)
+
+        x0, x1 = col_positions[sc], col_positions[ec + 1]
+        for boundary in boundaries:
+            y = row_positions[boundary - start_row]
+            segments.append((x0, y, x1, y))
+
+        # Garis vertikal dibatasi ke baris potongan ini
+        first, last = max(sr, start_row), min(er, end_row - 1)
+        if first <= last:
+            if op == 'LINEBEFORE':
+                columns = range(sc, ec + 1)
+            elif op == 'LINEAFTER':
+                columns = range(sc + 1, ec + 2)
+            elif op == 'GRID':
+                columns = range(sc, ec + 2)
+            elif op == 'INNERGRID':
+                columns = range(sc + 1, ec + 1)
+            elif op in ('BOX', 'OUTLINE'):
+                columns = (sc, ec + 1)
+            else:
+                columns = ()
+            y0, y1 = row_positions[last + 1 - start_row], row_positions[first - start_row]
+            for col_idx in columns:
+                x = col_positions[col_idx]
+                segments.append((x, y1, x, y0))
+
+        return segments
+
+    def _draw_lines(self, canv, row_positions):
+        """Garis per command, command berurutan dengan style sama jadi satu path"""
+        groups = []
+        for op, sc, sr, ec, er, line_style in self.layout.line_commands:
+            segments = self._line_segments(op, sc, sr, ec, er, row_positions)
+            if not segments:
+                continue
+            if groups and groups[-1][0] == line_style:
+                groups[-1][1].extend(segments)
+            else:
+                groups.append((line_style, segments))
+
+        for (weight, color, cap, dash, join), segments in groups:
+            canv.setLineWidth(weight)
+            canv.setStrokeColor(color)
+            if cap is not None:
+                canv.setLineCap(cap)
+            if join is not None:
+                canv.setLineJoin(join)
+            if dash:
+                canv.setDash(list(dash))
+            else:
+                canv.setDash()
+            path = canv.beginPath()
+            for x0, y0, x1, y1 in segments:
+                path.moveTo(x0, y0)
+                path.lineTo(x1, y1)
+            canv.drawPath(path, stroke=1, fill=0)
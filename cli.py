@@ -0,0 +1,298 @@
+"""
+Command line batch conversion Excel ke PDF (tanpa GUI)
+
+Penggunaan:
+    python cli.py gaji/*.xlsx -o output
+    python cli.py gaji/ -o output --method table --workers 4
+    python cli.py gaji_januari.xlsx -o output --watermark --watermark-mode text --watermark-text RAHASIA
+    python cli.py gaji/*.xlsx -o output --include "Slip*" --exclude "*Rekap*" --summary-file hasil.json
+    python cli.py gaji_masuk/ -o output --watch
+    python cli.py -o output --resume
+
+Ringkasan JSON ditulis ke stdout (log konversi ke stderr). Exit code 0 jika
+semua sheet berhasil, 1 jika ada sheet atau file yang gagal, 2 jika argumen salah.
+Dengan --watch folder dipantau terus, ringkasan setiap batch ditulis sebagai satu baris JSON.
+Setiap batch dicatat di antrian SQLite (default <output>/.conversion_jobs.sqlite3);
+jika proses berhenti di tengah, --resume melanjutkan job tanpa mengulang sheet yang
+sudah selesai dan mencoba ulang sheet yang gagal (maksimal --max-attempts kali)
+"""
+
+import os
+import sys
+import glob
+import json
+import time
+import argparse
+from contextlib import redirect_stdout
+from watermark_manager import WATERMARK_MODES, DEFAULT_WATERMARK_TEXT
+from conversion_scheduler import ConversionScheduler, SCHEDULER_METHODS
+from sheet_filter import SheetFilter, DEFAULT_IGNORED_EXACT, DEFAULT_IGNORED_KEYWORDS
+from batch_converter import convert_batch
+from job_queue import JobQueue, run_job, DEFAULT_QUEUE_FILENAME, DEFAULT_MAX_ATTEMPTS
+from folder_watcher import FolderWatcher, EXCEL_EXTENSIONS, DEFAULT_POLL_INTERVAL, DEFAULT_SETTLE_SECONDS
+
+
+def expand_inputs(inputs):
+    """
+    Daftar file Excel dari path, folder atau pola glob
+
+    Args:
+        inputs (list): Path file, folder (semua file Excel di dalamnya) atau pola glob
+
+    Returns:
+        tuple: (list path file unik sesuai urutan, list input yang tidak ditemukan)
+    """
+    files, missing = [], []
+    for pattern in inputs:
+        if os.path.isdir(pattern):
+            matches = sorted(os.path.join(pattern, name) for name in os.listdir(pattern))
+        else:
+            matches = sorted(glob.glob(pattern)) or ([pattern] if os.path.isfile(pattern) else [])
+
+        matches = [path for path in matches
+                   if path.lower().endswith(EXCEL_EXTENSIONS) and not os.path.basename(path).startswith('~$')]
+        if not matches:
+            missing.append(pattern)
+
+        for path in matches:
+            path = os.path.abspath(path)
+            if path not in files:
+                files.append(path)
+
+    return files, missing
+
+
+def build_parser():
+    """Argument parser command line"""
+    parser = argparse.ArgumentParser(description="Konversi slip gaji Excel ke PDF tanpa GUI")
+    parser.add_argument('inputs', nargs='*', help="File Excel, folder atau pola glob (contoh 'gaji/*.xlsx')")
+    parser.add_argument('-o', '--output-dir', required=True, help="Folder output (satu subfolder per file Excel)")
+    parser.add_argument('--method', choices=SCHEDULER_METHODS, default='direct', help="Metode konversi")
+    parser.add_argument('--workers', type=int, default=None, help="Jumlah proses (default jumlah CPU)")
+    parser.add_argument('--folder-prefix', action='store_true',
+                        help="Beri prefix nama folder pada nama file PDF (seperti 'Set Folder Name' di aplikasi)")
+    parser.add_argument('--force', action='store_true', help="Buat ulang semua sheet, abaikan manifest")
+
+    watermark = parser.add_argument_group('watermark')
+    watermark.add_argument('--watermark', action='store_true', help="Tambahkan watermark")
+    watermark.add_argument('--watermark-mode', choices=WATERMARK_MODES, default='image',
+                           help="'image' (watermark.png di folder kerja) atau 'text'")
+    watermark.add_argument('--watermark-text', default=DEFAULT_WATERMARK_TEXT, help="Teks watermark mode 'text'")
+    watermark.add_argument('--opacity', type=float, default=0.3, help="Transparansi watermark (0.0-1.0)")
+    watermark.add_argument('--position', default='bottom-right', help="Posisi watermark")
+
+    table = parser.add_argument_group('method table')
+    table.add_argument('--no-preserve-format', action='store_true', help="Jangan pertahankan formatting Excel")
+
+    sheets = parser.add_argument_group('filter sheet')
+    sheets.add_argument('--include', action='append', default=[], metavar='PATTERN',
+                        help="Hanya sheet yang cocok pola glob ini (boleh diulang)")
+    sheets.add_argument('--exclude', action='append', default=[], metavar='PATTERN',
+                        help="Abaikan sheet yang cocok pola glob ini (boleh diulang)")
+    sheets.add_argument('--no-default-ignore', action='store_true',
+                        help="Jangan abaikan sheet payroll adjust, database, summary, dll")
+
+    parser.add_argument('--summary-file', default=None, help="Tulis ringkasan JSON ke file ini juga")
+
+    watch = parser.add_argument_group('watch folder')
+    watch.add_argument('--watch', action='store_true',
+                       help="Pantau folder input terus-menerus dan konversi workbook baru/berubah")
+    watch.add_argument('--poll-interval', type=float, default=DEFAULT_POLL_INTERVAL, help="Jeda scan folder (detik)")
+    watch.add_argument('--settle', type=float, default=DEFAULT_SETTLE_SECONDS,
+                       help="Lama file tidak berubah sebelum dikonversi (detik)")
+
+    queue = parser.add_argument_group('antrian job')
+    queue.add_argument('--queue-db', default=None,
+                       help=f"File SQLite antrian job (default <output>/{DEFAULT_QUEUE_FILENAME})")
+    queue.add_argument('--resume', action='store_true',
+                       help="Lanjutkan job yang belum selesai (sheet selesai dilewati, sheet gagal dicoba ulang)")
+    queue.add_argument('--job-id', type=int, default=None, help="Lanjutkan job ini saja (dengan --resume)")
+    queue.add_argument('--max-attempts', type=int, default=DEFAULT_MAX_ATTEMPTS,
+                       help="Batas percobaan per sheet")
+    return parser
+
+
+def create_sheet_filter(args):
+    """SheetFilter dari argumen command line"""
+    return SheetFilter(
+        ignored_exact=() if args.no_default_ignore else DEFAULT_IGNORED_EXACT,
+        ignored_keywords=() if args.no_default_ignore else DEFAULT_IGNORED_KEYWORDS,
+        include_patterns=args.include,
+        exclude_patterns=args.exclude
+    )
+
+
+def create_scheduler(args, isolate=False):
+    """ConversionScheduler dengan opsi converter dari argumen command line (isolate untuk job queue)"""
+    if args.method == 'direct':
+        converter_settings = {}
+    else:
+        converter_settings = {'preserve_formatting': not args.no_preserve_format, 'bulk_mode': True, 'streaming': True}
+    converter_settings.update({
+        'enable_watermark': args.watermark,
+        'watermark_opacity': args.opacity,
+        'watermark_position': args.position,
+        'watermark_mode': args.watermark_mode,
+        'watermark_text': args.watermark_text
+    })
+    return ConversionScheduler(args.method, converter_settings, args.workers, isolate)
+
+
+def open_job_queue(args):
+    """JobQueue dari --queue-db (default di folder output)"""
+    return JobQueue(args.queue_db or os.path.join(args.output_dir, DEFAULT_QUEUE_FILENAME))
+
+
+def run_batch(args):
+    """
+    Jalankan batch konversi
+
+    Args:
+        args (argparse.Namespace): Argumen command line
+
+    Returns:
+        dict: Ringkasan JSON (files, sheets, totals)
+    """
+    start = time.perf_counter()
+    excel_files, missing = expand_inputs(args.inputs)
+
+    summary = {
+        'method': args.method,
+        'output_dir': os.path.abspath(args.output_dir),
+        'missing_inputs': missing
+    }
+    job_queue = open_job_queue(args)
+    try:
+        summary.update(convert_batch(excel_files, args.output_dir, create_scheduler(args, isolate=True),
+                                     sheet_filter=create_sheet_filter(args),
+                                     folder_prefix=args.folder_prefix, force=args.force,
+                                     job_queue=job_queue, max_attempts=args.max_attempts))
+    finally:
+        job_queue.close()
+
+    summary['totals']['file_errors'] += len(missing)
+    summary['totals']['seconds'] = round(time.perf_counter() - start, 3)
+    return summary
+
+
+def run_resume(args):
+    """
+    Lanjutkan job di antrian yang belum selesai
+
+    Args:
+        args (argparse.Namespace): Argumen command line
+
+    Returns:
+        dict: Ringkasan JSON (jobs, sheets, totals)
+    """
+    start = time.perf_counter()
+    summary = {'queue_db': None, 'jobs': [], 'sheets': [], 'missing_jobs': []}
+    job_queue = open_job_queue(args)
+    summary['queue_db'] = os.path.abspath(job_queue.db_path)
+
+    try:
+        job_ids = [args.job_id] if args.job_id is not None else job_queue.unfinished_jobs()
+        for job_id in job_ids:
+            job = job_queue.get_job(job_id)
+            if job is None:
+                summary['missing_jobs'].append(job_id)
+                continue
+
+            with ConversionScheduler(job['method'], job['settings'], args.workers, isolate=True) as scheduler:
+                status = run_job(job_queue, job_id, scheduler, args.max_attempts)
+            counts = job_queue.task_counts(job_id)
+            summary['jobs'].append({'id': job_id, 'method': job['method'], 'status': status,
+                                    'sheets': counts['total'], 'done': counts['done'],
+                                    'failed': counts['failed']})
+
+            for task in job_queue.job_tasks(job_id):
+                summary['sheets'].append({
+                    'job_id': job_id,
+                    'file': task['file_path'],
+                    'sheet': task['sheet_name'],
+                    'status': 'converted' if task['status'] == 'done' else task['status'],
+                    'output': os.path.abspath(task['output_path']) if task['output_path'] else None,
+                    'seconds': round(task['seconds'] or 0.0, 4),
+                    'attempts': task['attempts'],
+                    'error': task['error']
+                })
+    finally:
+        job_queue.close()
+
+    summary['totals'] = {
+        'jobs': len(summary['jobs']),
+        'sheets': sum(job['sheets'] for job in summary['jobs']),
+        'converted': sum(job['done'] for job in summary['jobs']),
+        'failed': sum(job['sheets'] - job['done'] for job in summary['jobs']),
+        'missing_jobs': len(summary['missing_jobs']),
+        'seconds': round(time.perf_counter() - start, 3)
+    }
+    return summary
+
+
+def run_watch(args):
+    """
+    Mode watch: pantau folder input sampai dihentikan (Ctrl+C)
+
+    Returns:
+        int: Exit code
+    """
+    if len(args.inputs) != 1 or not os.path.isdir(args.inputs[0]):
+        print("--watch membutuhkan tepat satu folder input", file=sys.stderr)
+        return 2
+
+    real_stdout = sys.stdout
+
+    def on_batch(summary):
+        # Satu baris JSON per batch di stdout asli
+        real_stdout.write(json.dumps(summary, ensure_ascii=False) + "\n")
+        real_stdout.flush()
+
+    watcher = FolderWatcher(args.inputs[0], args.output_dir, create_scheduler(args),
+                            sheet_filter=create_sheet_filter(args), folder_prefix=args.folder_prefix,
+                            poll_interval=args.poll_interval, settle_seconds=args.settle, on_batch=on_batch)
+    with redirect_stdout(sys.stderr):
+        watcher.run()
+    return 0
+
+
+def main(argv=None):
+    """Entry point command line, mengembalikan exit code"""
+    args = build_parser().parse_args(argv)
+    if args.workers is not None and args.workers < 1:
+        print("--workers harus minimal 1", file=sys.stderr)
+        return 2
+
+    if args.max_attempts < 1:
+        print("--max-attempts harus minimal 1", file=sys.stderr)
+        return 2
+    if args.resume and (args.inputs or args.watch):
+        print("--resume tidak memakai file input atau --watch", file=sys.stderr)
+        return 2
+    if not args.resume and not args.inputs:
+        print("Butuh minimal satu file Excel, folder atau pola glob (atau --resume)", file=sys.stderr)
+        return 2
+
+    if args.watch:
+        return run_watch(args)
+
+    # Log converter ke stderr agar stdout hanya berisi ringkasan JSON
+    with redirect_stdout(sys.stderr):
+        summary = run_resume(args) if args.resume else run_batch(args)
+
+    output = json.dumps(summary, indent=2, ensure_ascii=False)
+    print(output)
+    if args.summary_file:
+        with open(args.summary_file, 'w', encoding='utf-8') as f:
+            f.write(output)
+
+    totals = summary['totals']
+    if args.resume:
+        return 1 if totals['failed'] or totals['missing_jobs'] else 0
+    if not totals['files'] or totals['failed'] or totals['file_errors']:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
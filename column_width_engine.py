@@ -0,0 +1,277 @@
+"""
+Column Width Engine Module
+Lebar kolom dan wrapping teks berdasarkan metrik font (pdfmetrics.stringWidth),
+dengan cache lebar teks yang dipakai bersama oleh semua sheet dalam satu run
+"""
+
+from reportlab.lib.units import mm
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+DEFAULT_MAX_SAMPLE_ROWS = 500
+DEFAULT_MAX_CACHE_ENTRIES = 200000
+
+# Lebar glyph terbesar font standar PDF relatif ke ukuran font (Helvetica '@' = 1.015 em)
+MAX_GLYPH_EM = 1.1
+
+
+class ColumnWidthEngine:
+    def __init__(self, max_sample_rows=DEFAULT_MAX_SAMPLE_ROWS, min_width=20*mm,
+                 max_cache_entries=DEFAULT_MAX_CACHE_ENTRIES):
+        """
+        Initialize width engine
+
+        Args:
+            max_sample_rows (int): Sheet dengan baris lebih banyak diukur dari sampel
+                baris (ditambah sel terpanjang setiap kolom)
+            min_width (float): Lebar minimum kolom dalam point
+            max_cache_entries (int): Batas jumlah entry cache lebar teks
+        """
+        self.max_sample_rows = max_sample_rows
+        self.min_width = min_width
+        self.max_cache_entries = max_cache_entries
+        self._widths = {}  # {(text, font_name, font_size): lebar}
+        self.hits = 0
+        self.misses = 0
+
+    def string_width(self, text, font_name, font_size):
+        """
+        Lebar teks dalam point (di-memo per teks, font dan ukuran)
+
+        Args:
+            text (str): Teks satu baris
+            font_name (str): Nama font reportlab
+            font_size (float): Ukuran font
+
+        Returns:
+            float: Lebar teks
+        """
+        key = (text, font_name, font_size)
+        width = self._widths.get(key)
+        if width is None:
+            if len(self._widths) >= self.max_cache_entries:
+                self._widths.clear()
+            width = self._widths[key] = stringWidth(text, font_name, font_size)
+            self.misses += 1
+        else:
+            self.hits += 1
+        return width
+
+    def text_width(self, value, font_name, font_size):
+        """Lebar teks multi-baris (baris terpanjang)"""
+        if '\n' not in value:
+            return self.string_width(value, font_name, font_size)
+        return max(self.string_width(line, font_name, font_size) for line in value.split('\n'))
+
+    def _sample_rows(self, data, header_rows):
+        """
+        Baris yang diukur: semua baris untuk sheet kecil, untuk sheet besar
+        baris header, sampel merata dan baris dengan sel terpanjang per kolom
+
+        Returns:
+            list: Index baris
+        """
+        if len(data) <= self.max_sample_rows:
+            return range(len(data))
+
+        step = len(data) / float(self.max_sample_rows)
+        rows = set(range(min(header_rows, len(data))))
+        rows.update(int(index * step) for index in range(self.max_sample_rows))
+
+        # Panjang karakter murah dihitung untuk semua baris, sel terpanjang selalu diukur
+        num_cols = len(data[0])
+        longest = [0] * num_cols
+        longest_rows = [0] * num_cols
+        for row_idx, row in enumerate(data):
+            for col_idx, value in enumerate(row[:num_cols]):
+                if len(value) > longest[col_idx]:
+                    longest[col_idx] = len(value)
+                    longest_rows[col_idx] = row_idx
+        rows.update(longest_rows)
+
+        return sorted(rows)
+
+    def natural_widths(self, data, body_font, header_font=None, padding=12, header_rows=1, cell_fonts=None):
+        """
+        Lebar kolom agar semua teks muat tanpa wrapping
+
+        Args:
+            data (list): Data tabel (list of lists string)
+            body_font (tuple): (nama font, ukuran) untuk baris data
+            header_font (tuple): (nama font, ukuran) untuk baris header (default body_font)
+            padding (float): Total padding kiri + kanan sel
+            header_rows (int): Jumlah baris header
+            cell_fonts (dict): Optional, font per sel {(row_idx, col_idx): (nama font, ukuran)}
+                yang menggantikan font baris (contoh formatting Excel)
+
+        Returns:
+            list: Lebar per kolom
+        """
+        if not data:
+            return []
+
+        header_font = header_font or body_font
+        cell_fonts = cell_fonts or {}
+        num_cols = len(data[0])
+        widths = [0.0] * num_cols
+
+        rows = self._sample_rows(data, header_rows)
+        if cell_fonts and len(rows) < len(data):
+            # Sel dengan font sendiri selalu diukur, bisa lebih lebar dari sel terpanjang
+            rows = sorted(set(rows).union(row_idx for row_idx, _ in cell_fonts if row_idx < len(data)))
+
+        for row_idx in rows:
+            row_font = header_font if row_idx < header_rows else body_font
+            for col_idx, value in enumerate(data[row_idx][:num_cols]):
+                if value:
+                    font_name, font_size = cell_fonts.get((row_idx, col_idx), row_font)
+                    width = self.text_width(value, font_name, font_size)
+                    if width > widths[col_idx]:
+                        widths[col_idx] = width
+
+        return [width + padding for width in widths]
+
+    def calculate(self, data, available_width, body_font, header_font=None, padding=12, header_rows=1,
+                  cell_fonts=None):
+        """
+        Hitung lebar kolom yang mengisi available_width
+
+        Kolom yang muat mendapat lebar alaminya; jika total melebihi lebar
+        halaman, sisa lebar dibagi rata ke kolom yang lebih lebar (teksnya
+        di-wrap). Jika masih ada sisa, ditambahkan proporsional
+
+        Args:
+            data (list): Data tabel
+            available_width (float): Lebar yang tersedia
+            body_font (tuple): (nama font, ukuran) baris data
+            header_font (tuple): (nama font, ukuran) baris header
+            padding (float): Total padding kiri + kanan sel
+            header_rows (int): Jumlah baris header
+            cell_fonts (dict): Optional, font per sel (lihat natural_widths)
+
+        Returns:
+            list: Lebar per kolom
+        """
+        natural = self.natural_widths(data, body_font, header_font, padding, header_rows, cell_fonts)
+        if not natural:
+            return []
+
+        num_cols = len(natural)
+        min_width = min(self.min_width, available_width / num_cols)
+        natural = [max(width, min_width) for width in natural]
+        total = sum(natural)
+
+        if total <= available_width:
+            scale = available_width / total
+            return [width * scale for width in natural]
+
+        # Water-filling: kolom sempit tetap, kolom lebar berbagi sisa lebar
+        widths = [None] * num_cols
+        remaining_width = available_width
+        remaining_cols = list(range(num_cols))
+        while remaining_cols:
+            share = remaining_width / len(remaining_cols)
+            narrow = [col_idx for col_idx in remaining_cols if natural[col_idx] <= share]
+            if not narrow:
+                for col_idx in remaining_cols:
+                    widths[col_idx] = share
+                break
+            for col_idx in narrow:
+                widths[col_idx] = natural[col_idx]
+                remaining_width -= natural[col_idx]
+            remaining_cols = [col_idx for col_idx in remaining_cols if widths[col_idx] is None]
+
+        return widths
+
+    def wrap_text(self, value, max_width, font_name, font_size):
+        """
+        Wrap teks per kata agar lebarnya tidak melebihi max_width; kata yang
+        lebih panjang dari max_width dipotong per karakter
+
+        Args:
+            value (str): Teks (boleh multi-baris)
+            max_width (float): Lebar maksimum teks (tanpa padding)
+            font_name (str): Nama font
+            font_size (float): Ukuran font
+
+        Returns:
+            str: Teks dengan '\\n' di posisi wrap
+        """
+        if not value:
+            return value
+        # Batas atas murah (glyph terlebar ~1 em) agar sel pendek tidak perlu diukur
+        if len(value) * font_size * MAX_GLYPH_EM <= max_width:
+            return value
+        if self.text_width(value, font_name, font_size) <= max_width:
+            return value
+
+        space_width = self.string_width(' ', font_name, font_size)
+        lines = []
+        for paragraph in value.split('\n'):
+            current, current_width = "", 0.0
+            for word in paragraph.split(' '):
+                word_width = self.string_width(word, font_name, font_size)
+
+                if word_width > max_width:
+                    # Kata terlalu panjang: tutup baris aktif lalu potong per karakter
+                    if current:
+                        lines.append(current)
+                    current, current_width = "", 0.0
+                    for char in word:
+                        char_width = self.string_width(char, font_name, font_size)
+                        if current and current_width + char_width > max_width:
+                            lines.append(current)
+                            current, current_width = "", 0.0
+                        current += char
+                        current_width += char_width
+                    continue
+
+                if current and current_width + space_width + word_width > max_width:
+                    lines.append(current)
+                    current, current_width = word, word_width
+                elif current:
+                    current += ' ' + word
+                    current_width += space_width + word_width
+                else:
+                    current, current_width = word, word_width
+            lines.append(current)
+
+        return '\n'.join(lines)
+
+    def wrap_rows(self, data, col_widths, body_font, header_font=None, padding=12, header_rows=1,
+                  cell_fonts=None):
+        """
+        Wrap semua sel sesuai lebar kolom
+
+        Args:
+            data (list): Data tabel
+            col_widths (list): Lebar kolom (hasil calculate)
+            body_font (tuple): (nama font, ukuran) baris data
+            header_font (tuple): (nama font, ukuran) baris header
+            padding (float): Total padding kiri + kanan sel
+            header_rows (int): Jumlah baris header
+            cell_fonts (dict): Optional, font per sel (lihat natural_widths)
+
+        Returns:
+            list: Data baru dengan teks yang sudah di-wrap
+        """
+        header_font = header_font or body_font
+        cell_fonts = cell_fonts or {}
+        text_widths = [width - padding for width in col_widths]
+        wrapped = []
+        for row_idx, row in enumerate(data):
+            row_font = header_font if row_idx < header_rows else body_font
+            wrapped.append([
+                self.wrap_text(value, text_widths[col_idx], *cell_fonts.get((row_idx, col_idx), row_font))
+                if col_idx < len(text_widths) else value
+                for col_idx, value in enumerate(row)
+            ])
+        return wrapped
+
+    def stats(self):
+        """
+        Statistik cache lebar teks
+
+        Returns:
+            dict: entries, hits, misses
+        """
+        return {'entries': len(self._widths), 'hits': self.hits, 'misses': self.misses}
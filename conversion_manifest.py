@@ -0,0 +1,196 @@
+"""
+Conversion Manifest Module
+Manifest per folder output: hash isi setiap sheet (nilai + formatting), hash
+opsi converter dan hash PDF hasilnya, agar run ulang hanya membuat ulang
+sheet yang berubah
+"""
+
+import os
+import json
+import hashlib
+from style_grid import format_key
+from xlsx_native_reader import XlsxNativeReader
+
+MANIFEST_FILENAME = '.conversion_manifest.json'
+
+# Naikkan jika bentuk PDF yang dihasilkan berubah, semua sheet otomatis dibuat ulang
+MANIFEST_VERSION = 1
+
+
+def options_hash(**options):
+    """
+    Hash opsi converter yang memengaruhi isi PDF
+
+    Args:
+        **options: Opsi, contoh method='direct', enable_watermark=True
+
+    Returns:
+        str: SHA-1 hex digest
+    """
+    payload = json.dumps([MANIFEST_VERSION, options], sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def file_hash(file_path):
+    """
+    SHA-1 isi file
+
+    Returns:
+        str: Hex digest, atau None jika file tidak ada
+    """
+    try:
+        digest = hashlib.sha1()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+    except OSError:
+        return None
+
+
+def compute_sheet_hashes(excel_file, sheet_names):
+    """
+    Hash isi sheet dari nilai sel, formatting yang sudah di-resolve, merged range,
+    lebar kolom, tinggi baris dan pengaturan halaman (dipakai export Excel)
+
+    Berbeda dengan fingerprint XML, hash ini tidak ikut berubah saat sheet lain
+    menambah shared string atau style baru
+
+    Args:
+        excel_file (str): Path ke file Excel
+        sheet_names (list): Nama sheet
+
+    Returns:
+        dict: {sheet_name: hex digest, atau None jika sheet tidak bisa di-hash
+            (contoh file .xls) sehingga selalu dibuat ulang}
+    """
+    hashes = {sheet_name: None for sheet_name in sheet_names}
+    try:
+        reader = XlsxNativeReader(excel_file)
+    except Exception as e:
+        print(f"⚠️  Could not hash sheets of {os.path.basename(excel_file)}: {str(e)}")
+        return hashes
+
+    try:
+        available = set(reader.get_sheet_names())
+        for sheet_name in sheet_names:
+            if sheet_name not in available:
+                continue
+            try:
+                sheet = reader.get_sheet_with_formatting(sheet_name)
+                formatting = sheet['formatting']
+
+                digest = hashlib.sha1()
+                digest.update(repr(sheet['data']).encode('utf-8'))
+                digest.update(repr(sorted(sheet['merged_cells'])).encode('utf-8'))
+                digest.update(repr((sorted(sheet['column_widths'].items()), sorted(sheet['row_heights'].items()),
+                                    sheet['print_layout'], reader.metadata.sheet_defined_names.get(sheet_name, [])
+                                    )).encode('utf-8'))
+                digest.update(repr(tuple(format_key(cell_format) for cell_format in formatting.styles)).encode('utf-8'))
+                for row in formatting.rows:
+                    digest.update(row.tobytes())
+                    digest.update(b'|')
+                hashes[sheet_name] = digest.hexdigest()
+            except Exception as e:
+                print(f"⚠️  Could not hash sheet '{sheet_name}': {str(e)}")
+    finally:
+        reader.close()
+
+    return hashes
+
+
+class ConversionManifest:
+    def __init__(self, output_directory):
+        """
+        Initialize manifest untuk satu folder output (dibaca dari disk jika ada)
+
+        Args:
+            output_directory (str): Folder output PDF
+        """
+        self.output_directory = output_directory
+        self.manifest_path = os.path.join(output_directory, MANIFEST_FILENAME)
+        self.entries = {}  # {sheet_name: entry}
+        self.skipped = 0
+        self.rebuilt = 0
+        self.load()
+
+    def load(self):
+        """Baca manifest dari disk; manifest rusak atau versi lain dianggap kosong"""
+        self.entries = {}
+        if not os.path.exists(self.manifest_path):
+            return
+
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                payload = json.load(f)
+            if payload.get('version') == MANIFEST_VERSION:
+                self.entries = payload.get('sheets', {})
+        except Exception as e:
+            print(f"⚠️  Ignoring unreadable manifest {self.manifest_path}: {str(e)}")
+
+    def save(self):
+        """Tulis manifest ke disk (file sementara lalu rename)"""
+        if not os.path.exists(self.output_directory):
+            os.makedirs(self.output_directory)
+
+        temp_path = f"{self.manifest_path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': MANIFEST_VERSION, 'sheets': self.entries}, f, indent=2, ensure_ascii=False)
+        os.replace(temp_path, self.manifest_path)
+
+    def needs_rebuild(self, sheet_name, content_hash, options_digest, output_path):
+        """
+        Cek apakah sheet perlu dibuat ulang
+
+        Sheet dilewati hanya jika hash isi dan opsi sama dengan run sebelumnya,
+        dan PDF output masih ada dengan hash yang sama seperti yang dicatat
+
+        Args:
+            sheet_name (str): Nama sheet
+            content_hash (str): Hash isi sheet (compute_sheet_hashes), None = selalu rebuild
+            options_digest (str): Hash opsi converter (options_hash)
+            output_path (str): Path PDF output
+
+        Returns:
+            bool: True jika sheet harus dikonversi
+        """
+        entry = self.entries.get(sheet_name)
+        rebuild = (
+            content_hash is None or entry is None or
+            entry.get('content_hash') != content_hash or
+            entry.get('options_hash') != options_digest or
+            os.path.abspath(entry.get('output_path', '')) != os.path.abspath(output_path) or
+            file_hash(output_path) != entry.get('output_hash')
+        )
+        if rebuild:
+            self.rebuilt += 1
+        else:
+            self.skipped += 1
+        return rebuild
+
+    def record(self, sheet_name, excel_file, content_hash, options_digest, output_path):
+        """
+        Catat sheet yang berhasil dikonversi
+
+        Args:
+            sheet_name (str): Nama sheet
+            excel_file (str): Path ke file Excel
+            content_hash (str): Hash isi sheet
+            options_digest (str): Hash opsi converter
+            output_path (str): Path PDF output
+        """
+        if content_hash is None:
+            self.entries.pop(sheet_name, None)
+            return
+
+        self.entries[sheet_name] = {
+            'excel_file': os.path.abspath(excel_file),
+            'content_hash': content_hash,
+            'options_hash': options_digest,
+            'output_path': os.path.abspath(output_path),
+            'output_hash': file_hash(output_path)
+        }
+
+    def forget(self, sheet_name):
+        """Hapus sheet dari manifest (contoh konversi gagal)"""
+        self.entries.pop(sheet_name, None)
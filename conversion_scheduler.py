@@ -0,0 +1,511 @@
+"""
+Conversion Scheduler Module
+Jadwalkan konversi banyak file Excel ke process pool: file kecil dikirim utuh,
+file besar dipecah menjadi potongan sheet, dibagi rata berdasarkan perkiraan biaya
+"""
+
+import os
+import sys
+import time
+import threading
+from collections import namedtuple, OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+# Method yang bisa dijalankan di worker (capture butuh satu Excel application)
+SCHEDULER_METHODS = ('direct', 'table')
+
+# Target jumlah task per worker, lebih banyak = beban lebih rata tapi workbook lebih sering dibuka
+TASKS_PER_WORKER = 3
+
+# Jumlah maksimum converter per worker untuk opsi per run (contoh opsi watermark per job service)
+MAX_WORKER_CONVERTERS = 8
+
+# Satu unit kerja: sheet dari satu file ke folder outputnya
+ConversionTask = namedtuple('ConversionTask', 'file_path sheet_names output_directory folder_prefix cost')
+
+
+def estimate_sheet_cost(sheet_info):
+    """
+    Perkiraan biaya render satu sheet dari used range
+
+    Args:
+        sheet_info (dict): Info sheet (max_row, max_col) dari get_sheets_info, boleh None
+
+    Returns:
+        int: Jumlah sel di used range (minimal 1)
+    """
+    if not sheet_info:
+        return 1
+    return max(1, (sheet_info.get('max_row') or 0) * (sheet_info.get('max_col') or 0))
+
+
+def output_filename(method, file_path, sheet_name, folder_prefix=""):
+    """
+    Nama file PDF yang ditulis converter untuk sheet (get_pdf_filename milik converter)
+
+    Args:
+        method (str): 'direct' atau 'table'
+        file_path (str): Path ke file Excel
+        sheet_name (str): Nama sheet
+        folder_prefix (str): Prefix nama file
+
+    Returns:
+        str: Nama file PDF
+    """
+    if method == "table":
+        from pdf_converter import PDFConverter
+        return PDFConverter.get_pdf_filename(sheet_name, folder_prefix)
+    from pdf_converter_direct import PDFConverterDirect
+    return PDFConverterDirect.get_pdf_filename(file_path, sheet_name, folder_prefix)
+
+
+def plan_tasks(files, max_workers, tasks_per_worker=TASKS_PER_WORKER):
+    """
+    Bagi file menjadi task dengan biaya seimbang
+
+    File yang biayanya di bawah target dikirim utuh (workbook dibuka sekali);
+    file besar dipecah menjadi potongan sheet berurutan. Task diurutkan dari
+    yang termahal agar worker yang selesai duluan mengambil task yang lebih kecil
+
+    Args:
+        files (list): (file_path, sheet_names, output_directory, folder_prefix, sheet_costs)
+            dengan sheet_costs {sheet_name: biaya}
+        max_workers (int): Jumlah worker
+        tasks_per_worker (int): Target jumlah task per worker
+
+    Returns:
+        list: ConversionTask, termahal di depan
+    """
+    total_cost = sum(sheet_costs.get(sheet_name, 1)
+                     for _, sheet_names, _, _, sheet_costs in files for sheet_name in sheet_names)
+    target_cost = max(1, total_cost // max(1, max_workers * tasks_per_worker))
+
+    tasks = []
+    for file_path, sheet_names, output_directory, folder_prefix, sheet_costs in files:
+        chunk, chunk_cost = [], 0
+        for sheet_name in sheet_names:
+            cost = sheet_costs.get(sheet_name, 1)
+            if chunk and chunk_cost + cost > target_cost:
+                tasks.append(ConversionTask(file_path, chunk, output_directory, folder_prefix, chunk_cost))
+                chunk, chunk_cost = [], 0
+            chunk.append(sheet_name)
+            chunk_cost += cost
+        if chunk:
+            tasks.append(ConversionTask(file_path, chunk, output_directory, folder_prefix, chunk_cost))
+
+    tasks.sort(key=lambda task: task.cost, reverse=True)
+    return tasks
+
+
+class ConversionScheduler:
+    def __init__(self, method, converter_settings=None, max_workers=None, isolate=False):
+        """
+        Initialize scheduler
+
+        Args:
+            method (str): 'direct' (PDFConverterDirect) atau 'table' (PDFConverter)
+            converter_settings (dict): Argumen constructor converter
+            max_workers (int): Jumlah proses (default jumlah CPU, 1 = tanpa pool)
+            isolate (bool): Selalu konversi di proses worker, juga untuk satu worker/task,
+                agar sheet yang mematikan proses tidak ikut mematikan pemanggil
+        """
+        if method not in SCHEDULER_METHODS:
+            raise Exception(f"Method tidak bisa dijadwalkan paralel: {method}")
+
+        self.method = method
+        self.converter_settings = converter_settings or {}
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.isolate = isolate
+        self._executor = None  # Pool yang tetap hidup antar run (start)
+        self._pool_size = None
+        self._local_ready = False
+        # Run dari beberapa thread (service) bisa menemukan pool rusak bersamaan
+        self._restart_lock = threading.Lock()
+
+    @property
+    def started(self):
+        """True jika pool (atau converter di proses ini) sudah disiapkan oleh start"""
+        return self._executor is not None or self._local_ready
+
+    def start(self, workers=None):
+        """
+        Jalankan pool yang tetap hidup antar run, worker langsung disiapkan
+
+        Cache di worker (workbook, style, template slip, watermark) dipakai ulang
+        oleh run berikutnya sehingga job kecil tidak menunggu proses baru
+
+        Args:
+            workers (int): Optional, batasi jumlah proses (contoh jumlah sheet yang
+                akan dikerjakan); tidak pernah lebih dari max_workers
+
+        Returns:
+            ConversionScheduler: self
+        """
+        pool_size = min(self.max_workers, workers or self.max_workers)
+        if pool_size <= 1 and not self.isolate:
+            self._init_local()
+        elif self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=pool_size, initializer=_init_pool_worker,
+                                                 initargs=(self.method, self.converter_settings))
+            self._pool_size = pool_size
+            # Pool membuat proses saat ada task, kirim satu task kosong per worker
+            for future in [self._executor.submit(_warm_up_worker) for _ in range(pool_size)]:
+                future.result()
+            print(f"🔥 Worker pool ready ({pool_size} worker(s))")
+        return self
+
+    def shutdown(self):
+        """Hentikan pool yang dibuat start"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+            self._pool_size = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
+
+    def _restart(self, broken_executor):
+        """
+        Ganti pool yang rusak (worker mati, misal kehabisan memori) agar run berikutnya tetap jalan
+
+        Args:
+            broken_executor (ProcessPoolExecutor): Pool yang rusak; tidak diganti lagi jika
+                thread lain sudah menggantinya
+        """
+        with self._restart_lock:
+            if self._executor is not broken_executor:
+                return
+            print("⚠️  Worker pool broken, restarting")
+            pool_size = self._pool_size
+            broken_executor.shutdown(wait=False)
+            self._executor = None
+            self.start(pool_size)
+
+    def _init_local(self):
+        """Siapkan converter di proses ini untuk mode tanpa pool (sekali per scheduler)"""
+        if not self._local_ready:
+            _init_scheduler_worker(self.method, self.converter_settings)
+            self._local_ready = True
+
+    def run(self, files, on_result=None, converter_settings=None, release_files=False, whole_files=False):
+        """
+        Konversi semua file, hasil per sheet dikumpulkan dari semua worker
+
+        Args:
+            files (list): (file_path, sheet_names, output_directory, folder_prefix, sheet_costs)
+            on_result (callable): Dipanggil di proses utama untuk setiap sheet yang selesai
+                dengan dict hasil
+            converter_settings (dict): Optional, opsi converter untuk run ini saja
+                (default opsi scheduler)
+            release_files (bool): Hapus workbook dari cache worker setelah task selesai
+                (file sekali pakai, contoh upload service)
+            whole_files (bool): Kirim setiap file sebagai satu task, tidak dipecah per potongan sheet
+
+        Returns:
+            list: Dict hasil per sheet dengan key 'file_path', 'sheet_name',
+                'output_file', 'success', 'error' dan 'seconds' (sheet gagal juga
+                'worker_crashed': True jika gagal karena proses worker mati)
+        """
+        total_sheets = sum(len(sheet_names) for _, sheet_names, _, _, _ in files)
+        if not total_sheets:
+            return []
+
+        start = time.perf_counter()
+        max_workers = min(self.max_workers, total_sheets)
+        tasks = plan_tasks(files, 1 if whole_files else max_workers, 1 if whole_files else TASKS_PER_WORKER)
+        max_workers = min(max_workers, len(tasks))
+        task_options = (converter_settings, release_files)
+        results = []
+
+        def collect(task_results):
+            for result in task_results:
+                results.append(result)
+                if on_result:
+                    on_result(result)
+
+        executor = self._executor
+        if executor is not None:
+            max_workers = self._pool_size
+            try:
+                healthy = self._run_on_executor(executor, tasks, collect, task_options)
+            except BrokenProcessPool:
+                # Pool sudah rusak sebelum task dikirim (worker mati saat idle)
+                self._restart(executor)
+                executor = self._executor
+                healthy = self._run_on_executor(executor, tasks, collect, task_options)
+            if not healthy:
+                self._restart(executor)
+        elif max_workers <= 1 and not self.isolate:
+            self._init_local()
+            for task in tasks:
+                collect(_run_conversion_task(task, *task_options))
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_pool_worker,
+                                     initargs=(self.method, self.converter_settings)) as executor:
+                self._run_on_executor(executor, tasks, collect, task_options)
+
+        success_count = sum(1 for result in results if result['success'])
+        print(f"⚡ Scheduled {len(tasks)} task(s) from {len(files)} file(s): {success_count}/{total_sheets} sheets "
+              f"in {time.perf_counter() - start:.2f}s ({max_workers} worker(s))")
+
+        return results
+
+    def hash_sheets(self, files):
+        """
+        Hitung hash isi sheet (compute_sheet_hashes) di worker pool, dibagi rata
+        seperti task konversi agar parse sheet tidak berjalan serial di proses utama
+
+        Args:
+            files (list): (file_path, sheet_names, sheet_costs)
+
+        Returns:
+            dict: {file_path: {sheet_name: hex digest, atau None jika gagal di-hash}}
+        """
+        hashes = {file_path: dict.fromkeys(sheet_names) for file_path, sheet_names, _ in files}
+        total_sheets = sum(len(sheet_names) for _, sheet_names, _ in files)
+        if not total_sheets:
+            return hashes
+
+        start = time.perf_counter()
+        max_workers = self._pool_size or min(self.max_workers, total_sheets)
+        tasks = plan_tasks([(file_path, sheet_names, None, "", sheet_costs)
+                            for file_path, sheet_names, sheet_costs in files], max_workers)
+
+        executor = self._executor
+        if executor is not None:
+            if not self._hash_on_executor(executor, tasks, hashes):
+                self._restart(executor)
+        elif (max_workers <= 1 or len(tasks) <= 1) and not self.isolate:
+            for task in tasks:
+                hashes[task.file_path].update(_hash_task(task))
+        else:
+            with ProcessPoolExecutor(max_workers=min(max_workers, len(tasks)),
+                                     initializer=_redirect_worker_output) as executor:
+                self._hash_on_executor(executor, tasks, hashes)
+
+        print(f"🔍 Hashed {total_sheets} sheet(s) in {time.perf_counter() - start:.2f}s")
+        return hashes
+
+    def read_sheet_names(self, file_path):
+        """
+        Nama sheet workbook, dibaca di proses worker jika pool berjalan agar
+        workbook yang rusak tidak bisa mematikan proses pemanggil
+
+        Args:
+            file_path (str): Path ke file Excel
+
+        Returns:
+            list: Nama sheet
+
+        Raises:
+            Exception: Workbook tidak bisa dibaca atau worker mati saat membacanya
+        """
+        executor = self._executor
+        if executor is None and not self.isolate:
+            return _sheet_names_task(file_path)
+        if executor is None:
+            with ProcessPoolExecutor(max_workers=1, initializer=_redirect_worker_output) as temporary:
+                return temporary.submit(_sheet_names_task, file_path).result()
+
+        # Pool bisa rusak karena task lain; dicoba sekali lagi di pool baru sebelum ditolak
+        for attempt in range(2):
+            try:
+                return executor.submit(_sheet_names_task, file_path).result()
+            except BrokenProcessPool:
+                self._restart(executor)
+                executor = self._executor
+        raise Exception("Proses worker berhenti saat membaca workbook")
+
+    def _hash_on_executor(self, executor, tasks, hashes):
+        """
+        Kirim task hash ke pool; sheet yang gagal di-hash tetap None (selalu dibuat ulang)
+
+        Returns:
+            bool: False jika pool rusak karena proses worker mati
+        """
+        healthy = True
+        futures = {executor.submit(_hash_task, task): task for task in tasks}
+        for future in as_completed(futures):
+            try:
+                hashes[futures[future].file_path].update(future.result())
+            except Exception as e:
+                healthy = healthy and not isinstance(e, BrokenProcessPool)
+                print(f"⚠️  Could not hash sheets of {os.path.basename(futures[future].file_path)}: {str(e)}")
+        return healthy
+
+    def _run_on_executor(self, executor, tasks, collect, task_options=(None, False)):
+        """
+        Kirim task ke pool dan kumpulkan hasil sesuai urutan selesai
+
+        Returns:
+            bool: False jika pool rusak karena proses worker mati
+        """
+        healthy = True
+        futures = {executor.submit(_run_conversion_task, task, *task_options): task for task in tasks}
+        for future in as_completed(futures):
+            try:
+                task_results = future.result()
+            except Exception as e:
+                crashed = isinstance(e, BrokenProcessPool)
+                healthy = healthy and not crashed
+                task = futures[future]
+                task_results = [_failed_result(task, sheet_name, f"Worker failed: {str(e)}", crashed)
+                                for sheet_name in task.sheet_names]
+            collect(task_results)
+        return healthy
+
+
+def _failed_result(task, sheet_name, error, worker_crashed=False):
+    """Dict hasil untuk sheet yang gagal ('worker_crashed' jika proses worker mati)"""
+    return {
+        'file_path': task.file_path,
+        'sheet_name': sheet_name,
+        'output_file': None,
+        'success': False,
+        'error': error,
+        'seconds': 0.0,
+        'worker_crashed': worker_crashed
+    }
+
+
+# Converter milik proses worker (diisi oleh _init_scheduler_worker)
+_worker_method = None
+_worker_settings = None
+_worker_converter = None
+# Converter untuk opsi per run, LRU {opsi: converter}
+_worker_converters = OrderedDict()
+
+
+def _create_converter(method, converter_settings):
+    """Buat converter untuk method dengan opsi constructor"""
+    if method == 'direct':
+        from pdf_converter_direct import PDFConverterDirect
+        return PDFConverterDirect(**converter_settings)
+    from pdf_converter import PDFConverter
+    from sheet_disk_cache import get_sheet_disk_cache
+    return PDFConverter(disk_cache=get_sheet_disk_cache(), **converter_settings)
+
+
+def _init_scheduler_worker(method, converter_settings):
+    """Initializer process pool: satu converter per proses, cache-nya dipakai semua task"""
+    global _worker_method, _worker_settings, _worker_converter
+    _worker_method = method
+    _worker_settings = converter_settings
+    _worker_converter = _create_converter(method, converter_settings)
+    _worker_converters.clear()
+
+
+def _redirect_worker_output():
+    """
+    Log worker (print converter) ke stderr
+
+    Dengan start method spawn (Windows, macOS) worker mendapat sys.stdout baru,
+    redirect di proses utama tidak berlaku sehingga log bercampur dengan output
+    stdout pemanggil (contoh ringkasan JSON cli)
+    """
+    sys.stdout = sys.stderr
+
+
+def _init_pool_worker(method, converter_settings):
+    """Initializer process pool: log ke stderr lalu siapkan converter worker"""
+    _redirect_worker_output()
+    _init_scheduler_worker(method, converter_settings)
+
+
+def _get_worker_converter(converter_settings):
+    """
+    Converter worker untuk opsi run (default converter dari initializer)
+
+    Jumlah converter dibatasi MAX_WORKER_CONVERTERS karena opsi bisa berasal dari
+    input pengguna (contoh teks watermark per job service)
+    """
+    if converter_settings is None or converter_settings == _worker_settings:
+        return _worker_converter
+
+    key = tuple(sorted(converter_settings.items()))
+    converter = _worker_converters.pop(key, None)
+    if converter is None:
+        converter = _create_converter(_worker_method, converter_settings)
+        while len(_worker_converters) >= MAX_WORKER_CONVERTERS:
+            _worker_converters.popitem(last=False)
+    _worker_converters[key] = converter
+    return converter
+
+
+def _warm_up_worker():
+    """Task kosong agar proses worker dibuat dan initializer dijalankan"""
+    return os.getpid()
+
+
+def _hash_task(task):
+    """Hash isi sheet satu task di dalam worker"""
+    from conversion_manifest import compute_sheet_hashes
+    return compute_sheet_hashes(task.file_path, task.sheet_names)
+
+
+def _sheet_names_task(file_path):
+    """Baca nama sheet di dalam worker, workbook tidak disimpan di cache worker"""
+    from batch_converter import read_sheets_info
+    from workbook_cache import get_workbook_cache
+    try:
+        return list(read_sheets_info(file_path))
+    finally:
+        get_workbook_cache().invalidate(file_path)
+
+
+def _run_conversion_task(task, converter_settings=None, release_files=False):
+    """
+    Konversi satu task di dalam worker
+
+    Args:
+        task (ConversionTask): File dan sheet yang dikonversi
+        converter_settings (dict): Optional, opsi converter run (default converter worker)
+        release_files (bool): Hapus workbook dari cache worker setelah task selesai
+
+    Returns:
+        list: Dict hasil per sheet, termasuk 'seconds' (waktu render sheet)
+    """
+    if not os.path.exists(task.output_directory):
+        os.makedirs(task.output_directory, exist_ok=True)
+
+    results = []
+    start = time.perf_counter()
+    try:
+        converter = _get_worker_converter(converter_settings)
+        if _worker_method == 'direct':
+            # Satu panggilan per potongan (satu master jika split_from_master); waktu per sheet
+            # dari converter, atau waktu potongan dibagi rata jika sheet dirender bersama
+            pdf_paths = converter.convert_excel_to_pdf_direct(
+                task.file_path, task.sheet_names, task.output_directory, task.folder_prefix)
+            chunk_seconds = (time.perf_counter() - start) / len(task.sheet_names)
+            for sheet_name in task.sheet_names:
+                pdf_path = pdf_paths.get(sheet_name)
+                results.append({
+                    'file_path': task.file_path,
+                    'sheet_name': sheet_name,
+                    'output_file': pdf_path,
+                    'success': bool(pdf_path),
+                    'error': None if pdf_path else f"Failed to convert sheet: {sheet_name}",
+                    'seconds': converter.sheet_seconds.get(sheet_name, chunk_seconds)
+                })
+        else:
+            for result in converter.convert_sheets_to_pdf(
+                    task.file_path, task.sheet_names, task.output_directory, task.folder_prefix):
+                results.append(dict(result, file_path=task.file_path, seconds=time.perf_counter() - start))
+                start = time.perf_counter()
+
+    except Exception as e:
+        done = {result['sheet_name'] for result in results}
+        results.extend(_failed_result(task, sheet_name, str(e))
+                       for sheet_name in task.sheet_names if sheet_name not in done)
+
+    finally:
+        if release_files:
+            from workbook_cache import get_workbook_cache
+            get_workbook_cache().invalidate(task.file_path)
+
+    return results
@@ -0,0 +1,480 @@
+"""
+Conversion Service Module
+HTTP service lokal (stdlib) untuk konversi slip gaji dengan PDFConverterDirect:
+upload xlsx, cek status job, download zip PDF hasil
+
+Penggunaan:
+    python conversion_service.py --port 8765 --workers 4 --max-queue 16
+
+    curl -X POST --data-binary @gaji.xlsx "http://127.0.0.1:8765/jobs?sheet=Slip%201&watermark=1"
+    curl http://127.0.0.1:8765/jobs/<job_id>
+    curl -o hasil.zip http://127.0.0.1:8765/jobs/<job_id>/result
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import queue
+import shutil
+import zipfile
+import math
+import argparse
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+from watermark_manager import WATERMARK_MODES, WATERMARK_POSITIONS, DEFAULT_WATERMARK_TEXT
+from conversion_scheduler import ConversionScheduler
+from sheet_filter import SheetFilter
+
+DEFAULT_PORT = 8765
+DEFAULT_MAX_QUEUE = 16
+DEFAULT_MAX_UPLOAD_MB = 50
+
+# Job selesai dihapus (beserta file-nya) setelah waktu ini
+DEFAULT_JOB_TTL = 3600
+
+JOB_STATUSES = ('queued', 'running', 'done', 'failed')
+
+
+class ConversionService:
+    def __init__(self, work_directory=None, max_workers=None, max_queue=DEFAULT_MAX_QUEUE,
+                 max_upload_bytes=DEFAULT_MAX_UPLOAD_MB * 1024 * 1024, job_ttl=DEFAULT_JOB_TTL):
+        """
+        Initialize service
+
+        Args:
+            work_directory (str): Folder upload dan hasil job (default folder sementara)
+            max_workers (int): Jumlah proses konversi (default jumlah CPU)
+            max_queue (int): Maksimum job yang menunggu + berjalan; job baru ditolak jika penuh
+            max_upload_bytes (int): Ukuran maksimum file upload
+            job_ttl (float): Umur job selesai sebelum dihapus (detik)
+        """
+        self.work_directory = work_directory or tempfile.mkdtemp(prefix='slip-service-')
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self.max_upload_bytes = max_upload_bytes
+        self.job_ttl = job_ttl
+        self.sheet_filter = SheetFilter()
+
+        self.jobs = {}  # {job_id: dict job}
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        # Pool direct yang tetap hidup (diganti otomatis jika worker mati), opsi watermark per job;
+        # selalu di proses worker agar workbook upload tidak bisa mematikan service
+        self.scheduler = ConversionScheduler('direct', parse_options({}), self.max_workers, isolate=True)
+        self._dispatchers = []
+
+    def start(self):
+        """Jalankan process pool (langsung disiapkan) dan thread dispatcher"""
+        os.makedirs(self.work_directory, exist_ok=True)
+        self.scheduler.start()
+
+        # Satu dispatcher per worker: job yang berjalan tidak pernah melebihi jumlah proses
+        for _ in range(self.max_workers):
+            dispatcher = threading.Thread(target=self._dispatch, daemon=True)
+            dispatcher.start()
+            self._dispatchers.append(dispatcher)
+
+        print(f"🔥 Conversion pool ready ({self.max_workers} worker(s), queue {self.max_queue})")
+
+    def shutdown(self):
+        """Hentikan dispatcher dan process pool"""
+        for _ in self._dispatchers:
+            self._queue.put(None)
+        for dispatcher in self._dispatchers:
+            dispatcher.join()
+        self._dispatchers = []
+        self.scheduler.shutdown()
+
+    def active_jobs(self):
+        """Jumlah job yang menunggu atau berjalan"""
+        with self._lock:
+            return sum(1 for job in self.jobs.values() if job['status'] in ('queued', 'running'))
+
+    def submit(self, data, filename="upload.xlsx", sheet_names=None, options=None):
+        """
+        Terima upload workbook dan masukkan ke antrian
+
+        Args:
+            data (bytes): Isi file xlsx
+            filename (str): Nama file asli (untuk nama PDF)
+            sheet_names (list): Sheet yang dikonversi (default semua sheet yang tidak diabaikan)
+            options (dict): Opsi watermark PDFConverterDirect
+
+        Returns:
+            dict: Job yang dibuat
+
+        Raises:
+            ServiceError: Antrian penuh, upload terlalu besar atau workbook/sheet tidak valid
+        """
+        if len(data) > self.max_upload_bytes:
+            raise ServiceError(413, f"File terlalu besar (maksimum {self.max_upload_bytes // (1024 * 1024)} MB)")
+
+        self.purge_expired()
+        job_id = uuid.uuid4().hex
+        job_directory = os.path.join(self.work_directory, job_id)
+        safe_name = os.path.basename(filename) or "upload.xlsx"
+        if not safe_name.lower().endswith(('.xlsx', '.xlsm')):
+            safe_name += '.xlsx'
+
+        with self._lock:
+            # Admission control: slot dipesan sebelum file ditulis ke disk
+            active = sum(1 for job in self.jobs.values() if job['status'] in ('queued', 'running'))
+            if active >= self.max_queue:
+                raise ServiceError(503, f"Antrian penuh ({active} job), coba lagi nanti")
+            job = {
+                'job_id': job_id,
+                'status': 'queued',
+                'filename': safe_name,
+                'sheets': [],
+                'results': [],
+                'error': None,
+                'created': time.time(),
+                'started': None,
+                'finished': None,
+                'directory': job_directory
+            }
+            self.jobs[job_id] = job
+
+        try:
+            os.makedirs(os.path.join(job_directory, 'output'))
+            excel_path = os.path.join(job_directory, safe_name)
+            with open(excel_path, 'wb') as f:
+                f.write(data)
+
+            try:
+                # Dibaca di worker: workbook rusak tidak bisa mematikan service
+                available = self.scheduler.read_sheet_names(excel_path)
+            except Exception as e:
+                raise ServiceError(400, f"Workbook tidak valid: {str(e)}")
+
+            if sheet_names:
+                unknown = [sheet_name for sheet_name in sheet_names if sheet_name not in available]
+                if unknown:
+                    raise ServiceError(400, f"Sheet tidak ditemukan: {', '.join(unknown)}")
+            else:
+                sheet_names = self.sheet_filter.filter(available)
+            if not sheet_names:
+                raise ServiceError(400, "Tidak ada sheet untuk dikonversi")
+
+        except Exception:
+            with self._lock:
+                self.jobs.pop(job_id, None)
+            shutil.rmtree(job_directory, ignore_errors=True)
+            raise
+
+        job['sheets'] = sheet_names
+        job['options'] = options or {}
+        job['excel_path'] = excel_path
+        self._queue.put(job_id)
+        return job
+
+    def _dispatch(self):
+        """Thread dispatcher: ambil job dari antrian dan jalankan di process pool"""
+        while True:
+            job_id = self._queue.get()
+            if job_id is None:
+                return
+
+            with self._lock:
+                job = self.jobs.get(job_id)
+                if job is None:
+                    continue
+                job['status'] = 'running'
+                job['started'] = time.time()
+
+            try:
+                results = self._convert(job)
+                self._write_zip(job, results)
+                status = 'done' if any(result['success'] for result in results) else 'failed'
+                error = None if status == 'done' else "Semua sheet gagal dikonversi"
+            except Exception as e:
+                results, status, error = [], 'failed', str(e)
+
+            with self._lock:
+                job['results'] = results
+                job['status'] = status
+                job['error'] = error
+                job['finished'] = time.time()
+
+            print(f"{'✅' if status == 'done' else '❌'} Job {job_id[:8]} {status}: "
+                  f"{sum(1 for result in results if result['success'])}/{len(job['sheets'])} sheets "
+                  f"in {job['finished'] - job['started']:.2f}s")
+
+    def _convert(self, job):
+        """
+        Konversi sheet job di pool
+
+        Worker yang mati (upload lain yang rusak) menggagalkan semua job yang sedang
+        berjalan; sheet yang gagal karena itu dicoba sekali lagi sebelum dianggap gagal
+
+        Returns:
+            list: Dict hasil per sheet sesuai urutan job['sheets']
+        """
+        output_directory = os.path.join(job['directory'], 'output')
+        results = {}
+        sheet_names = job['sheets']
+        for attempt in range(2):
+            # Satu task per job (workbook di-parse sekali), lalu dihapus dari cache worker
+            for result in self.scheduler.run([(job['excel_path'], sheet_names, output_directory, "", {})],
+                                             converter_settings=job['options'], release_files=True,
+                                             whole_files=True):
+                results[result['sheet_name']] = result
+            sheet_names = [sheet_name for sheet_name in sheet_names if results[sheet_name].get('worker_crashed')]
+            if not sheet_names:
+                break
+            if attempt == 0:
+                print(f"♻️  Job {job['job_id'][:8]}: worker died, retrying {len(sheet_names)} sheet(s)")
+        return [results[sheet_name] for sheet_name in job['sheets']]
+
+    def _write_zip(self, job, results):
+        """Zip semua PDF hasil job (PDF sudah terkompresi, disimpan tanpa kompresi ulang)"""
+        zip_path = os.path.join(job['directory'], 'result.zip')
+        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_STORED) as archive:
+            for result in results:
+                if result['success']:
+                    archive.write(result['output_file'], os.path.basename(result['output_file']))
+        job['zip_path'] = zip_path
+
+    def get_job(self, job_id):
+        """
+        Status job untuk response JSON
+
+        Returns:
+            dict: Status job, atau None jika tidak ada
+        """
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return None
+            position = None
+            if job['status'] == 'queued':
+                position = sum(1 for other in self.jobs.values()
+                               if other['status'] == 'queued' and other['created'] < job['created'])
+            return {
+                'job_id': job['job_id'],
+                'status': job['status'],
+                'filename': job['filename'],
+                'sheets': job['sheets'],
+                'queue_position': position,
+                'results': [{
+                    'sheet': result['sheet_name'],
+                    'success': result['success'],
+                    'file': os.path.basename(result['output_file']) if result['output_file'] else None,
+                    'seconds': round(result['seconds'], 4),
+                    'error': result['error']
+                } for result in job['results']],
+                'error': job['error'],
+                'seconds': round(job['finished'] - job['started'], 3) if job['finished'] and job['started'] else None
+            }
+
+    def delete_job(self, job_id):
+        """
+        Hapus job selesai beserta file-nya
+
+        Returns:
+            bool: True jika job dihapus
+        """
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if job is None or job['status'] in ('queued', 'running'):
+                return False
+            del self.jobs[job_id]
+        shutil.rmtree(job['directory'], ignore_errors=True)
+        return True
+
+    def purge_expired(self):
+        """Hapus job selesai yang lebih tua dari job_ttl"""
+        now = time.time()
+        with self._lock:
+            expired = [job_id for job_id, job in self.jobs.items()
+                       if job['finished'] and now - job['finished'] > self.job_ttl]
+        for job_id in expired:
+            self.delete_job(job_id)
+
+
+class ServiceError(Exception):
+    """Error request dengan HTTP status code"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def parse_options(params):
+    """
+    Opsi PDFConverterDirect dari query string
+
+    Args:
+        params (dict): Hasil parse_qs
+
+    Returns:
+        dict: Argumen constructor converter
+    """
+    def first(name, default=None):
+        return params.get(name, [default])[0]
+
+    options = {'enable_watermark': first('watermark', '0').lower() in ('1', 'true', 'yes')}
+    if options['enable_watermark']:
+        mode = first('watermark_mode', 'image')
+        if mode not in WATERMARK_MODES:
+            raise ServiceError(400, f"watermark_mode harus salah satu dari {', '.join(WATERMARK_MODES)}")
+        try:
+            opacity = float(first('opacity', '0.3'))
+        except ValueError:
+            opacity = math.nan
+        # NaN gagal di perbandingan, nilai di luar 0-1 menghasilkan /ca yang tidak valid
+        if not 0.0 <= opacity <= 1.0:
+            raise ServiceError(400, "opacity harus angka 0.0-1.0")
+        position = first('position', 'bottom-right')
+        if position not in WATERMARK_POSITIONS:
+            raise ServiceError(400, f"position harus salah satu dari {', '.join(WATERMARK_POSITIONS)}")
+        options.update({
+            'watermark_mode': mode,
+            'watermark_text': first('watermark_text', DEFAULT_WATERMARK_TEXT),
+            'watermark_opacity': opacity,
+            'watermark_position': position
+        })
+    return options
+
+
+def create_handler(service):
+    """Class request handler yang terhubung ke service"""
+
+    class ConversionRequestHandler(BaseHTTPRequestHandler):
+        server_version = "SlipGajiService/1.0"
+
+        def _send_json(self, status, payload, headers=None):
+            body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _route(self):
+            return [part for part in urlparse(self.path).path.split('/') if part]
+
+        def do_GET(self):
+            parts = self._route()
+            if parts == ['health']:
+                self._send_json(200, {'status': 'ok', 'workers': service.max_workers,
+                                      'active_jobs': service.active_jobs(), 'max_queue': service.max_queue})
+                return
+
+            if len(parts) in (2, 3) and parts[0] == 'jobs':
+                job = service.get_job(parts[1])
+                if job is None:
+                    self._send_json(404, {'error': "Job tidak ditemukan"})
+                elif len(parts) == 2:
+                    self._send_json(200, job)
+                elif parts[2] == 'result':
+                    self._send_result(parts[1], job)
+                else:
+                    self._send_json(404, {'error': "Path tidak dikenal"})
+                return
+
+            self._send_json(404, {'error': "Path tidak dikenal"})
+
+        def _send_result(self, job_id, job):
+            if job['status'] != 'done':
+                self._send_json(409, {'error': f"Job belum selesai (status {job['status']})", 'status': job['status']})
+                return
+
+            zip_path = service.jobs.get(job_id, {}).get('zip_path')
+            if not zip_path or not os.path.exists(zip_path):
+                self._send_json(404, {'error': "Hasil job sudah dihapus"})
+                return
+            download_name = os.path.splitext(job['filename'])[0] + '.zip'
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/zip')
+            self.send_header('Content-Length', str(os.path.getsize(zip_path)))
+            self.send_header('Content-Disposition', f'attachment; filename="{download_name}"')
+            self.end_headers()
+            with open(zip_path, 'rb') as f:
+                shutil.copyfileobj(f, self.wfile)
+
+        def do_POST(self):
+            url = urlparse(self.path)
+            if [part for part in url.path.split('/') if part] != ['jobs']:
+                self._send_json(404, {'error': "Path tidak dikenal"})
+                return
+
+            try:
+                length = int(self.headers.get('Content-Length') or 0)
+                if length <= 0:
+                    raise ServiceError(411, "Body kosong, kirim file xlsx sebagai body request")
+                if length > service.max_upload_bytes:
+                    raise ServiceError(413, f"File terlalu besar (maksimum {service.max_upload_bytes // (1024 * 1024)} MB)")
+                # Tolak sebelum membaca body jika antrian penuh
+                if service.active_jobs() >= service.max_queue:
+                    raise ServiceError(503, "Antrian penuh, coba lagi nanti")
+
+                params = parse_qs(url.query)
+                options = parse_options(params)
+                data = self.rfile.read(length)
+                job = service.submit(data, params.get('filename', ['upload.xlsx'])[0],
+                                     params.get('sheet'), options)
+                self._send_json(202, {'job_id': job['job_id'], 'status': job['status'], 'sheets': job['sheets']},
+                                {'Location': f"/jobs/{job['job_id']}"})
+
+            except ServiceError as e:
+                headers = {'Retry-After': '5'} if e.status == 503 else None
+                if e.status in (411, 413, 503):
+                    # Body tidak dibaca, koneksi tidak bisa dipakai ulang
+                    self.close_connection = True
+                self._send_json(e.status, {'error': str(e)}, headers)
+
+        def do_DELETE(self):
+            parts = self._route()
+            if len(parts) == 2 and parts[0] == 'jobs':
+                if service.delete_job(parts[1]):
+                    self._send_json(200, {'deleted': parts[1]})
+                else:
+                    self._send_json(409, {'error': "Job tidak ada atau masih berjalan"})
+                return
+            self._send_json(404, {'error': "Path tidak dikenal"})
+
+        def log_message(self, format, *args):
+            print(f"🌐 {self.address_string()} {format % args}")
+
+    return ConversionRequestHandler
+
+
+def main(argv=None):
+    """Jalankan HTTP service sampai dihentikan (Ctrl+C)"""
+    parser = argparse.ArgumentParser(description="HTTP service konversi slip gaji Excel ke PDF")
+    parser.add_argument('--host', default='127.0.0.1', help="Alamat bind (default hanya localhost)")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help="Port HTTP")
+    parser.add_argument('--workers', type=int, default=None, help="Jumlah proses konversi (default jumlah CPU)")
+    parser.add_argument('--max-queue', type=int, default=DEFAULT_MAX_QUEUE,
+                        help="Maksimum job menunggu + berjalan, job baru ditolak (503) jika penuh")
+    parser.add_argument('--max-upload-mb', type=int, default=DEFAULT_MAX_UPLOAD_MB, help="Ukuran upload maksimum")
+    parser.add_argument('--work-dir', default=None, help="Folder upload dan hasil (default folder sementara)")
+    parser.add_argument('--job-ttl', type=float, default=DEFAULT_JOB_TTL, help="Umur job selesai sebelum dihapus (detik)")
+    args = parser.parse_args(argv)
+
+    service = ConversionService(args.work_dir, args.workers, args.max_queue,
+                                args.max_upload_mb * 1024 * 1024, args.job_ttl)
+    service.start()
+
+    server = ThreadingHTTPServer((args.host, args.port), create_handler(service))
+    server.daemon_threads = True
+    print(f"🚀 Listening on http://{args.host}:{args.port} (work dir {service.work_directory})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("🛑 Service stopped")
+    finally:
+        server.server_close()
+        service.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
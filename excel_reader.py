@@ -4,20 +4,151 @@ Modul untuk membaca file Excel dan mengekstrak informasi sheet
 """
 
 import openpyxl
-from openpyxl.utils import get_column_letter
 import os
+from workbook_cache import get_workbook_cache, estimate_xlsx_bytes
+from style_grid import StyleGrid
+from style_resolver import openpyxl_color_descriptor
+
+READER_BACKENDS = ('openpyxl', 'native')
+
+
+def create_reader(file_path, backend="openpyxl", read_only=False, disk_cache=None):
+    """
+    Buat reader Excel sesuai backend yang dipilih
+    
+    Args:
+        file_path (str): Path ke file Excel
+        backend (str): 'openpyxl' (ExcelReader) atau 'native' (XlsxNativeReader,
+            parse XML langsung dari zip - lebih cepat untuk ekstraksi nilai)
+        read_only (bool): Mode streaming untuk backend openpyxl
+        disk_cache (SheetDiskCache): Cache sheet di disk untuk backend openpyxl
+        
+    Returns:
+        ExcelReader atau XlsxNativeReader
+    """
+    if backend == "native":
+        from xlsx_native_reader import XlsxNativeReader
+        return XlsxNativeReader(file_path)
+    if backend != "openpyxl":
+        raise Exception(f"Reader backend tidak dikenal: {backend}")
+    return ExcelReader(file_path, read_only=read_only, disk_cache=disk_cache)
+
+
+def load_cached_workbook(file_path):
+    """
+    Load workbook openpyxl penuh lewat cache bersama (sekali parse per file)
+    
+    Args:
+        file_path (str): Path ke file Excel
+        
+    Returns:
+        Workbook: Workbook openpyxl (data_only), jangan di-close oleh pemanggil
+    """
+    return get_workbook_cache().get(
+        file_path, ('openpyxl', 'workbook'),
+        lambda: openpyxl.load_workbook(file_path, data_only=True),
+        size=lambda workbook: estimate_xlsx_bytes(file_path)
+    )
+
+
+def extract_cell_format(cell):
+    """
+    Ambil informasi formatting dari cell openpyxl
+    
+    Args:
+        cell: Cell openpyxl (Cell, ReadOnlyCell atau EmptyCell)
+        
+    Returns:
+        dict: Informasi font, fill, alignment dan border. Warna disimpan sebagai
+            deskriptor (hex ARGB, 'theme:<index>:<tint>' atau 'indexed:<index>')
+    """
+    return {
+        'font_bold': cell.font.bold if cell.font else False,
+        'font_size': cell.font.size if cell.font else 11,
+        'font_color': openpyxl_color_descriptor(cell.font.color) if cell.font else None,
+        'fill_color': openpyxl_color_descriptor(cell.fill.start_color) if cell.fill else None,
+        'alignment': {
+            'horizontal': cell.alignment.horizontal if cell.alignment else None,
+            'vertical': cell.alignment.vertical if cell.alignment else None
+        },
+        'border': bool(cell.border.left.style or cell.border.right.style or 
+                     cell.border.top.style or cell.border.bottom.style) if cell.border else False
+    }
+
+def cell_style_key(cell):
+    """
+    Key hashable untuk style sel openpyxl, sel dengan key sama pasti punya format sama
+    
+    Args:
+        cell: Cell openpyxl (Cell, MergedCell, ReadOnlyCell atau EmptyCell)
+        
+    Returns:
+        Key style (StyleArray, index style read-only, atau None untuk EmptyCell)
+    """
+    style_array = getattr(cell, '_style', None)
+    if style_array is not None:
+        return style_array
+    style_id = getattr(cell, '_style_id', None)
+    if style_id is not None:
+        return ('read_only', style_id)
+    return None
+
+
+def _pack_formatted_data(formatted_data):
+    """
+    Bentuk hasil get_sheet_with_formatting yang bisa disimpan di disk
+    
+    Args:
+        formatted_data (dict): Hasil get_sheet_with_formatting
+        
+    Returns:
+        dict: Payload yang bisa di-serialize ke JSON
+    """
+    return dict(
+        formatted_data,
+        formatting=formatted_data['formatting'].to_payload(),
+        row_heights=list(formatted_data['row_heights'].items())
+    )
+
+
+def _unpack_formatted_data(payload):
+    """
+    Kebalikan _pack_formatted_data
+    
+    Args:
+        payload (dict): Payload dari disk cache
+        
+    Returns:
+        dict: Bentuk sama dengan hasil get_sheet_with_formatting
+    """
+    return dict(
+        payload,
+        formatting=StyleGrid.from_payload(payload['formatting']),
+        row_heights={int(row_num): height for row_num, height in payload['row_heights']}
+    )
+
 
 class ExcelReader:
-    def __init__(self, file_path):
+    def __init__(self, file_path, read_only=False, disk_cache=None):
         """
         Initialize Excel reader dengan file path
         
         Args:
             file_path (str): Path ke file Excel
+            read_only (bool): Mode streaming - worksheet dibaca lazy per baris
+                sehingga memori tidak ikut naik seiring jumlah sheet
+            disk_cache (SheetDiskCache): Optional, cache sheet di disk. Jika diisi,
+                workbook baru di-load saat ada sheet yang tidak ditemukan di cache
         """
         self.file_path = file_path
+        self.read_only = read_only
+        self.disk_cache = disk_cache
         self.workbook = None
-        self.load_workbook()
+        
+        if self.disk_cache is None:
+            self.load_workbook()
+        elif not os.path.exists(self.file_path):
+            raise Exception(f"Error loading Excel file: File tidak ditemukan: {self.file_path}")
         
     def load_workbook(self):
         """Load workbook dari file Excel"""
@@ -25,11 +156,27 @@ class ExcelReader:
             if not os.path.exists(self.file_path):
                 raise FileNotFoundError(f"File tidak ditemukan: {self.file_path}")
                 
-            self.workbook = openpyxl.load_workbook(self.file_path, data_only=True)
+            if self.read_only:
+                # Mode read-only tidak membangun object model untuk semua sheet,
+                # baris baru di-parse saat di-iterasi. Tidak di-cache karena
+                # workbook read-only menahan file tetap terbuka
+                self.workbook = openpyxl.load_workbook(
+                    self.file_path, read_only=True, data_only=True
+                )
+            else:
+                # Workbook penuh di-parse sekali per proses dan dipakai bersama
+                self.workbook = load_cached_workbook(self.file_path)
             
         except Exception as e:
             raise Exception(f"Error loading Excel file: {str(e)}")
     
+    def _ensure_workbook(self):
+        """Pastikan workbook sudah di-load (load lazy jika memakai disk cache)"""
+        if not self.workbook:
+            if self.disk_cache is None:
+                raise Exception("Workbook belum di-load")
+            self.load_workbook()
+    
     def get_sheets_info(self):
         """
         Mendapatkan informasi semua sheet dalam workbook
@@ -37,8 +184,7 @@ class ExcelReader:
         Returns:
             dict: Dictionary dengan nama sheet sebagai key dan info sheet sebagai value
         """
-        if not self.workbook:
-            raise Exception("Workbook belum di-load")
+        self._ensure_workbook()
             
         sheets_info = {}
         
@@ -46,15 +192,17 @@ class ExcelReader:
             worksheet = self.workbook[sheet_name]
             
             # Hitung jumlah baris dan kolom yang terisi
-            max_row = worksheet.max_row
-            max_col = worksheet.max_column
+            # (di mode read-only bisa None jika sheet tidak punya <dimension>)
+            max_row = worksheet.max_row or 0
+            max_col = worksheet.max_column or 0
             
             # Hitung sel yang terisi
             filled_cells = 0
             for row in worksheet.iter_rows(min_row=1, max_row=max_row, 
-                                         min_col=1, max_col=max_col):
-                for cell in row:
-                    if cell.value is not None:
+                                         min_col=1, max_col=max_col,
+                                         values_only=True):
+                for value in row:
+                    if value is not None:
                         filled_cells += 1
             
             sheets_info[sheet_name] = {
@@ -66,32 +214,102 @@ class ExcelReader:
             
         return sheets_info
     
-    def get_sheet_data(self, sheet_name):
+    def _get_worksheet(self, sheet_name):
         """
-        Mendapatkan data dari sheet tertentu
+        Ambil worksheet berdasarkan nama dengan validasi
         
         Args:
             sheet_name (str): Nama sheet
             
         Returns:
-            list: List of lists berisi data sheet
+            Worksheet: Worksheet openpyxl (ReadOnlyWorksheet di mode read-only)
         """
-        if not self.workbook:
-            raise Exception("Workbook belum di-load")
+        self._ensure_workbook()
             
         if sheet_name not in self.workbook.sheetnames:
             raise Exception(f"Sheet '{sheet_name}' tidak ditemukan")
             
-        worksheet = self.workbook[sheet_name]
-        data = []
+        return self.workbook[sheet_name]
+    
+    def iter_sheet_data(self, sheet_name):
+        """
+        Iterasi data sheet baris per baris (lazy)
+        
+        Args:
+            sheet_name (str): Nama sheet
+            
+        Yields:
+            list: Data satu baris dalam bentuk list string
+        """
+        worksheet = self._get_worksheet(sheet_name)
         
         for row in worksheet.iter_rows(values_only=True):
             # Konversi None ke string kosong untuk konsistensi
-            row_data = [str(cell) if cell is not None else "" for cell in row]
-            data.append(row_data)
+            yield [str(cell) if cell is not None else "" for cell in row]
+    
+    def get_sheet_data(self, sheet_name):
+        """
+        Mendapatkan data dari sheet tertentu
+        
+        Args:
+            sheet_name (str): Nama sheet
+            
+        Returns:
+            list: List of lists berisi data sheet
+        """
+        data = get_workbook_cache().get(
+            self.file_path, ('openpyxl', 'data', sheet_name),
+            lambda: self._load_sheet_data(sheet_name)
+        )
+        
+        # Salinan per baris, pemanggil boleh mengubah data tanpa merusak cache
+        return [list(row) for row in data]
+    
+    def _load_sheet_data(self, sheet_name):
+        """Baca data sheet dari disk cache atau workbook"""
+        if self.disk_cache is not None:
+            data = self.disk_cache.load(self.file_path, sheet_name, 'data')
+            if data is not None:
+                return data
+        
+        data = list(self.iter_sheet_data(sheet_name))
+        
+        if self.read_only:
+            self._pad_rows(data)
+        
+        if self.disk_cache is not None:
+            self.disk_cache.store(self.file_path, sheet_name, 'data', data)
             
         return data
     
+    def iter_sheet_with_formatting(self, sheet_name, style_grid):
+        """
+        Iterasi data dan style id sheet baris per baris (lazy)
+        
+        Args:
+            sheet_name (str): Nama sheet
+            style_grid (StyleGrid): Tabel style tempat format unik didaftarkan
+            
+        Yields:
+            tuple: (row_data, row_style_ids) - list nilai sel dan list style id
+                (index ke style_grid.styles)
+        """
+        worksheet = self._get_worksheet(sheet_name)
+        
+        for row in worksheet.iter_rows():
+            row_data = []
+            row_style_ids = []
+            for cell in row:
+                cell_value = str(cell.value) if cell.value is not None else ""
+                row_data.append(cell_value)
+                
+                # Format hanya diekstrak sekali per style unik
+                row_style_ids.append(
+                    style_grid.style_id_for(cell_style_key(cell), lambda: extract_cell_format(cell))
+                )
+                
+            yield row_data, row_style_ids
+    
     def get_sheet_with_formatting(self, sheet_name):
         """
         Mendapatkan sheet dengan informasi formatting
@@ -100,48 +318,57 @@ class ExcelReader:
             sheet_name (str): Nama sheet
             
         Returns:
-            dict: Dictionary berisi data dan formatting info
+            dict: Dictionary berisi data dan formatting info. 'formatting' adalah
+                StyleGrid (style id per sel + tabel style unik), dipakai bersama
+                lewat cache sehingga tidak boleh diubah
         """
-        if not self.workbook:
-            raise Exception("Workbook belum di-load")
-            
-        if sheet_name not in self.workbook.sheetnames:
-            raise Exception(f"Sheet '{sheet_name}' tidak ditemukan")
-            
-        worksheet = self.workbook[sheet_name]
+        formatted_data = get_workbook_cache().get(
+            self.file_path, ('openpyxl', 'formatting', sheet_name, self.read_only),
+            lambda: self._load_sheet_with_formatting(sheet_name)
+        )
+        
+        # Salinan data per baris, formatting dipakai bersama (read-only)
+        return dict(formatted_data, data=[list(row) for row in formatted_data['data']])
+    
+    def _load_sheet_with_formatting(self, sheet_name):
+        """Baca data dan formatting sheet dari disk cache atau workbook"""
+        kind = 'formatting-readonly' if self.read_only else 'formatting'
+        
+        if self.disk_cache is not None:
+            payload = self.disk_cache.load(self.file_path, sheet_name, kind)
+            if payload is not None:
+                return _unpack_formatted_data(payload)
+        
+        formatted_data = self._parse_sheet_with_formatting(sheet_name)
+        
+        if self.disk_cache is not None:
+            self.disk_cache.store(self.file_path, sheet_name, kind, _pack_formatted_data(formatted_data))
+        
+        return formatted_data
+    
+    def _parse_sheet_with_formatting(self, sheet_name):
+        """Parse data dan formatting sheet dari workbook openpyxl"""
+        worksheet = self._get_worksheet(sheet_name)
         
         # Data dengan formatting
         formatted_data = {
             'data': [],
-            'formatting': {},
+            'formatting': StyleGrid(),
             'merged_cells': [],
             'column_widths': {},
             'row_heights': {}
         }
         
         # Ambil data dan formatting
-        for row_idx, row in enumerate(worksheet.iter_rows(), 1):
-            row_data = []
-            for col_idx, cell in enumerate(row, 1):
-                cell_value = str(cell.value) if cell.value is not None else ""
-                row_data.append(cell_value)
-                
-                # Simpan formatting info
-                cell_coord = f"{get_column_letter(col_idx)}{row_idx}"
-                formatted_data['formatting'][cell_coord] = {
-                    'font_bold': cell.font.bold if cell.font else False,
-                    'font_size': cell.font.size if cell.font else 11,
-                    'font_color': str(cell.font.color.rgb) if cell.font and cell.font.color else None,
-                    'fill_color': str(cell.fill.start_color.rgb) if cell.fill and cell.fill.start_color else None,
-                    'alignment': {
-                        'horizontal': cell.alignment.horizontal if cell.alignment else None,
-                        'vertical': cell.alignment.vertical if cell.alignment else None
-                    },
-                    'border': bool(cell.border.left.style or cell.border.right.style or 
-                                 cell.border.top.style or cell.border.bottom.style) if cell.border else False
-                }
-                
+        style_grid = formatted_data['formatting']
+        for row_data, row_style_ids in self.iter_sheet_with_formatting(sheet_name, style_grid):
             formatted_data['data'].append(row_data)
+            style_grid.append_row(row_style_ids)
+        
+        if self.read_only:
+            # Worksheet read-only tidak menyimpan merged cells dan dimensi kolom/baris
+            self._pad_rows(formatted_data['data'])
+            return formatted_data
         
         # Ambil merged cells
         for merged_range in worksheet.merged_cells.ranges:
@@ -159,6 +386,19 @@ class ExcelReader:
                 
         return formatted_data
     
+    def _pad_rows(self, data):
+        """
+        Samakan panjang semua baris (worksheet read-only tanpa <dimension>
+        bisa menghasilkan baris dengan jumlah kolom berbeda)
+        
+        Args:
+            data (list): List of lists, diubah in-place
+        """
+        width = max((len(row) for row in data), default=0)
+        for row in data:
+            if len(row) < width:
+                row.extend([""] * (width - len(row)))
+    
     def get_sheet_names(self):
         """
         Mendapatkan daftar nama sheet
@@ -166,13 +406,13 @@ class ExcelReader:
         Returns:
             list: List nama sheet
         """
-        if not self.workbook:
-            raise Exception("Workbook belum di-load")
+        self._ensure_workbook()
             
         return self.workbook.sheetnames
     
     def close(self):
-        """Tutup workbook"""
+        """Tutup workbook (workbook penuh tetap tersimpan di cache bersama)"""
         if self.workbook:
-            self.workbook.close()
+            if self.read_only:
+                self.workbook.close()
             self.workbook = None
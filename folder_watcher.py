@@ -0,0 +1,192 @@
+"""
+Folder Watcher Module
+Pantau folder input dan konversi workbook baru atau yang berubah secara otomatis.
+Memakai polling (stdlib, jalan di Windows dan share jaringan), file yang masih
+ditulis ditunggu sampai ukuran dan waktu modifikasinya stabil
+"""
+
+import os
+import time
+import zipfile
+from batch_converter import convert_batch
+
+EXCEL_EXTENSIONS = ('.xlsx', '.xlsm', '.xls')
+
+DEFAULT_POLL_INTERVAL = 1.0
+DEFAULT_SETTLE_SECONDS = 2.0
+
+
+def file_signature(file_path):
+    """
+    Tanda file untuk deteksi perubahan
+
+    Returns:
+        tuple: (mtime_ns, size), atau None jika file tidak bisa dibaca
+    """
+    try:
+        stat = os.stat(file_path)
+        return (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        return None
+
+
+def is_complete_workbook(file_path):
+    """
+    Cek apakah file sudah selesai ditulis (xlsx/xlsm: zip dengan central directory utuh)
+
+    Args:
+        file_path (str): Path ke file Excel
+
+    Returns:
+        bool: True jika file bisa dibuka
+    """
+    try:
+        if file_path.lower().endswith('.xls'):
+            with open(file_path, 'rb'):
+                return True
+        with zipfile.ZipFile(file_path) as archive:
+            return 'xl/workbook.xml' in archive.namelist()
+    except Exception:
+        return False
+
+
+class FolderWatcher:
+    def __init__(self, input_directory, output_directory, scheduler, sheet_filter=None, folder_prefix=False,
+                 poll_interval=DEFAULT_POLL_INTERVAL, settle_seconds=DEFAULT_SETTLE_SECONDS, on_batch=None):
+        """
+        Initialize watcher
+
+        Args:
+            input_directory (str): Folder yang dipantau (tidak rekursif)
+            output_directory (str): Folder output (satu subfolder per workbook)
+            scheduler (ConversionScheduler): Scheduler; pool-nya dijalankan sekali dan
+                tetap hidup selama watcher berjalan
+            sheet_filter (SheetFilter): Aturan sheet yang diabaikan
+            folder_prefix (bool): Beri prefix nama folder pada nama file PDF
+            poll_interval (float): Jeda antar scan folder (detik)
+            settle_seconds (float): Lama file harus tidak berubah sebelum dikonversi
+            on_batch (callable): Dipanggil dengan ringkasan convert_batch setiap batch selesai
+        """
+        self.input_directory = input_directory
+        self.output_directory = output_directory
+        self.scheduler = scheduler
+        self.sheet_filter = sheet_filter
+        self.folder_prefix = folder_prefix
+        self.poll_interval = poll_interval
+        self.settle_seconds = settle_seconds
+        self.on_batch = on_batch
+        self._processed = {}  # {path: signature saat terakhir dikonversi}
+        self._pending = {}  # {path: (signature, waktu pertama terlihat stabil)}
+
+    def scan(self):
+        """
+        File Excel di folder input
+
+        Returns:
+            dict: {path absolut: signature}
+        """
+        files = {}
+        try:
+            names = os.listdir(self.input_directory)
+        except OSError as e:
+            print(f"⚠️  Cannot read {self.input_directory}: {str(e)}")
+            return files
+
+        for name in names:
+            # Lewati lock file Excel (~$) dan file sementara
+            if name.startswith(('~$', '.')) or not name.lower().endswith(EXCEL_EXTENSIONS):
+                continue
+            path = os.path.abspath(os.path.join(self.input_directory, name))
+            signature = file_signature(path)
+            if signature is not None:
+                files[path] = signature
+        return files
+
+    def poll(self, now=None):
+        """
+        Satu kali scan: tentukan file baru/berubah yang sudah stabil
+
+        Args:
+            now (float): Waktu sekarang (time.monotonic), untuk test
+
+        Returns:
+            list: Path file yang siap dikonversi
+        """
+        now = time.monotonic() if now is None else now
+        files = self.scan()
+
+        # File yang dihapus tidak perlu diingat lagi
+        for path in list(self._processed):
+            if path not in files:
+                del self._processed[path]
+        for path in list(self._pending):
+            if path not in files:
+                del self._pending[path]
+
+        ready = []
+        for path, signature in sorted(files.items()):
+            if self._processed.get(path) == signature:
+                continue
+
+            pending = self._pending.get(path)
+            if pending is None or pending[0] != signature:
+                # Baru terlihat atau masih ditulis: mulai hitung ulang waktu stabil
+                self._pending[path] = (signature, now)
+                continue
+
+            if now - pending[1] >= self.settle_seconds:
+                if is_complete_workbook(path):
+                    ready.append(path)
+                else:
+                    self._pending[path] = (signature, now)
+
+        return ready
+
+    def run_once(self, now=None):
+        """
+        Scan lalu konversi file yang siap
+
+        Returns:
+            dict: Ringkasan convert_batch, atau None jika tidak ada file yang siap
+        """
+        ready = self.poll(now)
+        if not ready:
+            return None
+
+        signatures = {path: self._pending[path][0] for path in ready}
+        print(f"📥 {len(ready)} workbook(s) ready: {', '.join(os.path.basename(path) for path in ready)}")
+        summary = convert_batch(ready, self.output_directory, self.scheduler,
+                                sheet_filter=self.sheet_filter, folder_prefix=self.folder_prefix)
+
+        # File yang gagal tetap ditandai, dicoba lagi saat file diubah
+        for path, signature in signatures.items():
+            self._processed[path] = signature
+            self._pending.pop(path, None)
+
+        if self.on_batch:
+            self.on_batch(summary)
+        return summary
+
+    def run(self, max_batches=None):
+        """
+        Pantau folder sampai dihentikan (Ctrl+C)
+
+        Args:
+            max_batches (int): Optional, berhenti setelah sejumlah batch (untuk test)
+        """
+        os.makedirs(self.output_directory, exist_ok=True)
+        print(f"👀 Watching {os.path.abspath(self.input_directory)} "
+              f"(poll {self.poll_interval}s, settle {self.settle_seconds}s)")
+
+        batches = 0
+        self.scheduler.start()
+        try:
+            while max_batches is None or batches < max_batches:
+                if self.run_once() is not None:
+                    batches += 1
+                    continue
+                time.sleep(self.poll_interval)
+        except KeyboardInterrupt:
+            print("🛑 Watcher stopped")
+        finally:
+            self.scheduler.shutdown()
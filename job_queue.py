@@ -0,0 +1,390 @@
+"""
+Job Queue Module
+Antrian job konversi di SQLite: setiap sheet adalah task dengan status, jumlah
+percobaan, waktu dan hash output. Run yang berhenti di tengah (crash, listrik
+mati) bisa dilanjutkan tanpa mengulang sheet yang sudah selesai
+"""
+
+import os
+import json
+import time
+import sqlite3
+import threading
+from conversion_manifest import ConversionManifest, file_hash
+
+DEFAULT_QUEUE_FILENAME = '.conversion_jobs.sqlite3'
+
+# Batas percobaan per sheet (termasuk percobaan pertama)
+DEFAULT_MAX_ATTEMPTS = 3
+
+TASK_STATUSES = ('pending', 'running', 'done', 'failed')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    method TEXT NOT NULL,
+    settings TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    created REAL NOT NULL,
+    finished REAL
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id INTEGER NOT NULL REFERENCES jobs(id),
+    file_path TEXT NOT NULL,
+    sheet_name TEXT NOT NULL,
+    output_directory TEXT NOT NULL,
+    folder_prefix TEXT NOT NULL DEFAULT '',
+    cost INTEGER NOT NULL DEFAULT 1,
+    content_hash TEXT,
+    options_hash TEXT,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    seconds REAL,
+    output_path TEXT,
+    output_hash TEXT,
+    started REAL,
+    finished REAL,
+    UNIQUE (job_id, file_path, sheet_name)
+);
+CREATE INDEX IF NOT EXISTS tasks_job_status ON tasks (job_id, status);
+"""
+
+
+class JobQueue:
+    def __init__(self, db_path):
+        """
+        Buka (atau buat) database antrian
+
+        Args:
+            db_path (str): Path file SQLite
+        """
+        self.db_path = db_path
+        directory = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(directory, exist_ok=True)
+
+        # Hasil datang dari thread callback scheduler, akses dijaga lock
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        with self._lock, self.connection:
+            # WAL + synchronous NORMAL: setiap commit tahan crash proses tanpa fsync per sheet
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            self.connection.executescript(_SCHEMA)
+
+    def close(self):
+        """Tutup koneksi database"""
+        self.connection.close()
+
+    def create_job(self, method, converter_settings, tasks):
+        """
+        Simpan job baru beserta task per sheet
+
+        Args:
+            method (str): 'direct' atau 'table'
+            converter_settings (dict): Argumen constructor converter
+            tasks (list): Dict task dengan key 'file_path', 'sheet_name', 'output_directory',
+                dan optional 'folder_prefix', 'cost', 'content_hash', 'options_hash'
+
+        Returns:
+            int: Id job
+        """
+        with self._lock, self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO jobs (method, settings, created) VALUES (?, ?, ?)",
+                (method, json.dumps(converter_settings, sort_keys=True), time.time())
+            )
+            job_id = cursor.lastrowid
+            self.connection.executemany(
+                "INSERT INTO tasks (job_id, file_path, sheet_name, output_directory, folder_prefix, cost, "
+                "content_hash, options_hash) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(job_id, task['file_path'], task['sheet_name'], task['output_directory'],
+                  task.get('folder_prefix', ''), task.get('cost', 1), task.get('content_hash'),
+                  task.get('options_hash')) for task in tasks]
+            )
+        return job_id
+
+    def get_job(self, job_id):
+        """
+        Data job
+
+        Returns:
+            dict: id, method, settings (dict), status, created, finished; None jika tidak ada
+        """
+        with self._lock:
+            row = self.connection.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job['settings'] = json.loads(job['settings'])
+        return job
+
+    def unfinished_jobs(self):
+        """
+        Job yang belum selesai semua task-nya (terlama di depan)
+
+        Returns:
+            list: Id job
+        """
+        with self._lock:
+            rows = self.connection.execute(
+                "SELECT id FROM jobs WHERE status != 'done' ORDER BY id"
+            ).fetchall()
+        return [row['id'] for row in rows]
+
+    def reset_interrupted(self, job_id):
+        """
+        Task yang tercatat 'running' (proses utama berhenti di tengah) dikembalikan ke antrian
+
+        Jika beberapa sheet berjalan bersamaan, percobaannya tidak dihitung (tidak
+        diketahui sheet mana penyebabnya). Sheet yang berjalan sendirian tetap
+        tercatat sebagai percobaan gagal agar sheet yang selalu membuat proses
+        berhenti tetap terkena batas percobaan
+
+        Returns:
+            int: Jumlah task yang di-reset
+        """
+        with self._lock:
+            task_ids = [row['id'] for row in self.connection.execute(
+                "SELECT id FROM tasks WHERE job_id = ? AND status = 'running'", (job_id,)
+            ).fetchall()]
+
+        if len(task_ids) == 1:
+            with self._lock, self.connection:
+                self.connection.execute(
+                    "UPDATE tasks SET status = 'failed', error = ?, finished = ? WHERE id = ?",
+                    ("Proses berhenti saat sheet ini dikonversi", time.time(), task_ids[0])
+                )
+        else:
+            self.requeue_tasks(task_ids)
+        return len(task_ids)
+
+    def requeue_tasks(self, task_ids):
+        """Kembalikan task yang berjalan ke antrian tanpa menghitung percobaannya"""
+        with self._lock, self.connection:
+            self.connection.executemany(
+                "UPDATE tasks SET status = 'pending', attempts = MAX(attempts - 1, 0) WHERE id = ?",
+                [(task_id,) for task_id in task_ids]
+            )
+
+    def runnable_tasks(self, job_id, max_attempts=DEFAULT_MAX_ATTEMPTS):
+        """
+        Task yang perlu dijalankan: pending, atau gagal dan belum mencapai batas percobaan
+
+        Returns:
+            list: Dict task (urut sesuai urutan dibuat)
+        """
+        with self._lock:
+            rows = self.connection.execute(
+                "SELECT * FROM tasks WHERE job_id = ? AND attempts < ? AND status IN ('pending', 'failed') "
+                "ORDER BY id", (job_id, max_attempts)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def start_tasks(self, task_ids):
+        """Tandai task berjalan dan hitung sebagai satu percobaan"""
+        now = time.time()
+        with self._lock, self.connection:
+            self.connection.executemany(
+                "UPDATE tasks SET status = 'running', attempts = attempts + 1, started = ?, error = NULL "
+                "WHERE id = ?", [(now, task_id) for task_id in task_ids]
+            )
+
+    def finish_task(self, task_id, result):
+        """
+        Simpan hasil satu sheet (langsung di-commit)
+
+        Args:
+            task_id (int): Id task
+            result (dict): Hasil scheduler ('success', 'output_file', 'error', 'seconds')
+        """
+        output_path = result.get('output_file') if result['success'] else None
+        with self._lock, self.connection:
+            self.connection.execute(
+                "UPDATE tasks SET status = ?, error = ?, seconds = ?, output_path = ?, output_hash = ?, "
+                "finished = ? WHERE id = ?",
+                ('done' if result['success'] else 'failed', result.get('error'), result.get('seconds'),
+                 output_path, file_hash(output_path) if output_path else None, time.time(), task_id)
+            )
+
+    def update_job_status(self, job_id, max_attempts=DEFAULT_MAX_ATTEMPTS):
+        """
+        Status job dari status task-nya: 'done' jika semua selesai, 'failed' jika ada
+        task yang habis percobaannya, selain itu 'pending'
+
+        Returns:
+            str: Status job
+        """
+        counts = self.task_counts(job_id)
+        with self._lock:
+            exhausted = self.connection.execute(
+                "SELECT COUNT(*) FROM tasks WHERE job_id = ? AND status = 'failed' AND attempts >= ?",
+                (job_id, max_attempts)
+            ).fetchone()[0]
+
+        if counts['done'] == counts['total']:
+            status = 'done'
+        elif exhausted and exhausted + counts['done'] == counts['total']:
+            status = 'failed'
+        else:
+            status = 'pending'
+
+        with self._lock, self.connection:
+            self.connection.execute(
+                "UPDATE jobs SET status = ?, finished = ? WHERE id = ?",
+                (status, time.time() if status != 'pending' else None, job_id)
+            )
+        return status
+
+    def task_counts(self, job_id):
+        """
+        Jumlah task per status
+
+        Returns:
+            dict: {status: jumlah} untuk semua TASK_STATUSES ditambah 'total'
+        """
+        with self._lock:
+            rows = self.connection.execute(
+                "SELECT status, COUNT(*) AS count FROM tasks WHERE job_id = ? GROUP BY status", (job_id,)
+            ).fetchall()
+        counts = {status: 0 for status in TASK_STATUSES}
+        counts.update({row['status']: row['count'] for row in rows})
+        counts['total'] = sum(counts[status] for status in TASK_STATUSES)
+        return counts
+
+    def job_tasks(self, job_id):
+        """Semua task job (untuk ringkasan)"""
+        with self._lock:
+            rows = self.connection.execute("SELECT * FROM tasks WHERE job_id = ? ORDER BY id", (job_id,)).fetchall()
+        return [dict(row) for row in rows]
+
+    def update_manifests(self, job_id):
+        """
+        Catat semua sheet job yang selesai ke manifest folder output-nya, termasuk
+        sheet yang selesai sebelum proses berhenti
+
+        Sheet tanpa content hash tidak dicatat (selalu dibuat ulang pada run berikutnya)
+        """
+        manifests = {}
+        for task in self.job_tasks(job_id):
+            if task['status'] != 'done' or not task['content_hash']:
+                continue
+            manifest = manifests.get(task['output_directory'])
+            if manifest is None:
+                manifest = manifests[task['output_directory']] = ConversionManifest(task['output_directory'])
+            manifest.record(task['sheet_name'], task['file_path'], task['content_hash'],
+                            task['options_hash'], task['output_path'])
+        for manifest in manifests.values():
+            manifest.save()
+
+
+def run_job(job_queue, job_id, scheduler, max_attempts=DEFAULT_MAX_ATTEMPTS, on_result=None):
+    """
+    Jalankan (atau lanjutkan) job sampai semua task selesai atau habis percobaan
+
+    Scheduler harus dibuat dengan isolate=True: sheet selalu dikonversi di proses
+    worker sehingga sheet yang membuat worker mati tidak ikut mematikan proses ini.
+    Jika worker mati, semua sheet yang sedang berjalan ikut gagal; percobaan sheet
+    tersebut tidak dihitung dan sheet dijalankan ulang satu per satu, sehingga
+    hanya sheet penyebabnya yang terkena batas percobaan
+
+    Args:
+        job_queue (JobQueue): Antrian
+        job_id (int): Id job
+        scheduler (ConversionScheduler): Scheduler (isolate=True) dengan method dan opsi job
+        max_attempts (int): Batas percobaan per sheet
+        on_result (callable): Dipanggil untuk setiap hasil sheet (dict scheduler
+            ditambah 'task_id' dan 'attempts')
+
+    Returns:
+        str: Status akhir job
+    """
+    if not scheduler.isolate:
+        raise Exception("Scheduler untuk job queue harus dibuat dengan isolate=True")
+
+    interrupted = job_queue.reset_interrupted(job_id)
+    if interrupted:
+        print(f"♻️  Job {job_id}: {interrupted} interrupted sheet(s) back in queue")
+
+    # Task yang ikut gagal saat worker mati, dijalankan sendirian sampai selesai
+    suspects = set()
+
+    def run_tasks(tasks, files):
+        """Jalankan satu putaran, hasil sheet dicatat langsung ke antrian"""
+        tasks_by_key = {(task['file_path'], task['sheet_name']): task for task in tasks}
+        crashed = []
+        job_queue.start_tasks([task['id'] for task in tasks])
+
+        def record(result):
+            if result.get('worker_crashed'):
+                crashed.append(result)
+                return
+            task = tasks_by_key[(result['file_path'], result['sheet_name'])]
+            job_queue.finish_task(task['id'], result)
+            if on_result:
+                on_result(dict(result, task_id=task['id'], attempts=task['attempts'] + 1))
+
+        scheduler.run(files, record)
+
+        if len(crashed) > 1:
+            # Tidak diketahui sheet mana yang mematikan worker
+            crashed_ids = [tasks_by_key[(result['file_path'], result['sheet_name'])]['id'] for result in crashed]
+            job_queue.requeue_tasks(crashed_ids)
+            suspects.update(crashed_ids)
+            print(f"💥 Job {job_id}: worker died with {len(crashed)} sheet(s) in flight, "
+                  f"retrying them one at a time")
+            return
+
+        # Hanya satu sheet yang berjalan: sheet itu penyebabnya, percobaan dihitung
+        for result in crashed:
+            crashed_result = dict(result)
+            crashed_result.pop('worker_crashed')
+            task = tasks_by_key[(result['file_path'], result['sheet_name'])]
+            job_queue.finish_task(task['id'], crashed_result)
+            if on_result:
+                on_result(dict(crashed_result, task_id=task['id'], attempts=task['attempts'] + 1))
+
+    while True:
+        tasks = job_queue.runnable_tasks(job_id, max_attempts)
+        if not tasks:
+            break
+
+        files, first_try, grouped, isolated = [], {}, [], []
+        for task in tasks:
+            if task['id'] in suspects:
+                isolated.append(task)
+                continue
+            grouped.append(task)
+            if task['attempts'] == 0:
+                # Percobaan pertama: sheet satu file dikelompokkan (workbook dibuka sekali)
+                key = (task['file_path'], task['output_directory'], task['folder_prefix'])
+                if key not in first_try:
+                    first_try[key] = ([], {})
+                    files.append((task['file_path'], first_try[key][0], task['output_directory'],
+                                  task['folder_prefix'], first_try[key][1]))
+                first_try[key][0].append(task['sheet_name'])
+                first_try[key][1][task['sheet_name']] = task['cost']
+            else:
+                files.append(_single_sheet_file(task))
+
+        retries = sum(1 for task in tasks if task['attempts'])
+        print(f"📋 Job {job_id}: {len(tasks)} sheet(s) to run ({retries} retry, {len(isolated)} isolated)")
+
+        if grouped:
+            run_tasks(grouped, files)
+        for task in isolated:
+            run_tasks([task], [_single_sheet_file(task)])
+
+    job_queue.update_manifests(job_id)
+    status = job_queue.update_job_status(job_id, max_attempts)
+    counts = job_queue.task_counts(job_id)
+    print(f"📊 Job {job_id} {status}: {counts['done']}/{counts['total']} sheets done, {counts['failed']} failed")
+    return status
+
+
+def _single_sheet_file(task):
+    """Entry file scheduler untuk satu sheet task"""
+    return (task['file_path'], [task['sheet_name']], task['output_directory'],
+            task['folder_prefix'], {task['sheet_name']: task['cost']})
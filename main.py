@@ -7,8 +7,11 @@ import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, simpledialog
 import os
 from excel_reader import ExcelReader
-from pdf_converter import PDFConverter
+from xlsx_metadata import XlsxMetadataReader
 from pdf_converter_capture import PDFConverterCapture
+from conversion_manifest import ConversionManifest, compute_sheet_hashes, options_hash, file_hash
+from conversion_scheduler import ConversionScheduler, SCHEDULER_METHODS, estimate_sheet_cost, output_filename
+from sheet_filter import is_sheet_ignored
 import threading
 import ttkbootstrap as tb
 from ttkbootstrap.constants import *
@@ -255,8 +258,7 @@ class ExcelToPDFApp:
 
                 # Load sheets data for this file
                 try:
-                    reader = ExcelReader(file_path)
-                    sheets_info = reader.get_sheets_info()
+                    sheets_info = self.read_sheets_info(file_path)
 
                     # Filter out ignored sheets
                     filtered_sheets = {}
@@ -265,7 +267,6 @@ class ExcelToPDFApp:
                             filtered_sheets[sheet_name] = info
 
                     self.files_data[file_path] = filtered_sheets
-                    reader.close()
 
                     print(f"✅ Loaded {len(filtered_sheets)} sheets from {filename}")  # Debug
 
@@ -324,42 +325,7 @@ class ExcelToPDFApp:
 
     def is_sheet_ignored(self, sheet_name):
         """Check if sheet should be ignored based on keywords"""
-        # List of exact matches and keywords to ignore (case-insensitive)
-        ignored_exact = [
-            'payroll adjust',
-            'database',
-            'summary amman',
-            'summary karyawan',
-            'pph 21',
-            'payroll',
-            'payrol',
-            'tarif ter',
-            'hr_libur',
-            'jm_istrht'
-        ]
-
-        # Keywords that should match as whole words or at word boundaries
-        ignored_keywords = [
-            'adjust',  # But not "adjustment"
-        ]
-
-        # Case-insensitive comparison
-        sheet_name_lower = sheet_name.strip().lower()
-
-        # Check exact matches first
-        for exact_match in ignored_exact:
-            if exact_match in sheet_name_lower:
-                return True
-
-        # Check keyword matches (whole word boundaries)
-        import re
-        for keyword in ignored_keywords:
-            # Use word boundary regex to match whole words only
-            pattern = r'\b' + re.escape(keyword) + r'\b'
-            if re.search(pattern, sheet_name_lower):
-                return True
-
-        return False
+        return is_sheet_ignored(sheet_name)
 
     def remove_selected_file(self):
         """Remove selected file from list"""
@@ -478,11 +444,24 @@ class ExcelToPDFApp:
             self.output_path_var.set(directory)
             self.output_directory = directory
 
+    def read_sheets_info(self, file_path):
+        """Read sheet names and used ranges without loading cells"""
+        try:
+            # Fast path: metadata only from the xlsx zip (workbook.xml + <dimension>)
+            reader = XlsxMetadataReader(file_path)
+        except Exception as e:
+            print(f"⚠️  Metadata scan failed, loading full workbook: {str(e)}")
+            reader = ExcelReader(file_path, read_only=True)
+
+        try:
+            return reader.get_sheets_info()
+        finally:
+            reader.close()
+
     def load_sheets_for_file(self, file_path):
         """Load sheets for a specific file"""
         try:
-            reader = ExcelReader(file_path)
-            sheets_info = reader.get_sheets_info()
+            sheets_info = self.read_sheets_info(file_path)
 
             # Filter out sheets 1-9
             filtered_sheets = {}
@@ -491,7 +470,6 @@ class ExcelToPDFApp:
                     filtered_sheets[sheet_name] = info
 
             self.files_data[file_path] = filtered_sheets
-            reader.close()
 
             return filtered_sheets
 
@@ -551,19 +529,17 @@ class ExcelToPDFApp:
 
                     # Get all sheets and filter out ignored ones
                     if file_path in self.files_data:
-                        sheets = list(self.files_data[file_path].keys())
+                        sheets_info = self.files_data[file_path]
                     else:
                         # Load sheets if not already loaded
                         try:
-                            reader = ExcelReader(file_path)
-                            all_sheets = reader.get_sheet_names()
-                            sheets = [s for s in all_sheets if not self.is_sheet_ignored(s)]
-                            reader.close()
+                            sheets_info = {name: info for name, info in self.read_sheets_info(file_path).items()
+                                           if not self.is_sheet_ignored(name)}
                         except:
-                            sheets = []
+                            sheets_info = {}
 
-                    if sheets:  # Only add if file has valid sheets
-                        files_to_process.append((file_path, sheets))
+                    if sheets_info:  # Only add if file has valid sheets
+                        files_to_process.append((file_path, sheets_info))
 
             total_files = len(files_to_process)
 
@@ -572,67 +548,111 @@ class ExcelToPDFApp:
                 return
 
             # Calculate total sheets for progress
-            total_sheets = sum(len(sheets) for _, sheets in files_to_process)
+            total_sheets = sum(len(sheets_info) for _, sheets_info in files_to_process)
             current_sheet = 0
+            total_skipped = 0
+            total_rebuilt = 0
+
+            def advance_progress(count=1):
+                nonlocal current_sheet
+                current_sheet += count
+                progress = (current_sheet / total_sheets) * 100
+                self.progress_var.set(progress)
+                self.progress_percent_var.set(f"{progress:.1f}%")
+
+            # Opsi yang memengaruhi isi PDF, perubahan opsi membuat ulang semua sheet
+            enable_watermark = self.enable_watermark_var.get()
+            options_digest = options_hash(
+                method=conversion_method,
+                enable_watermark=enable_watermark,
+                watermark_hash=file_hash("watermark.png") if enable_watermark else None,
+                preserve_format=self.preserve_format_var.get() if conversion_method == "table" else None,
+                bulk_mode=self.bulk_mode_var.get() if conversion_method == "table" else None
+            )
 
-            for file_path, sheets_to_convert in files_to_process:
-                # Create folder for this file
-                folder_name = self.folder_names.get(file_path, os.path.splitext(os.path.basename(file_path))[0])
-                file_output_dir = os.path.join(base_output_dir, folder_name)
-
-                if not os.path.exists(file_output_dir):
-                    os.makedirs(file_output_dir)
-
-                file_display_name = os.path.basename(file_path)
-                self.status_var.set(f"Processing file: {file_display_name}")
+            # Direct dan table dijadwalkan ke process pool setelah semua file diperiksa
+            scheduled_files = []
+            manifests = {}  # {file_path: (manifest, content_hashes)}
 
+            scheduler = None
+            all_hashes = {}
+            if conversion_method in SCHEDULER_METHODS:
                 if conversion_method == "direct":
-                    # Direct method - fastest, no Excel app needed
-                    from pdf_converter_direct import PDFConverterDirect
+                    converter_settings = {
+                        'enable_watermark': self.enable_watermark_var.get(),
+                        'watermark_opacity': 0.3,
+                        'watermark_position': "bottom-right"
+                    }
+                else:
+                    converter_settings = {
+                        'preserve_formatting': self.preserve_format_var.get(),
+                        'bulk_mode': self.bulk_mode_var.get(),
+                        'streaming': True
+                    }
+
+                # Pool yang sama untuk hash sheet (cek perubahan) dan konversi; sheet di-parse
+                # untuk hash di worker, bukan serial di proses GUI
+                scheduler = ConversionScheduler(conversion_method, converter_settings).start(total_sheets)
+                self.current_sheet_var.set(f"🔍 Checking changes: {total_sheets} sheets")
+                all_hashes = scheduler.hash_sheets([
+                    (file_path, list(sheets_info),
+                     {sheet_name: estimate_sheet_cost(info) for sheet_name, info in sheets_info.items()})
+                    for file_path, sheets_info in files_to_process
+                ])
+
+            try:
+                for file_index, (file_path, sheets_info) in enumerate(files_to_process):
+                    sheets_to_convert = list(sheets_info.keys())
+
+                    # Create folder for this file
+                    folder_name = self.folder_names.get(file_path, os.path.splitext(os.path.basename(file_path))[0])
+                    file_output_dir = os.path.join(base_output_dir, folder_name)
+
+                    if not os.path.exists(file_output_dir):
+                        os.makedirs(file_output_dir)
 
                     # Get folder prefix for file naming
                     folder_prefix = self.folder_names.get(file_path, "")
 
-                    # Use direct conversion (no Excel app)
-                    self.current_sheet_var.set(f"📄 Reading: {file_display_name}")
-                    self.status_var.set(f"File {files_to_process.index((file_path, sheets_to_convert)) + 1}/{len(files_to_process)}")
-
-                    converter = PDFConverterDirect(
-                        enable_watermark=self.enable_watermark_var.get(),
-                        watermark_opacity=0.3,
-                        watermark_position="bottom-right"
-                    )
+                    file_display_name = os.path.basename(file_path)
+                    self.status_var.set(f"Processing file: {file_display_name}")
 
-                    # Convert all sheets directly (fastest)
-                    results = converter.convert_excel_to_pdf_direct(file_path, sheets_to_convert, file_output_dir, folder_prefix)
-
-                    # Update progress for each sheet
-                    for sheet_name in sheets_to_convert:
-                        self.current_sheet_var.set(f"📄 Converting: {sheet_name} (from {file_display_name})")
-
-                        if results.get(sheet_name):
-                            total_sheets_converted += 1
-                            self.current_sheet_var.set(f"✅ Completed: {sheet_name}")
-                        else:
-                            print(f"Failed to convert sheet: {sheet_name}")
-                            self.current_sheet_var.set(f"❌ Failed: {sheet_name}")
-
-                        current_sheet += 1
-                        progress = (current_sheet / total_sheets) * 100
-                        self.progress_var.set(progress)
-                        self.progress_percent_var.set(f"{progress:.1f}%")
-
-                        # Small delay to show progress
-                        import time
-                        time.sleep(0.05)  # Faster delay for direct method
-
-                elif conversion_method == "capture":
-                    # Get folder prefix for file naming
-                    folder_prefix = self.folder_names.get(file_path, "")
-
-                    # Use optimized bulk conversion
+                    # Hanya sheet yang isi, opsi atau PDF-nya berubah sejak run terakhir yang dikonversi
+                    self.current_sheet_var.set(f"🔍 Checking changes: {file_display_name}")
+                    manifest = ConversionManifest(file_output_dir)
+                    if scheduler is not None:
+                        content_hashes = all_hashes[file_path]
+                    else:
+                        content_hashes = compute_sheet_hashes(file_path, sheets_to_convert)
+                    manifests[file_path] = (manifest, content_hashes)
+                    output_paths = {
+                        sheet_name: os.path.join(file_output_dir, self.get_output_filename(
+                            conversion_method, file_path, sheet_name, folder_prefix))
+                        for sheet_name in sheets_to_convert
+                    }
+                    sheets_to_convert = [
+                        sheet_name for sheet_name in sheets_to_convert
+                        if manifest.needs_rebuild(sheet_name, content_hashes[sheet_name],
+                                                  options_digest, output_paths[sheet_name])
+                    ]
+                    total_skipped += manifest.skipped
+                    total_rebuilt += manifest.rebuilt
+                    advance_progress(manifest.skipped)
+
+                    if not sheets_to_convert:
+                        print(f"⏭️  {file_display_name}: all {manifest.skipped} sheets unchanged, skipped")
+                        continue
+
+                    if conversion_method in SCHEDULER_METHODS:
+                        # Biaya per sheet dari used range untuk membagi beban antar worker
+                        sheet_costs = {sheet_name: estimate_sheet_cost(sheets_info.get(sheet_name))
+                                       for sheet_name in sheets_to_convert}
+                        scheduled_files.append((file_path, sheets_to_convert, file_output_dir, folder_prefix, sheet_costs))
+                        continue
+
+                    # Capture method butuh Excel application, file diproses satu per satu
                     self.current_sheet_var.set(f"📄 Opening: {file_display_name}")
-                    self.status_var.set(f"File {files_to_process.index((file_path, sheets_to_convert)) + 1}/{len(files_to_process)}")
+                    self.status_var.set(f"File {file_index + 1}/{len(files_to_process)}")
 
                     converter = PDFConverterCapture(
                         enable_watermark=self.enable_watermark_var.get(),
@@ -649,64 +669,60 @@ class ExcelToPDFApp:
 
                         if results.get(sheet_name):
                             total_sheets_converted += 1
+                            manifest.record(sheet_name, file_path, content_hashes[sheet_name],
+                                            options_digest, results[sheet_name])
                             self.current_sheet_var.set(f"✅ Completed: {sheet_name}")
                         else:
+                            manifest.forget(sheet_name)
                             print(f"Failed to capture sheet: {sheet_name}")
                             self.current_sheet_var.set(f"❌ Failed: {sheet_name}")
 
-                        current_sheet += 1
-                        progress = (current_sheet / total_sheets) * 100
-                        self.progress_var.set(progress)
-                        self.progress_percent_var.set(f"{progress:.1f}%")
+                        advance_progress()
 
                         # Small delay to show progress
                         import time
                         time.sleep(0.1)
 
-                else:
-                    # Table conversion method
-                    converter = PDFConverter(
-                        preserve_formatting=self.preserve_format_var.get(),
-                        bulk_mode=self.bulk_mode_var.get()
-                    )
+                    manifest.save()
 
-                    # Get folder prefix for file naming
-                    folder_prefix = self.folder_names.get(file_path, "")
+                if scheduled_files:
+                    # File utuh atau potongan sheet file besar dikerjakan paralel, progress dari semua worker
 
-                    for sheet_name in sheets_to_convert:
-                        # Update current sheet display
-                        self.current_sheet_var.set(f"📄 Converting: {sheet_name} (from {file_display_name})")
-                        self.status_var.set(f"File {files_to_process.index((file_path, sheets_to_convert)) + 1}/{len(files_to_process)}")
+                    scheduled_sheets = sum(len(sheet_names) for _, sheet_names, _, _, _ in scheduled_files)
+                    self.status_var.set(f"Converting {scheduled_sheets} sheets from {len(scheduled_files)} file(s)")
 
-                        # Create output path in file's folder with prefix
-                        safe_sheet_name = "".join(c for c in sheet_name if c.isalnum() or c in (' ', '-', '_')).rstrip()
-                        if folder_prefix:
-                            pdf_filename = f"{folder_prefix}_{safe_sheet_name}.pdf"
-                        else:
-                            pdf_filename = f"{safe_sheet_name}.pdf"
-                        output_path = os.path.join(file_output_dir, pdf_filename)
+                    def on_result(result):
+                        nonlocal total_sheets_converted
+                        sheet_name = result['sheet_name']
+                        file_display_name = os.path.basename(result['file_path'])
+                        manifest, content_hashes = manifests[result['file_path']]
 
-                        try:
-                            converter.convert_sheet_to_pdf(file_path, sheet_name, output_path)
+                        if result['success']:
                             total_sheets_converted += 1
-                            self.current_sheet_var.set(f"✅ Completed: {sheet_name}")
-                        except Exception as e:
-                            print(f"Failed to convert sheet {sheet_name}: {str(e)}")
+                            manifest.record(sheet_name, result['file_path'], content_hashes[sheet_name],
+                                            options_digest, result['output_file'])
+                            self.current_sheet_var.set(f"✅ Completed: {sheet_name} (from {file_display_name})")
+                        else:
+                            manifest.forget(sheet_name)
+                            print(f"Failed to convert sheet {sheet_name}: {result['error']}")
                             self.current_sheet_var.set(f"❌ Failed: {sheet_name}")
 
-                        current_sheet += 1
-                        progress = (current_sheet / total_sheets) * 100
-                        self.progress_var.set(progress)
-                        self.progress_percent_var.set(f"{progress:.1f}%")
+                        advance_progress()
 
-                        # Small delay to show progress
-                        import time
-                        time.sleep(0.1)
+                    scheduler.run(scheduled_files, on_result)
+
+                    for file_path, _, _, _, _ in scheduled_files:
+                        manifests[file_path][0].save()
+            finally:
+                if scheduler is not None:
+                    scheduler.shutdown()
 
-            self.status_var.set(f"Conversion completed: {total_sheets_converted}/{total_sheets} sheets from {total_files} file(s)")
-            self.current_sheet_var.set(f"🎉 All done! Converted {total_sheets_converted} sheets successfully")
+            self.status_var.set(f"Conversion completed: {total_sheets_converted}/{total_rebuilt} rebuilt, "
+                                f"{total_skipped} unchanged from {total_files} file(s)")
+            self.current_sheet_var.set(f"🎉 All done! Rebuilt {total_sheets_converted} sheets, skipped {total_skipped} unchanged")
             messagebox.showinfo("Success",
-                              f"Successfully converted {total_sheets_converted}/{total_sheets} sheets from {total_files} file(s)\n"
+                              f"Successfully converted {total_sheets_converted}/{total_rebuilt} changed sheets from {total_files} file(s)\n"
+                              f"Skipped (unchanged): {total_skipped}\n"
                               f"Output saved to: {base_output_dir}")
 
         except Exception as e:
@@ -721,6 +737,12 @@ class ExcelToPDFApp:
             # Keep the final message for a few seconds, then clear
             self.root.after(5000, lambda: self.current_sheet_var.set(""))
             
+    def get_output_filename(self, conversion_method, file_path, sheet_name, folder_prefix=""):
+        """Nama file PDF yang akan ditulis converter untuk sheet"""
+        if conversion_method == "capture":
+            return PDFConverterCapture.get_pdf_filename(file_path, sheet_name, folder_prefix)
+        return output_filename(conversion_method, file_path, sheet_name, folder_prefix)
+
     def get_files_summary(self):
         """Get summary of loaded files"""
         if not self.excel_files:
@@ -5,26 +5,78 @@ Modul untuk mengkonversi Excel sheet ke PDF dengan mempertahankan formatting
 
 from reportlab.lib.pagesizes import letter, A4, landscape
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
+from reportlab.platypus import BaseDocTemplate, PageTemplate, Frame
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib import colors
 from reportlab.lib.units import inch, mm
 from reportlab.pdfgen import canvas
 from reportlab.platypus.tableofcontents import TableOfContents
 import os
-from excel_reader import ExcelReader
+from excel_reader import create_reader
+from table_style_compiler import TableStyleCompiler
+from style_resolver import StyleResolver, get_style_resolver
+from canvas_grid_renderer import CanvasGridRenderer, RENDER_ENGINES
+from column_width_engine import ColumnWidthEngine
+from watermark_manager import WatermarkManager, DEFAULT_WATERMARK_TEXT
+
+# Font dan padding horizontal _create_simple_table_style, untuk mengukur lebar kolom
+SIMPLE_TABLE_FONTS = {
+    'body_font': ('Helvetica', 9),
+    'header_font': ('Helvetica-Bold', 10),
+    'padding': 16
+}
 
 class PDFConverter:
-    def __init__(self, preserve_formatting=True, bulk_mode=True):
+    def __init__(self, preserve_formatting=True, bulk_mode=True, streaming=False, reader_backend="openpyxl",
+                 disk_cache=None, render_engine="table", width_engine=None, enable_watermark=False,
+                 watermark_opacity=0.3, watermark_position="bottom-right", watermark_mode="image",
+                 watermark_text=DEFAULT_WATERMARK_TEXT):
         """
         Initialize PDF converter
         
         Args:
             preserve_formatting (bool): Apakah mempertahankan formatting Excel
             bulk_mode (bool): Apakah membuat file PDF terpisah untuk setiap sheet
+            streaming (bool): Baca workbook dengan mode read-only (streaming)
+                agar memori tetap rendah untuk workbook dengan banyak sheet
+            reader_backend (str): 'openpyxl' atau 'native' (parse XML langsung dari zip)
+            disk_cache (SheetDiskCache): Optional, cache sheet di disk untuk run berulang
+                (hanya untuk backend openpyxl)
+            render_engine (str): 'table' (platypus Table) atau 'canvas' (grid digambar
+                langsung ke canvas, lebih cepat untuk sheet besar)
+            width_engine (ColumnWidthEngine): Optional, engine lebar kolom bersama
+                (cache lebar teks dipakai ulang oleh semua sheet)
+            enable_watermark (bool): Enable watermark pada PDF
+            watermark_opacity (float): Transparansi watermark (0.0-1.0)
+            watermark_position (str): Posisi watermark
+            watermark_mode (str): 'image' (watermark.png) atau 'text' (teks vektor)
+            watermark_text (str): Teks watermark untuk mode 'text'
         """
+        if render_engine not in RENDER_ENGINES:
+            raise Exception(f"Render engine tidak dikenal: {render_engine}")
+
         self.preserve_formatting = preserve_formatting
         self.bulk_mode = bulk_mode
+        self.streaming = streaming
+        self.reader_backend = reader_backend
+        self.disk_cache = disk_cache
+        self.render_engine = render_engine
+        self.width_engine = width_engine or ColumnWidthEngine()
         self.styles = getSampleStyleSheet()
+        self.style_compiler = TableStyleCompiler()
+        self.watermark_manager = WatermarkManager(mode=watermark_mode, text=watermark_text) if enable_watermark else None
+        self.watermark_opacity = watermark_opacity
+        self.watermark_position = watermark_position
+
+        # Style judul dipakai bersama untuk semua sheet
+        self.title_style = ParagraphStyle(
+            'CustomTitle',
+            parent=self.styles['Heading1'],
+            fontSize=14,
+            spaceAfter=12,
+            alignment=1,  # Center alignment
+            textColor=colors.darkblue
+        )
         
     def convert_sheet_to_pdf(self, excel_file, sheet_name, output_file):
         """
@@ -37,25 +89,96 @@ class PDFConverter:
         """
         try:
             # Baca data Excel
-            reader = ExcelReader(excel_file)
-            
-            if self.preserve_formatting:
-                sheet_data = reader.get_sheet_with_formatting(sheet_name)
-                data = sheet_data['data']
-                formatting = sheet_data['formatting']
-            else:
-                data = reader.get_sheet_data(sheet_name)
-                formatting = None
-            
-            # Buat PDF
-            self._create_pdf(data, output_file, sheet_name, formatting)
-            
-            reader.close()
+            reader = create_reader(excel_file, self.reader_backend, read_only=self.streaming,
+                                   disk_cache=self.disk_cache)
+            try:
+                self._convert_with_reader(reader, sheet_name, output_file, self._get_style_resolver(excel_file))
+            finally:
+                reader.close()
             
         except Exception as e:
             raise Exception(f"Error converting sheet '{sheet_name}': {str(e)}")
+
+    def convert_sheets_to_pdf(self, excel_file, sheet_names, output_dir, folder_prefix=""):
+        """
+        Konversi beberapa sheet dari satu file Excel, workbook hanya dibuka sekali
+
+        Args:
+            excel_file (str): Path ke file Excel
+            sheet_names (list): List nama sheet yang akan dikonversi
+            output_dir (str): Direktori output
+            folder_prefix (str): Prefix untuk nama file PDF (optional)
+
+        Yields:
+            dict: Hasil per sheet segera setelah selesai, dengan key 'sheet_name',
+                'output_file', 'success' dan 'error'
+        """
+        reader = create_reader(excel_file, self.reader_backend, read_only=self.streaming,
+                               disk_cache=self.disk_cache)
+        try:
+            style_resolver = self._get_style_resolver(excel_file)
+            for sheet_name in sheet_names:
+                output_file = os.path.join(output_dir, self.get_pdf_filename(sheet_name, folder_prefix))
+                result = {
+                    'sheet_name': sheet_name,
+                    'output_file': output_file,
+                    'success': False,
+                    'error': None
+                }
+
+                try:
+                    self._convert_with_reader(reader, sheet_name, output_file, style_resolver)
+                    result['success'] = True
+                except Exception as e:
+                    result['error'] = f"Error converting sheet '{sheet_name}': {str(e)}"
+
+                yield result
+        finally:
+            reader.close()
+
+    @staticmethod
+    def get_pdf_filename(sheet_name, folder_prefix=""):
+        """
+        Nama file PDF untuk sheet
+
+        Args:
+            sheet_name (str): Nama sheet
+            folder_prefix (str): Prefix untuk nama file (optional)
+
+        Returns:
+            str: Nama file, contoh "Prefix_Sheet1.pdf"
+        """
+        safe_sheet_name = "".join(c for c in sheet_name if c.isalnum() or c in (' ', '-', '_')).rstrip()
+        if folder_prefix:
+            return f"{folder_prefix}_{safe_sheet_name}.pdf"
+        return f"{safe_sheet_name}.pdf"
+
+    def _get_style_resolver(self, excel_file):
+        """Resolver warna/font workbook, hanya jika formatting dipertahankan"""
+        return get_style_resolver(excel_file) if self.preserve_formatting else None
+
+    def _convert_with_reader(self, reader, sheet_name, output_file, style_resolver=None):
+        """
+        Konversi satu sheet memakai reader yang sudah terbuka
+
+        Args:
+            reader: ExcelReader atau XlsxNativeReader
+            sheet_name (str): Nama sheet
+            output_file (str): Path output file PDF
+            style_resolver (StyleResolver): Resolver warna/font workbook (optional)
+        """
+        if self.preserve_formatting:
+            sheet_data = reader.get_sheet_with_formatting(sheet_name)
+            data = sheet_data['data']
+            formatting = sheet_data['formatting']
+        else:
+            data = reader.get_sheet_data(sheet_name)
+            formatting = None
+
+        # Buat PDF
+        self._create_pdf(data, output_file, sheet_name, formatting, style_resolver)
     
-    def _create_pdf(self, data, output_file, sheet_name, formatting=None):
+    def _create_pdf(self, data, output_file, sheet_name, formatting=None, style_resolver=None):
         """
         Buat file PDF dari data
 
@@ -63,7 +186,8 @@ class PDFConverter:
             data (list): Data sheet dalam bentuk list of lists
             output_file (str): Path output file
             sheet_name (str): Nama sheet
-            formatting (dict): Informasi formatting (optional)
+            formatting (StyleGrid): Informasi formatting (optional)
+            style_resolver (StyleResolver): Resolver warna/font workbook (optional)
         """
         # Buat direktori output jika belum ada
         output_dir = os.path.dirname(output_file)
@@ -97,100 +221,100 @@ class PDFConverter:
         elements = []
 
         # Tambahkan judul
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=self.styles['Heading1'],
-            fontSize=14,
-            spaceAfter=12,
-            alignment=1,  # Center alignment
-            textColor=colors.darkblue
-        )
-        title = Paragraph(f"<b>{sheet_name}</b>", title_style)
+        title = Paragraph(f"<b>{sheet_name}</b>", self.title_style)
         elements.append(title)
         elements.append(Spacer(1, 10))
 
-        # Proses data untuk text yang lebih pendek
-        processed_data = []
-        for row in filtered_data:
-            processed_row = []
-            for cell in row:
-                cell_str = str(cell) if cell is not None else ""
-                # Batasi panjang cell untuk mencegah overflow
-                if len(cell_str) > 50:
-                    cell_str = cell_str[:47] + "..."
-                processed_row.append(cell_str)
-            processed_data.append(processed_row)
-
-        # Buat tabel
-        table = Table(processed_data)
-
-        # Apply styling sederhana
-        table_style = self._create_simple_table_style(len(processed_data))
-        table.setStyle(table_style)
-
-        # Atur lebar kolom secara merata
-        if num_cols > 0:
-            available_width = page_size[0] - 40*mm  # Total width minus margins
-            col_width = available_width / num_cols
-            table._argW = [col_width] * num_cols
-
-        elements.append(table)
+        # Lebar kolom dari metrik font (font Excel per sel jika formatting dipertahankan),
+        # teks panjang di-wrap (bukan dipotong)
+        string_data = [["" if cell is None else str(cell) for cell in row] for row in filtered_data]
+        available_width = page_size[0] - 40*mm  # Total width minus margins
+        cell_fonts = None
+        if formatting is not None and self.preserve_formatting:
+            cell_fonts = self._resolve_cell_fonts(string_data, formatting, style_resolver)
+        col_widths = self.width_engine.calculate(string_data, available_width, cell_fonts=cell_fonts,
+                                                 **SIMPLE_TABLE_FONTS)
+        processed_data = self.width_engine.wrap_rows(string_data, col_widths, cell_fonts=cell_fonts,
+                                                     **SIMPLE_TABLE_FONTS)
+
+        # Style dasar sederhana, ditambah font/warna/alignment Excel jika formatting dipertahankan
+        if formatting is not None and self.preserve_formatting:
+            table_style = self._create_table_style(processed_data, formatting, style_resolver)
+        else:
+            table_style = self._create_simple_table_style(len(processed_data))
+
+        elements.append(self._create_table(processed_data, table_style, col_widths))
 
         # Build PDF
-        doc.build(elements)
+        self._build_document(doc, elements)
+    
+    def _build_document(self, doc, elements):
+        """
+        Build dokumen, dengan watermark di setiap halaman jika enabled
+        
+        Args:
+            doc (SimpleDocTemplate): Dokumen output
+            elements (list): Flowable
+        """
+        if not self.watermark_manager or not self.watermark_manager.watermark_exists:
+            doc.build(elements)
+            return
+        
+        # Template 'First'/'Later' seperti SimpleDocTemplate.build, watermark
+        # di-stamp di akhir halaman agar berada di atas isi
+        frame = Frame(doc.leftMargin, doc.bottomMargin, doc.width, doc.height, id='normal')
+        doc.addPageTemplates([
+            PageTemplate(id=template_id, frames=[frame], pagesize=doc.pagesize, onPageEnd=self._draw_watermark)
+            for template_id in ('First', 'Later')
+        ])
+        BaseDocTemplate.build(doc, elements)
+    
+    def _draw_watermark(self, canv, doc):
+        """Callback page template: stamp watermark di halaman aktif"""
+        self.watermark_manager.draw_watermark(canv, self.watermark_opacity, self.watermark_position)
     
-    def _create_table_style(self, data, formatting=None):
+    def _create_table(self, data, table_style, col_widths):
         """
-        Buat style untuk tabel
+        Buat flowable tabel sesuai render engine
 
         Args:
             data (list): Data tabel
-            formatting (dict): Informasi formatting
+            table_style (TableStyle): Style tabel
+            col_widths (list): Lebar kolom
 
         Returns:
-            TableStyle: Style untuk tabel
+            Flowable: Table atau CanvasGridRenderer
         """
-        style_commands = [
-            # Header styling
-            ('BACKGROUND', (0, 0), (-1, 0), colors.Color(0.2, 0.4, 0.6)),  # Professional blue header
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),  # White text on header
-            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),  # Center align headers
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),  # Bold header font
-            ('FONTSIZE', (0, 0), (-1, 0), 9),  # Header font size
-            ('TOPPADDING', (0, 0), (-1, 0), 8),  # Header top padding
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 8),  # Header bottom padding
+        if self.render_engine == 'canvas':
+            try:
+                return CanvasGridRenderer(data, table_style, col_widths)
+            except Exception as e:
+                print(f"⚠️  Canvas engine not usable, falling back to Table: {str(e)}")
 
-            # Data styling
-            ('BACKGROUND', (0, 1), (-1, -1), colors.white),  # White background for data
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),  # Regular font for data
-            ('FONTSIZE', (0, 1), (-1, -1), 8),  # Data font size
-            ('ALIGN', (0, 1), (-1, -1), 'LEFT'),  # Left align data
-            ('TOPPADDING', (0, 1), (-1, -1), 4),  # Data top padding
-            ('BOTTOMPADDING', (0, 1), (-1, -1), 4),  # Data bottom padding
-            ('LEFTPADDING', (0, 0), (-1, -1), 6),  # Left padding
-            ('RIGHTPADDING', (0, 0), (-1, -1), 6),  # Right padding
-
-            # Grid and borders
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.Color(0.7, 0.7, 0.7)),  # Light gray grid
-            ('LINEBELOW', (0, 0), (-1, 0), 2, colors.Color(0.2, 0.4, 0.6)),  # Thick line below header
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),  # Top vertical alignment
+        table = Table(data)
+        table.setStyle(table_style)
+        table._argW = col_widths
+        return table
 
-            # Alternating row colors for better readability (manual implementation)
-        ]
+    def _create_table_style(self, data, formatting=None, style_resolver=None):
+        """
+        Buat style tabel sederhana ditambah formatting Excel per sel
 
-        # Add alternating row colors manually
-        if len(data) > 1:
-            for row_idx in range(1, len(data)):
-                if row_idx % 2 == 0:  # Even rows (0-indexed, so actually odd data rows)
-                    style_commands.append(
-                        ('BACKGROUND', (0, row_idx), (-1, row_idx), colors.Color(0.95, 0.95, 0.95))
-                    )
+        Args:
+            data (list): Data tabel
+            formatting (StyleGrid): Informasi formatting
+            style_resolver (StyleResolver): Resolver warna/font workbook
 
+        Returns:
+            TableStyle: Style untuk tabel
+        """
         # Tambahkan formatting khusus jika ada
+        cell_commands = []
         if formatting and self.preserve_formatting:
-            style_commands.extend(self._apply_excel_formatting(data, formatting))
+            cell_commands = self._apply_excel_formatting(data, formatting, style_resolver)
 
-        return TableStyle(style_commands)
+        # Alternating row colors via ROWBACKGROUNDS, command per sel digabung per range
+        return self._compile_table_style(self._simple_style_commands(), cell_commands, len(data))
 
     def _create_simple_table_style(self, num_rows):
         """
@@ -202,7 +326,16 @@ class PDFConverter:
         Returns:
             TableStyle: Style untuk tabel
         """
-        style_commands = [
+        return self._compile_table_style(self._simple_style_commands(), [], num_rows)
+
+    def _simple_style_commands(self):
+        """
+        Command style dasar tabel (font sesuai SIMPLE_TABLE_FONTS yang dipakai untuk lebar kolom)
+
+        Returns:
+            list: Command TableStyle
+        """
+        return [
             # Header styling
             ('BACKGROUND', (0, 0), (-1, 0), colors.Color(0.2, 0.4, 0.6)),
             ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
@@ -228,85 +361,94 @@ class PDFConverter:
             ('VALIGN', (0, 0), (-1, -1), 'TOP'),
         ]
 
-        # Add alternating row colors manually
-        for row_idx in range(1, num_rows):
-            if row_idx % 2 == 0:
-                style_commands.append(
-                    ('BACKGROUND', (0, row_idx), (-1, row_idx), colors.Color(0.95, 0.95, 0.95))
-                )
+    def _compile_table_style(self, style_commands, cell_commands, num_rows):
+        """
+        Gabungkan command style menjadi TableStyle yang ringkas
 
-        return TableStyle(style_commands)
+        Args:
+            style_commands (list): Command dasar tabel
+            cell_commands (list): Command formatting per sel
+            num_rows (int): Jumlah baris tabel
+
+        Returns:
+            TableStyle: Style untuk tabel
+        """
+        table_style = self.style_compiler.compile(
+            style_commands, cell_commands, num_rows,
+            row_backgrounds=[colors.white, colors.Color(0.95, 0.95, 0.95)]
+        )
+        if self.style_compiler.saved_commands > 0:
+            print(f"🎨 Table style: {self.style_compiler.input_commands} → "
+                  f"{self.style_compiler.output_commands} commands")
+        return table_style
+
+    def _resolve_cell_fonts(self, data, formatting, style_resolver=None):
+        """
+        Font efektif per sel yang font Excel-nya berbeda dari font tabel sederhana
+
+        Sama dengan hasil FONTNAME/FONTSIZE dari _apply_excel_formatting di atas font
+        baris SIMPLE_TABLE_FONTS, agar lebar kolom dan wrapping diukur dengan font
+        yang benar-benar digambar
 
-    def _apply_excel_formatting(self, data, formatting):
+        Args:
+            data (list): Data tabel
+            formatting (StyleGrid): Style id per sel
+            style_resolver (StyleResolver): Resolver warna/font workbook
+
+        Returns:
+            dict: {(row_idx, col_idx): (nama font, ukuran)}
+        """
+        resolved_styles = (style_resolver or StyleResolver()).resolve_grid(formatting)
+        num_rows = len(data)
+        num_cols = len(data[0]) if data else 0
+
+        cell_fonts = {}
+        for row_idx, col_idx, style_id in formatting.iter_cells():
+            resolved = resolved_styles[style_id]
+            if row_idx >= num_rows or col_idx >= num_cols or not (resolved.font_name or resolved.font_size):
+                continue
+            row_font = SIMPLE_TABLE_FONTS['header_font'] if row_idx == 0 else SIMPLE_TABLE_FONTS['body_font']
+            cell_fonts[(row_idx, col_idx)] = (resolved.font_name or row_font[0], resolved.font_size or row_font[1])
+        return cell_fonts
+
+    def _apply_excel_formatting(self, data, formatting, style_resolver=None):
         """
         Apply formatting Excel ke tabel PDF
         
         Args:
             data (list): Data tabel
-            formatting (dict): Informasi formatting Excel
+            formatting (StyleGrid): Style id per sel dan tabel style unik
+            style_resolver (StyleResolver): Resolver warna/font workbook
             
         Returns:
             list: List command styling tambahan
         """
+        resolver = style_resolver or StyleResolver()
+
+        # Command per style unik dihitung sekali, lalu dipakai untuk setiap sel
+        commands_by_style = []
+        for resolved in resolver.resolve_grid(formatting):
+            style_commands = []
+            if resolved.font_name:
+                style_commands.append(('FONTNAME', resolved.font_name))
+            if resolved.font_size:
+                style_commands.append(('FONTSIZE', resolved.font_size))
+            if resolved.text_color is not None:
+                style_commands.append(('TEXTCOLOR', resolved.text_color))
+            if resolved.background is not None and resolved.background != colors.white:
+                style_commands.append(('BACKGROUND', resolved.background))
+            if resolved.align:
+                style_commands.append(('ALIGN', resolved.align))
+            commands_by_style.append(style_commands)
+
         additional_styles = []
-        
-        from openpyxl.utils import get_column_letter
-
-        for row_idx, row in enumerate(data):
-            for col_idx, cell in enumerate(row):
-                # Koordinat sel dalam format Excel (A1, B1, etc.)
-                cell_coord = f"{get_column_letter(col_idx + 1)}{row_idx + 1}"
-                
-                if cell_coord in formatting:
-                    cell_format = formatting[cell_coord]
-                    
-                    # Apply bold font
-                    if cell_format.get('font_bold'):
-                        additional_styles.append(
-                            ('FONTNAME', (col_idx, row_idx), (col_idx, row_idx), 'Helvetica-Bold')
-                        )
-                    
-                    # Apply font size
-                    font_size = cell_format.get('font_size', 8)
-                    if font_size and font_size != 11:  # 11 adalah default Excel
-                        pdf_font_size = max(6, min(font_size, 14))  # Batasi ukuran font
-                        additional_styles.append(
-                            ('FONTSIZE', (col_idx, row_idx), (col_idx, row_idx), pdf_font_size)
-                        )
-                    
-                    # Apply background color
-                    fill_color = cell_format.get('fill_color')
-                    if fill_color and fill_color != 'FFFFFFFF':  # Bukan putih
-                        try:
-                            # Konversi hex color ke RGB
-                            if len(fill_color) == 8:  # ARGB format
-                                fill_color = fill_color[2:]  # Hapus alpha channel
-                            
-                            r = int(fill_color[0:2], 16) / 255.0
-                            g = int(fill_color[2:4], 16) / 255.0
-                            b = int(fill_color[4:6], 16) / 255.0
-                            
-                            additional_styles.append(
-                                ('BACKGROUND', (col_idx, row_idx), (col_idx, row_idx), 
-                                 colors.Color(r, g, b))
-                            )
-                        except:
-                            pass  # Skip jika error parsing color
-                    
-                    # Apply text alignment
-                    alignment = cell_format.get('alignment', {})
-                    horizontal = alignment.get('horizontal')
-                    if horizontal:
-                        align_map = {
-                            'center': 'CENTER',
-                            'right': 'RIGHT',
-                            'left': 'LEFT'
-                        }
-                        if horizontal in align_map:
-                            additional_styles.append(
-                                ('ALIGN', (col_idx, row_idx), (col_idx, row_idx), 
-                                 align_map[horizontal])
-                            )
+        num_rows = len(data)
+        num_cols = len(data[0]) if data else 0
+
+        for row_idx, col_idx, style_id in formatting.iter_cells():
+            if row_idx < num_rows and col_idx < num_cols:
+                for op, value in commands_by_style[style_id]:
+                    additional_styles.append((op, (col_idx, row_idx), (col_idx, row_idx), value))
         
         return additional_styles
 
@@ -354,7 +496,7 @@ class PDFConverter:
 
     def _calculate_column_widths(self, data, available_width):
         """
-        Hitung lebar kolom secara dinamis berdasarkan konten
+        Hitung lebar kolom secara dinamis berdasarkan konten (metrik font)
 
         Args:
             data (list): Data tabel
@@ -363,40 +505,8 @@ class PDFConverter:
         Returns:
             list: List lebar kolom
         """
-        if not data:
-            return []
-
-        num_cols = len(data[0])
-        col_max_lengths = [0] * num_cols
-
-        # Hitung panjang maksimum untuk setiap kolom
-        for row in data:
-            for col_idx, cell in enumerate(row):
-                if col_idx < num_cols:
-                    cell_length = len(str(cell).split('\n')[0])  # Ambil baris pertama
-                    col_max_lengths[col_idx] = max(col_max_lengths[col_idx], cell_length)
-
-        # Hitung total length
-        total_length = sum(col_max_lengths)
-
-        if total_length == 0:
-            # Jika semua kolom kosong, bagi rata
-            return [available_width / num_cols] * num_cols
-
-        # Distribusi lebar berdasarkan proporsi konten
-        col_widths = []
-        for length in col_max_lengths:
-            proportion = length / total_length
-            width = max(available_width * proportion, 20*mm)  # Minimum 20mm
-            col_widths.append(width)
-
-        # Normalisasi jika total melebihi available width
-        total_width = sum(col_widths)
-        if total_width > available_width:
-            scale_factor = available_width / total_width
-            col_widths = [width * scale_factor for width in col_widths]
-
-        return col_widths
+        string_data = [["" if cell is None else str(cell) for cell in row] for row in data]
+        return self.width_engine.calculate(string_data, available_width, **SIMPLE_TABLE_FONTS)
 
     def _filter_empty_rows_cols(self, data):
         """
@@ -448,4 +558,4 @@ class PDFConverter:
         elements.append(Spacer(1, 20))
         elements.append(message)
         
-        doc.build(elements)
+        self._build_document(doc, elements)
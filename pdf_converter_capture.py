@@ -12,10 +12,11 @@ from reportlab.lib import colors
 from reportlab.lib.units import mm
 from PIL import Image
 import tempfile
-from watermark_manager import WatermarkManager
+from watermark_manager import WatermarkManager, DEFAULT_WATERMARK_TEXT
 
 class PDFConverterCapture:
-    def __init__(self, page_orientation='portrait', enable_watermark=True, watermark_opacity=0.3, watermark_position="bottom-right"):
+    def __init__(self, page_orientation='portrait', enable_watermark=True, watermark_opacity=0.3, watermark_position="bottom-right",
+                 watermark_mode="image", watermark_text=DEFAULT_WATERMARK_TEXT):
         """
         Initialize PDF converter dengan capture method
 
@@ -24,11 +25,13 @@ class PDFConverterCapture:
             enable_watermark (bool): Enable watermark pada PDF
             watermark_opacity (float): Transparansi watermark (0.0-1.0)
             watermark_position (str): Posisi watermark
+            watermark_mode (str): 'image' (watermark.png) atau 'text' (teks vektor)
+            watermark_text (str): Teks watermark untuk mode 'text'
         """
         self.page_orientation = page_orientation
         self.styles = getSampleStyleSheet()
         self.enable_watermark = enable_watermark
-        self.watermark_manager = WatermarkManager() if enable_watermark else None
+        self.watermark_manager = WatermarkManager(mode=watermark_mode, text=watermark_text) if enable_watermark else None
         self.watermark_opacity = watermark_opacity
         self.watermark_position = watermark_position
         
@@ -60,20 +63,11 @@ class PDFConverterCapture:
             for sheet_name in selected_sheets:
                 try:
                     # Nama file output dengan prefix
-                    safe_sheet_name = "".join(c for c in sheet_name if c.isalnum() or c in (' ', '-', '_')).rstrip()
-                    if folder_prefix:
-                        pdf_filename = f"{folder_prefix}_{safe_sheet_name}.pdf"
-                    else:
-                        base_name = os.path.splitext(os.path.basename(excel_file))[0]
-                        pdf_filename = f"{base_name}_{safe_sheet_name}.pdf"
-
-                    pdf_path = os.path.join(output_directory, pdf_filename)
+                    pdf_path = os.path.join(output_directory,
+                                            self.get_pdf_filename(excel_file, sheet_name, folder_prefix))
 
-                    # Capture sheet langsung ke PDF dengan watermark jika enabled
-                    if self.enable_watermark and self.watermark_manager and self.watermark_manager.watermark_exists:
-                        captured_pdf = capture.capture_sheet_as_png(sheet_name, add_watermark=True, watermark_text="CONFIDENTIAL")
-                    else:
-                        captured_pdf = capture.capture_sheet_as_png(sheet_name)
+                    # Capture sheet langsung ke PDF
+                    captured_pdf = capture.capture_sheet_as_png(sheet_name)
 
                     # Copy hasil capture ke lokasi yang diinginkan
                     if captured_pdf and os.path.exists(captured_pdf):
@@ -87,10 +81,9 @@ class PDFConverterCapture:
                         except:
                             pass
 
-                        # Tambahkan watermark jika enabled (skip untuk sekarang, biarkan PDF original)
+                        # Tambahkan watermark jika enabled (overlay di atas halaman hasil capture)
                         if self.enable_watermark and self.watermark_manager and self.watermark_manager.watermark_exists:
-                            print(f"🎨 Watermark enabled for {sheet_name} (feature ready)")
-                            # Watermark akan ditambahkan di versi mendatang dengan PyPDF2
+                            self._add_watermark_to_existing_pdf(pdf_path, sheet_name)
 
                         results[sheet_name] = pdf_path
                     else:
@@ -107,6 +100,25 @@ class PDFConverterCapture:
             capture.close()
 
         return results
+
+    @staticmethod
+    def get_pdf_filename(excel_file, sheet_name, folder_prefix=""):
+        """
+        Nama file PDF per sheet (sama dengan PDFConverterDirect)
+
+        Args:
+            excel_file (str): Path ke file Excel
+            sheet_name (str): Nama sheet
+            folder_prefix (str): Prefix untuk nama file (default nama file Excel)
+
+        Returns:
+            str: Nama file, contoh "Prefix_Sheet1.pdf"
+        """
+        safe_sheet_name = "".join(c for c in sheet_name if c.isalnum() or c in (' ', '-', '_')).rstrip()
+        if folder_prefix:
+            return f"{folder_prefix}_{safe_sheet_name}.pdf"
+        base_name = os.path.splitext(os.path.basename(excel_file))[0]
+        return f"{base_name}_{safe_sheet_name}.pdf"
     
     def convert_single_sheet(self, excel_file, sheet_name, output_path, capture_instance=None):
         """
@@ -139,11 +151,8 @@ class PDFConverterCapture:
             if output_dir and not os.path.exists(output_dir):
                 os.makedirs(output_dir)
 
-            # Capture sheet dengan watermark jika enabled
-            if self.enable_watermark and self.watermark_manager and self.watermark_manager.watermark_exists:
-                captured_pdf = capture.capture_sheet_as_png(sheet_name, add_watermark=True, watermark_text="CONFIDENTIAL")
-            else:
-                captured_pdf = capture.capture_sheet_as_png(sheet_name)
+            # Capture sheet
+            captured_pdf = capture.capture_sheet_as_png(sheet_name)
 
             if captured_pdf and os.path.exists(captured_pdf):
                 # Copy hasil capture ke lokasi yang diinginkan
@@ -156,10 +165,9 @@ class PDFConverterCapture:
                 except:
                     pass
 
-                # Tambahkan watermark jika enabled (skip untuk sekarang)
+                # Tambahkan watermark jika enabled (overlay di atas halaman hasil capture)
                 if self.enable_watermark and self.watermark_manager and self.watermark_manager.watermark_exists:
-                    print(f"🎨 Watermark enabled for {os.path.basename(output_path)} (feature ready)")
-                    # Watermark akan ditambahkan di versi mendatang dengan PyPDF2
+                    self._add_watermark_to_existing_pdf(output_path, sheet_name)
 
                 return True
             else:
@@ -179,7 +187,7 @@ class PDFConverterCapture:
 
     def _add_watermark_to_existing_pdf(self, pdf_path, sheet_name):
         """
-        Tambahkan watermark ke PDF yang sudah ada dengan menambahkan teks/image overlay
+        Tambahkan watermark (gambar atau teks vektor) ke PDF hasil capture
 
         Args:
             pdf_path (str): Path ke PDF file
@@ -188,62 +196,17 @@ class PDFConverterCapture:
         Returns:
             bool: True jika berhasil
         """
-        try:
-            if not self.watermark_manager or not self.watermark_manager.watermark_exists:
-                return False
-
-            # Baca PDF original dan tambahkan watermark menggunakan reportlab
-            from reportlab.pdfgen import canvas
-            from reportlab.lib.pagesizes import A4
-
-            # Buat temporary file untuk PDF dengan watermark
-            temp_watermarked = tempfile.NamedTemporaryFile(delete=False, suffix='_watermarked.pdf')
-            temp_watermarked.close()
-
-            # Baca konten PDF original (simplified approach)
-            # Karena kita tidak bisa merge PDF tanpa PyPDF2, kita akan menambahkan watermark text
-
-            # Buat canvas baru dengan watermark
-            c = canvas.Canvas(temp_watermarked.name, pagesize=A4)
-
-            # Tambahkan watermark text yang visible
-            page_width, page_height = A4
-
-            # Tambahkan watermark text di beberapa posisi
-            c.saveState()
-            c.setFillAlpha(0.3)  # Transparansi
-            c.setFont("Helvetica-Bold", 48)
-            c.setFillGray(0.8)
-
-            # Watermark di tengah
-            c.drawCentredText(page_width/2, page_height/2, "WATERMARK")
-
-            # Watermark di pojok kanan bawah
-            c.setFont("Helvetica", 24)
-            c.drawRightString(page_width - 50, 50, "SAMPLE")
-
-            # Watermark di pojok kiri atas
-            c.drawString(50, page_height - 50, "CONFIDENTIAL")
-
-            c.restoreState()
-            c.save()
-
-            # Copy watermarked PDF ke lokasi original
-            import shutil
-            shutil.copy2(temp_watermarked.name, pdf_path)
-
-            # Cleanup
-            try:
-                os.remove(temp_watermarked.name)
-            except:
-                pass
-
-            print(f"✅ Text watermark added to {sheet_name}")
-            return True
-
-        except Exception as e:
-            print(f"❌ Error adding watermark: {str(e)}")
+        if not self.watermark_manager or not self.watermark_manager.watermark_exists:
             return False
+
+        success = self.watermark_manager.add_watermark_to_pdf(
+            pdf_path,
+            opacity=self.watermark_opacity,
+            position=self.watermark_position
+        )
+        if not success:
+            print(f"⚠️  Failed to add watermark to {sheet_name}")
+        return success
     
     def create_combined_pdf(self, excel_file, selected_sheets, output_path):
         """
@@ -4,26 +4,142 @@ Konversi Excel ke PDF tanpa membuka Excel application
 """
 
 import os
-import pandas as pd
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+import reportlab
 from reportlab.lib.pagesizes import A4, landscape
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+from reportlab.platypus import Table, TableStyle, Paragraph, Spacer, Flowable
+from reportlab.platypus import BaseDocTemplate, PageTemplate, Frame, NextPageTemplate, PageBreak
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib import colors
 from reportlab.lib.units import mm
 import openpyxl
 from openpyxl.styles import Font, PatternFill, Alignment
 import tempfile
-from watermark_manager import WatermarkManager
+from watermark_manager import WatermarkManager, DEFAULT_WATERMARK_TEXT
+from excel_reader import extract_cell_format, cell_style_key, load_cached_workbook, READER_BACKENDS
+from xlsx_native_reader import XlsxNativeReader
+from table_style_compiler import TableStyleCompiler
+from style_grid import StyleGrid
+from style_resolver import StyleResolver, get_style_resolver
+from slip_template import (SlipTemplate, TemplateTable, LiveFlowable, LivePageCallback, layout_fingerprint,
+                           templates_supported)
+from canvas_grid_renderer import CanvasGridRenderer, RENDER_ENGINES
+from pdf_splitter import PDFSplitter, PDF_SPLIT_AVAILABLE
+
+# Jumlah maksimum layout slip yang disimpan
+MAX_SLIP_TEMPLATES = 32
+
+# Suffix file index rentang halaman per sheet di samping PDF gabungan
+PAGE_INDEX_SUFFIX = '.pages.json'
+
+
+class SheetBookmark(Flowable):
+    """Flowable kosong di awal sheet: bookmark, entry outline dan nomor halaman awal"""
+
+    def __init__(self, outline_entries, on_draw=None):
+        """
+        Args:
+            outline_entries (list): (nama bookmark unik, judul, level) entry outline
+                yang menunjuk ke halaman ini
+            on_draw (callable): Dipanggil dengan nomor halaman saat bookmark digambar
+        """
+        Flowable.__init__(self)
+        self.outline_entries = outline_entries
+        self.on_draw = on_draw
+        self.width = self.height = 0
+
+    def wrap(self, availWidth, availHeight):
+        return 0, 0
+
+    def draw(self):
+        for key, title, level in self.outline_entries:
+            self.canv.bookmarkPage(key)
+            self.canv.addOutlineEntry(title, key, level=level)
+        self.canv.showOutline()
+        if self.on_draw:
+            self.on_draw(self.canv.getPageNumber())
+
 
 class PDFConverterDirect:
-    def __init__(self, enable_watermark=True, watermark_opacity=0.3, watermark_position="bottom-right"):
-        """Initialize direct PDF converter"""
+    def __init__(self, enable_watermark=True, watermark_opacity=0.3, watermark_position="bottom-right",
+                 reader_backend="openpyxl", use_slip_templates=True, render_engine="table",
+                 split_from_master=False, watermark_mode="image", watermark_text=DEFAULT_WATERMARK_TEXT,
+                 parallel=False, max_workers=None):
+        """
+        Initialize direct PDF converter
+
+        Args:
+            enable_watermark (bool): Enable watermark pada PDF
+            watermark_opacity (float): Transparansi watermark (0.0-1.0)
+            watermark_position (str): Posisi watermark
+            reader_backend (str): 'openpyxl' atau 'native' (parse XML langsung dari zip,
+                lebih cepat karena hanya butuh nilai dan style id)
+            use_slip_templates (bool): Pakai ulang layout halaman untuk sheet dengan
+                struktur identik (slip gaji), hanya teks sel yang digambar ulang
+            render_engine (str): 'table' (platypus Table) atau 'canvas' (grid digambar
+                langsung ke canvas). Template slip hanya dipakai dengan engine 'table'
+            split_from_master (bool): Render semua sheet sebagai satu dokumen master
+                lalu pecah per sheet dengan menyalin halaman (butuh pypdf/PyPDF2)
+            watermark_mode (str): 'image' (watermark.png) atau 'text' (teks vektor)
+            watermark_text (str): Teks watermark untuk mode 'text'
+            parallel (bool): Render sheet di process pool, setiap worker membuka
+                workbook sekali (tidak dipakai bersama split_from_master)
+            max_workers (int): Jumlah proses untuk mode parallel (default jumlah CPU)
+        """
+        if reader_backend not in READER_BACKENDS:
+            raise Exception(f"Reader backend tidak dikenal: {reader_backend}")
+        if render_engine not in RENDER_ENGINES:
+            raise Exception(f"Render engine tidak dikenal: {render_engine}")
+
         self.styles = getSampleStyleSheet()
+        self.style_compiler = TableStyleCompiler()
+        self.use_slip_templates = use_slip_templates and render_engine == 'table'
+        if self.use_slip_templates and not templates_supported():
+            print(f"⚠️  Slip templates not tested with reportlab {reportlab.Version}, rendering every sheet fully")
+            self.use_slip_templates = False
+        self.render_engine = render_engine
+        self.slip_templates = {}  # {layout fingerprint: SlipTemplate}
+        
+        # Style judul dipakai bersama untuk semua sheet
+        self.title_style = ParagraphStyle(
+            'CustomTitle',
+            parent=self.styles['Heading1'],
+            fontSize=14,
+            spaceAfter=10,
+            alignment=1,  # Center alignment
+            textColor=colors.darkblue
+        )
+        self.reader_backend = reader_backend
         self.enable_watermark = enable_watermark
-        self.watermark_manager = WatermarkManager() if enable_watermark else None
+        self.watermark_manager = WatermarkManager(mode=watermark_mode, text=watermark_text) if enable_watermark else None
         self.watermark_opacity = watermark_opacity
         self.watermark_position = watermark_position
         
+        self.split_from_master = split_from_master
+        if split_from_master and not PDF_SPLIT_AVAILABLE:
+            print("⚠️  pypdf/PyPDF2 not installed, rendering one document per sheet instead")
+            self.split_from_master = False
+        
+        self.parallel = parallel
+        self.max_workers = max_workers
+        
+        # Waktu render per sheet dari konversi sekuensial terakhir {sheet_name: detik}
+        self.sheet_seconds = {}
+        
+        # Argumen untuk membuat converter yang sama di proses worker
+        self.settings = {
+            'enable_watermark': enable_watermark,
+            'watermark_opacity': watermark_opacity,
+            'watermark_position': watermark_position,
+            'reader_backend': reader_backend,
+            'use_slip_templates': use_slip_templates,
+            'render_engine': render_engine,
+            'watermark_mode': watermark_mode,
+            'watermark_text': watermark_text
+        }
+        
     def convert_excel_to_pdf_direct(self, excel_file, selected_sheets, output_directory, folder_prefix=""):
         """
         Konversi Excel ke PDF tanpa membuka Excel application
@@ -38,46 +154,40 @@ class PDFConverterDirect:
             dict: Dictionary hasil konversi {sheet_name: pdf_path}
         """
         results = {}
+        self.sheet_seconds = {}
         
         # Buat direktori output jika belum ada
         if not os.path.exists(output_directory):
             os.makedirs(output_directory)
         
+        if self.split_from_master:
+            return self._convert_via_master(excel_file, selected_sheets, output_directory, folder_prefix)
+        
+        if self.parallel and self._worker_count(len(selected_sheets)) > 1:
+            return self._convert_parallel(excel_file, selected_sheets, output_directory, folder_prefix)
+        
         try:
-            # Baca Excel file menggunakan openpyxl (tidak membuka Excel)
-            workbook = openpyxl.load_workbook(excel_file, data_only=True)
+            # Baca Excel file tanpa membuka Excel (openpyxl atau native reader)
+            workbook = self._open_workbook(excel_file)
+            sheet_names = self._get_sheet_names(workbook)
+            style_resolver = get_style_resolver(excel_file)
             
             for sheet_name in selected_sheets:
+                sheet_start = time.perf_counter()
                 try:
-                    if sheet_name not in workbook.sheetnames:
+                    if sheet_name not in sheet_names:
                         print(f"Sheet '{sheet_name}' not found in workbook")
                         results[sheet_name] = None
                         continue
                     
                     # Nama file output dengan prefix
-                    safe_sheet_name = "".join(c for c in sheet_name if c.isalnum() or c in (' ', '-', '_')).rstrip()
-                    if folder_prefix:
-                        pdf_filename = f"{folder_prefix}_{safe_sheet_name}.pdf"
-                    else:
-                        base_name = os.path.splitext(os.path.basename(excel_file))[0]
-                        pdf_filename = f"{base_name}_{safe_sheet_name}.pdf"
-                    
-                    pdf_path = os.path.join(output_directory, pdf_filename)
+                    pdf_path = os.path.join(output_directory,
+                                            self.get_pdf_filename(excel_file, sheet_name, folder_prefix))
                     
                     # Konversi sheet ke PDF
-                    success = self._convert_sheet_to_pdf(workbook, sheet_name, pdf_path)
+                    success = self._convert_sheet_to_pdf(workbook, sheet_name, pdf_path, style_resolver)
 
                     if success:
-                        # Tambahkan watermark jika enabled
-                        if self.enable_watermark and self.watermark_manager:
-                            watermark_success = self.watermark_manager.add_watermark_to_pdf(
-                                pdf_path,
-                                opacity=self.watermark_opacity,
-                                position=self.watermark_position
-                            )
-                            if not watermark_success:
-                                print(f"⚠️  Failed to add watermark to {sheet_name}")
-
                         results[sheet_name] = pdf_path
                     else:
                         results[sheet_name] = None
@@ -85,31 +195,362 @@ class PDFConverterDirect:
                 except Exception as e:
                     print(f"Error converting sheet '{sheet_name}': {str(e)}")
                     results[sheet_name] = None
+                
+                finally:
+                    self.sheet_seconds[sheet_name] = time.perf_counter() - sheet_start
             
-            workbook.close()
+            self._close_workbook(workbook)
             
         except Exception as e:
             print(f"Error opening Excel file: {str(e)}")
             
         return results
     
-    def _convert_sheet_to_pdf(self, workbook, sheet_name, output_path):
+    def _convert_via_master(self, excel_file, selected_sheets, output_directory, folder_prefix=""):
+        """
+        Render semua sheet sebagai satu dokumen master lalu pecah per sheet
+        
+        Font dan watermark hanya di-embed sekali saat render; file per sheet
+        dibuat dengan menyalin objek halaman dari master sesuai index halaman
+        
+        Args:
+            excel_file (str): Path ke file Excel
+            selected_sheets (list): List nama sheet
+            output_directory (str): Direktori output
+            folder_prefix (str): Prefix untuk nama file
+            
+        Returns:
+            dict: Dictionary hasil konversi {sheet_name: pdf_path}
+        """
+        results = {sheet_name: None for sheet_name in selected_sheets}
+        
+        # Master sementara di direktori output, dihapus setelah dipecah
+        fd, master_path = tempfile.mkstemp(prefix='.master-', suffix='.pdf', dir=output_directory)
+        os.close(fd)
+        
+        try:
+            combined = self.convert_to_combined_pdf([(excel_file, selected_sheets)], master_path, folder_prefix)
+            if combined is None:
+                return results
+            
+            split_results = PDFSplitter(master_path).split(combined['sheets'], output_directory)
+            for entry in combined['sheets']:
+                results[entry['sheet_name']] = split_results.get(entry['pdf_filename'])
+            
+            print(f"✂️  Split {combined['page_count']} pages into {len(combined['sheets'])} file(s)")
+        
+        except Exception as e:
+            print(f"Error splitting master PDF: {str(e)}")
+        
+        finally:
+            try:
+                os.remove(master_path)
+            except OSError:
+                pass
+        
+        return results
+    
+    def _worker_count(self, num_sheets):
+        """Jumlah proses untuk mode parallel (tidak lebih dari jumlah sheet)"""
+        return min(self.max_workers or os.cpu_count() or 1, num_sheets)
+    
+    def _convert_parallel(self, excel_file, selected_sheets, output_directory, folder_prefix=""):
+        """
+        Render sheet di process pool
+        
+        Setiap worker membuka workbook sekali lewat initializer lalu merender
+        potongan sheet yang dibagikan; template slip dan watermark di-cache per worker
+        
+        Args:
+            excel_file (str): Path ke file Excel
+            selected_sheets (list): List nama sheet
+            output_directory (str): Direktori output
+            folder_prefix (str): Prefix untuk nama file
+            
+        Returns:
+            dict: Dictionary hasil konversi {sheet_name: pdf_path}
+        """
+        start = time.perf_counter()
+        max_workers = self._worker_count(len(selected_sheets))
+        tasks = [
+            (sheet_name, os.path.join(output_directory, self.get_pdf_filename(excel_file, sheet_name, folder_prefix)))
+            for sheet_name in selected_sheets
+        ]
+        results = {}
+        
+        try:
+            # Sheet berurutan dikirim per potongan agar worker bisa memakai ulang template slip
+            chunksize = max(1, len(tasks) // (max_workers * 4))
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_direct_worker,
+                                     initargs=(self.settings, excel_file)) as executor:
+                for sheet_name, pdf_path, error in executor.map(_direct_worker, tasks, chunksize=chunksize):
+                    if error:
+                        print(f"Error converting sheet '{sheet_name}': {error}")
+                    results[sheet_name] = pdf_path
+        
+        except Exception as e:
+            print(f"Error in parallel conversion: {str(e)}")
+        
+        for sheet_name in selected_sheets:
+            results.setdefault(sheet_name, None)
+        
+        success_count = sum(1 for pdf_path in results.values() if pdf_path)
+        print(f"⚡ Parallel conversion: {success_count}/{len(selected_sheets)} sheets "
+              f"in {time.perf_counter() - start:.2f}s ({max_workers} worker(s))")
+        
+        return results
+    
+    @staticmethod
+    def get_pdf_filename(excel_file, sheet_name, folder_prefix=""):
+        """
+        Nama file PDF per sheet
+        
+        Args:
+            excel_file (str): Path ke file Excel
+            sheet_name (str): Nama sheet
+            folder_prefix (str): Prefix untuk nama file (default nama file Excel)
+            
+        Returns:
+            str: Nama file, contoh "Prefix_Sheet1.pdf"
+        """
+        safe_sheet_name = "".join(c for c in sheet_name if c.isalnum() or c in (' ', '-', '_')).rstrip()
+        if folder_prefix:
+            return f"{folder_prefix}_{safe_sheet_name}.pdf"
+        base_name = os.path.splitext(os.path.basename(excel_file))[0]
+        return f"{base_name}_{safe_sheet_name}.pdf"
+    
+    def convert_to_combined_pdf(self, sources, output_path, folder_prefix="", write_page_index=False):
+        """
+        Konversi sheet dari satu atau beberapa workbook ke satu PDF dalam satu build
+        
+        Font dan gambar watermark di-embed sekali untuk seluruh dokumen, setiap
+        sheet mendapat bookmark dan entry outline (dikelompokkan per workbook
+        jika lebih dari satu workbook)
+        
+        Args:
+            sources (list): List (excel_file, selected_sheets) sesuai urutan output
+            output_path (str): Path output PDF gabungan
+            folder_prefix (str): Prefix nama file per sheet di index halaman
+            write_page_index (bool): Tulis juga rentang halaman per sheet ke
+                file JSON <output_path>.pages.json
+            
+        Returns:
+            dict: {'output_path', 'page_count', 'index_path', 'sheets', 'failed'};
+                'sheets' berisi rentang halaman (first_page, last_page) per sheet,
+                'failed' berisi (excel_file, sheet_name) yang tidak dikonversi.
+                None jika PDF gagal dibuat
+        """
+        output_dir = os.path.dirname(output_path)
+        if output_dir and not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+        
+        multiple_workbooks = len(sources) > 1
+        elements = []
+        sheets = []
+        failed = []
+        first_orientation = None
+        
+        for excel_file, selected_sheets in sources:
+            try:
+                workbook = self._open_workbook(excel_file)
+            except Exception as e:
+                print(f"Error opening Excel file: {str(e)}")
+                failed.extend((excel_file, sheet_name) for sheet_name in selected_sheets)
+                continue
+            
+            try:
+                sheet_names = self._get_sheet_names(workbook)
+                style_resolver = get_style_resolver(excel_file)
+                workbook_title = os.path.splitext(os.path.basename(excel_file))[0]
+                workbook_bookmarked = False
+                
+                for sheet_name in selected_sheets:
+                    try:
+                        if sheet_name not in sheet_names:
+                            print(f"Sheet '{sheet_name}' not found in workbook")
+                            failed.append((excel_file, sheet_name))
+                            continue
+                        
+                        formatting = StyleGrid()
+                        data = self._extract_sheet_data(self._iter_sheet_rows(workbook, sheet_name, formatting), formatting)
+                        if not data:
+                            print(f"No data found in sheet '{sheet_name}'")
+                            failed.append((excel_file, sheet_name))
+                            continue
+                        
+                        num_cols = len(data[0])
+                        orientation = 'landscape' if num_cols > 6 else 'portrait'
+                        page_size = landscape(A4) if orientation == 'landscape' else A4
+                        available_width = page_size[0] - 30*mm
+                        table = self._create_table(data, self._create_table_style(data, formatting, style_resolver),
+                                                   [available_width / num_cols] * num_cols)
+                        
+                        # Setiap sheet mulai di halaman baru dengan orientasinya sendiri
+                        if first_orientation is None:
+                            first_orientation = orientation
+                        else:
+                            elements.append(NextPageTemplate(orientation))
+                            elements.append(PageBreak())
+                        
+                        entry = {
+                            'excel_file': excel_file,
+                            'sheet_name': sheet_name,
+                            'pdf_filename': self.get_pdf_filename(excel_file, sheet_name, folder_prefix),
+                            'first_page': None,
+                            'last_page': None
+                        }
+                        outline_entries = []
+                        if multiple_workbooks and not workbook_bookmarked:
+                            outline_entries.append((f"workbook{len(sheets)}", workbook_title, 0))
+                            workbook_bookmarked = True
+                        outline_entries.append((f"sheet{len(sheets)}", sheet_name, 1 if multiple_workbooks else 0))
+                        
+                        elements.append(SheetBookmark(outline_entries,
+                                                      lambda page, entry=entry: entry.update(first_page=page)))
+                        elements.append(Paragraph(f"<b>{sheet_name}</b>", self.title_style))
+                        elements.append(Spacer(1, 8))
+                        elements.append(table)
+                        sheets.append(entry)
+                    
+                    except Exception as e:
+                        print(f"Error converting sheet '{sheet_name}': {str(e)}")
+                        failed.append((excel_file, sheet_name))
+            finally:
+                self._close_workbook(workbook)
+        
+        if not sheets:
+            print("No sheets to combine")
+            return None
+        
+        try:
+            doc = BaseDocTemplate(output_path, pagesize=A4 if first_orientation == 'portrait' else landscape(A4))
+            page_templates = [self._create_page_template(name, page_size)
+                              for name, page_size in (('portrait', A4), ('landscape', landscape(A4)))]
+            # Template pertama dipakai untuk halaman pertama
+            page_templates.sort(key=lambda template: template.id != first_orientation)
+            doc.addPageTemplates(page_templates)
+            
+            doc.build(elements)
+            page_count = doc.page
+        
+        except Exception as e:
+            print(f"Error creating combined PDF: {str(e)}")
+            return None
+        
+        # Sheet berakhir satu halaman sebelum sheet berikutnya dimulai
+        for entry, next_entry in zip(sheets, sheets[1:] + [None]):
+            entry['last_page'] = next_entry['first_page'] - 1 if next_entry else page_count
+        
+        index_path = None
+        if write_page_index:
+            index_path = output_path + PAGE_INDEX_SUFFIX
+            with open(index_path, 'w', encoding='utf-8') as f:
+                json.dump({'output_path': output_path, 'page_count': page_count, 'sheets': sheets},
+                          f, indent=2, ensure_ascii=False)
+        
+        print(f"📚 Combined {len(sheets)} sheet(s) into {os.path.basename(output_path)} ({page_count} pages)")
+        
+        return {
+            'output_path': output_path,
+            'page_count': page_count,
+            'index_path': index_path,
+            'sheets': sheets,
+            'failed': failed
+        }
+    
+    def _create_page_template(self, name, page_size):
+        """
+        Page template dengan margin 15mm, dipakai PDF per sheet dan PDF gabungan
+        
+        Args:
+            name (str): 'portrait' atau 'landscape'
+            page_size (tuple): Ukuran halaman
+            
+        Returns:
+            PageTemplate: Template dengan watermark di setiap halaman (jika enabled)
+        """
+        page_width, page_height = page_size
+        frame = Frame(15*mm, 15*mm, page_width - 30*mm, page_height - 30*mm, id='normal')
+        
+        if not (self.enable_watermark and self.watermark_manager and self.watermark_manager.watermark_exists):
+            return PageTemplate(id=name, frames=[frame], pagesize=page_size)
+        
+        # Watermark digambar di akhir halaman agar tidak tertutup background sel
+        return PageTemplate(id=name, frames=[frame], pagesize=page_size,
+                            onPageEnd=LivePageCallback('watermark', self._draw_watermark))
+    
+    def _draw_watermark(self, canv, doc):
+        """Callback page template: stamp watermark (form XObject bersama) di halaman aktif"""
+        self.watermark_manager.draw_watermark(canv, self.watermark_opacity, self.watermark_position)
+    
+    def _open_workbook(self, excel_file):
+        """
+        Buka workbook sesuai reader backend
+        
+        Args:
+            excel_file (str): Path ke file Excel
+            
+        Returns:
+            Openpyxl workbook atau XlsxNativeReader
+        """
+        if self.reader_backend == "native":
+            return XlsxNativeReader(excel_file)
+        return load_cached_workbook(excel_file)
+    
+    def _close_workbook(self, workbook):
+        """Tutup native reader; workbook openpyxl tetap di cache bersama"""
+        if isinstance(workbook, XlsxNativeReader):
+            workbook.close()
+    
+    def _get_sheet_names(self, workbook):
+        """Daftar nama sheet dari workbook openpyxl atau native reader"""
+        if isinstance(workbook, XlsxNativeReader):
+            return workbook.get_sheet_names()
+        return workbook.sheetnames
+    
+    def _iter_sheet_rows(self, workbook, sheet_name, style_grid):
+        """
+        Iterasi baris sheet sebagai (nilai, style id) dari backend yang dipakai
+        
+        Args:
+            workbook: Openpyxl workbook atau XlsxNativeReader
+            sheet_name (str): Nama sheet
+            style_grid (StyleGrid): Tabel style tempat format unik didaftarkan
+            
+        Yields:
+            tuple: (row_values, row_style_ids) - nilai mentah dan style id per sel
+        """
+        if isinstance(workbook, XlsxNativeReader):
+            values, style_ids = workbook.get_sheet_values(sheet_name)
+            for row_values, row_styles in zip(values, style_ids):
+                yield row_values, workbook.map_style_ids(row_styles, style_grid)
+            return
+        
+        worksheet = workbook[sheet_name]
+        for row in worksheet.iter_rows(min_row=1, max_row=worksheet.max_row,
+                                       min_col=1, max_col=worksheet.max_column):
+            yield [cell.value for cell in row], [
+                style_grid.style_id_for(cell_style_key(cell), lambda: extract_cell_format(cell))
+                for cell in row
+            ]
+    
+    def _convert_sheet_to_pdf(self, workbook, sheet_name, output_path, style_resolver=None):
         """
         Konversi single sheet ke PDF
         
         Args:
-            workbook: Openpyxl workbook object
+            workbook: Openpyxl workbook object atau XlsxNativeReader
             sheet_name (str): Nama sheet
             output_path (str): Path output PDF
+            style_resolver (StyleResolver): Resolver warna/font workbook (optional)
             
         Returns:
             bool: True jika berhasil
         """
         try:
-            worksheet = workbook[sheet_name]
-            
             # Dapatkan data dari worksheet
-            data, formatting = self._extract_sheet_data(worksheet)
+            formatting = StyleGrid()
+            data = self._extract_sheet_data(self._iter_sheet_rows(workbook, sheet_name, formatting), formatting)
             
             if not data:
                 print(f"No data found in sheet '{sheet_name}'")
@@ -117,57 +558,49 @@ class PDFConverterDirect:
             
             # Tentukan orientasi berdasarkan jumlah kolom
             num_cols = len(data[0]) if data else 0
-            use_landscape = num_cols > 6
-            page_size = landscape(A4) if use_landscape else A4
-            
-            # Buat dokumen PDF
-            doc = SimpleDocTemplate(
-                output_path,
-                pagesize=page_size,
-                rightMargin=15*mm,
-                leftMargin=15*mm,
-                topMargin=15*mm,
-                bottomMargin=15*mm
-            )
+            orientation = 'landscape' if num_cols > 6 else 'portrait'
+            page_size = landscape(A4) if orientation == 'landscape' else A4
+            
+            # Buat dokumen PDF, watermark di-stamp oleh page template saat build
+            doc = BaseDocTemplate(output_path, pagesize=page_size)
+            doc.addPageTemplates([self._create_page_template(orientation, page_size)])
+            
+            # Judul
+            title = Paragraph(f"<b>{sheet_name}</b>", self.title_style)
+            
+            # Fast path: slip dengan struktur sama cukup digambar teksnya di atas template
+            fingerprint = None
+            if self.use_slip_templates:
+                fingerprint = layout_fingerprint(data, formatting, page_size)
+                template = self.slip_templates.get(fingerprint)
+                if template is not None and template.render(doc, data, {'title': title}):
+                    return True
             
             elements = []
             
             # Tambahkan judul
-            title_style = ParagraphStyle(
-                'CustomTitle',
-                parent=self.styles['Heading1'],
-                fontSize=14,
-                spaceAfter=10,
-                alignment=1,  # Center alignment
-                textColor=colors.darkblue
-            )
-            title = Paragraph(f"<b>{sheet_name}</b>", title_style)
-            elements.append(title)
+            elements.append(LiveFlowable('title', title))
             elements.append(Spacer(1, 8))
             
-            # Buat tabel
-            table = Table(data)
-            
             # Apply styling
-            table_style = self._create_table_style(data, formatting)
-            table.setStyle(table_style)
+            table_style = self._create_table_style(data, formatting, style_resolver)
             
             # Atur lebar kolom
-            if num_cols > 0:
-                available_width = page_size[0] - 30*mm
-                col_width = available_width / num_cols
-                table._argW = [col_width] * num_cols
-            
-            elements.append(table)
-            
-            # Tambahkan watermark jika enabled
-            if self.enable_watermark and self.watermark_manager and self.watermark_manager.watermark_exists:
-                watermark_element = self._create_watermark_element(page_size, self.watermark_position, self.watermark_opacity)
-                if watermark_element:
-                    elements.append(watermark_element)
+            available_width = page_size[0] - 30*mm
+            col_widths = [available_width / num_cols] * num_cols if num_cols else []
+            
+            elements.append(self._create_table(data, table_style, col_widths))
 
-            # Build PDF
-            doc.build(elements)
+            if not self.use_slip_templates:
+                doc.build(elements)
+                return True
+
+            # Build PDF (sekaligus compile template untuk slip berikutnya)
+            template = SlipTemplate.build(doc, elements)
+            if template is not None:
+                if len(self.slip_templates) >= MAX_SLIP_TEMPLATES:
+                    self.slip_templates.pop(next(iter(self.slip_templates)))
+                self.slip_templates[fingerprint] = template
 
             return True
             
@@ -175,67 +608,67 @@ class PDFConverterDirect:
             print(f"Error creating PDF for sheet '{sheet_name}': {str(e)}")
             return False
     
-    def _extract_sheet_data(self, worksheet):
+    def _create_table(self, data, table_style, col_widths):
         """
-        Extract data dan formatting dari worksheet
+        Buat flowable tabel sesuai render engine
         
         Args:
-            worksheet: Openpyxl worksheet object
+            data (list): Data tabel
+            table_style (TableStyle): Style tabel
+            col_widths (list): Lebar kolom
             
         Returns:
-            tuple: (data, formatting)
+            Flowable: TemplateTable atau CanvasGridRenderer
         """
-        data = []
-        formatting = {}
+        if self.render_engine == 'canvas':
+            try:
+                return CanvasGridRenderer(data, table_style, col_widths)
+            except Exception as e:
+                print(f"⚠️  Canvas engine not usable, falling back to Table: {str(e)}")
         
-        # Dapatkan range yang berisi data
-        max_row = worksheet.max_row
-        max_col = worksheet.max_column
+        table = TemplateTable(data)
+        table.setStyle(table_style)
+        table._argW = col_widths
+        return table
+    
+    def _extract_sheet_data(self, rows, style_grid):
+        """
+        Extract data dan formatting dari baris worksheet
         
-        if max_row == 1 and max_col == 1:
-            # Check if the single cell is empty
-            cell_value = worksheet.cell(1, 1).value
-            if cell_value is None:
-                return [], {}
+        Args:
+            rows: Iterable (row_values, row_style_ids) dari _iter_sheet_rows
+            style_grid (StyleGrid): Diisi satu baris style id per baris data
+            
+        Returns:
+            list: Data tabel, baris ke-i sesuai baris ke-i di style_grid
+        """
+        data = []
         
         # Extract data dan formatting
-        for row_idx in range(1, max_row + 1):
-            row_data = []
-            for col_idx in range(1, max_col + 1):
-                cell = worksheet.cell(row_idx, col_idx)
-                
-                # Get cell value
-                cell_value = cell.value
-                if cell_value is None:
-                    cell_value = ""
-                else:
-                    cell_value = str(cell_value)
-                
-                row_data.append(cell_value)
-                
-                # Get cell formatting
-                cell_coord = f"{row_idx}_{col_idx}"
-                formatting[cell_coord] = {
-                    'font': cell.font,
-                    'fill': cell.fill,
-                    'alignment': cell.alignment
-                }
+        for row_idx, (row_values, row_style_ids) in enumerate(rows, 1):
+            row_data = ["" if value is None else str(value) for value in row_values]
             
             # Skip completely empty rows at the end
-            if any(cell.strip() for cell in row_data if isinstance(cell, str)):
-                data.append(row_data)
-            elif row_idx <= 10:  # Keep first 10 rows even if empty
-                data.append(row_data)
+            if not any(cell.strip() for cell in row_data) and row_idx > 10:
+                continue  # Keep first 10 rows even if empty
+            
+            data.append(row_data)
+            style_grid.append_row(row_style_ids)
         
-        return data, formatting
+        if len(data) == 1 and len(data[0]) == 1 and data[0][0] == "":
+            # Sheet hanya berisi satu sel kosong
+            return []
+        
+        return data
     
-    def _create_table_style(self, data, formatting):
+    def _create_table_style(self, data, formatting, style_resolver=None):
         """
         Buat style untuk tabel berdasarkan Excel formatting
         
         Args:
             data (list): Data tabel
-            formatting (dict): Formatting information
+            formatting (StyleGrid): Formatting information
+            style_resolver (StyleResolver): Resolver warna/font workbook
             
         Returns:
             TableStyle: Style untuk tabel
@@ -266,123 +699,59 @@ class PDFConverterDirect:
             ('VALIGN', (0, 0), (-1, -1), 'TOP'),
         ]
         
-        # Add alternating row colors
-        if len(data) > 1:
-            for row_idx in range(1, len(data)):
-                if row_idx % 2 == 0:
-                    style_commands.append(
-                        ('BACKGROUND', (0, row_idx), (-1, row_idx), colors.Color(0.95, 0.95, 0.95))
-                    )
-        
         # Apply Excel formatting if available
-        if formatting:
-            style_commands.extend(self._apply_excel_formatting(data, formatting))
+        cell_commands = self._apply_excel_formatting(data, formatting, style_resolver) if formatting else []
+        
+        # Alternating row colors via ROWBACKGROUNDS, command per sel digabung per range
+        table_style = self.style_compiler.compile(
+            style_commands, cell_commands, len(data),
+            row_backgrounds=[colors.white, colors.Color(0.95, 0.95, 0.95)]
+        )
+        if self.style_compiler.saved_commands > 0:
+            print(f"🎨 Table style: {self.style_compiler.input_commands} → "
+                  f"{self.style_compiler.output_commands} commands")
         
-        return TableStyle(style_commands)
+        return table_style
     
-    def _apply_excel_formatting(self, data, formatting):
+    def _apply_excel_formatting(self, data, formatting, style_resolver=None):
         """
         Apply Excel formatting ke table style
         
         Args:
             data (list): Data tabel
-            formatting (dict): Formatting information
+            formatting (StyleGrid): Formatting information
+            style_resolver (StyleResolver): Resolver warna/font workbook
             
         Returns:
             list: Additional style commands
         """
+        resolver = style_resolver or StyleResolver()
+        
+        # Command per style unik dihitung sekali, lalu dipakai untuk setiap sel
+        commands_by_style = []
+        for resolved in resolver.resolve_grid(formatting):
+            style_commands = []
+            if resolved.font_name:
+                style_commands.append(('FONTNAME', resolved.font_name))
+            if resolved.text_color is not None:
+                style_commands.append(('TEXTCOLOR', resolved.text_color))
+            if resolved.background is not None:
+                style_commands.append(('BACKGROUND', resolved.background))
+            if resolved.align in ('CENTER', 'RIGHT'):
+                style_commands.append(('ALIGN', resolved.align))
+            commands_by_style.append(style_commands)
+        
         additional_styles = []
+        num_rows = len(data)
+        num_cols = len(data[0]) if data else 0
         
-        for row_idx, row in enumerate(data):
-            for col_idx, cell_value in enumerate(row):
-                cell_coord = f"{row_idx + 1}_{col_idx + 1}"
-                
-                if cell_coord in formatting:
-                    cell_format = formatting[cell_coord]
-                    
-                    # Apply font formatting
-                    if cell_format['font'] and cell_format['font'].bold:
-                        additional_styles.append(
-                            ('FONTNAME', (col_idx, row_idx), (col_idx, row_idx), 'Helvetica-Bold')
-                        )
-                    
-                    # Apply background color
-                    if cell_format['fill'] and cell_format['fill'].start_color:
-                        try:
-                            color_hex = cell_format['fill'].start_color.rgb
-                            if color_hex and color_hex != '00000000':
-                                # Convert hex to RGB
-                                if len(color_hex) == 8:  # ARGB format
-                                    color_hex = color_hex[2:]  # Remove alpha
-                                
-                                r = int(color_hex[0:2], 16) / 255.0
-                                g = int(color_hex[2:4], 16) / 255.0
-                                b = int(color_hex[4:6], 16) / 255.0
-                                
-                                additional_styles.append(
-                                    ('BACKGROUND', (col_idx, row_idx), (col_idx, row_idx), 
-                                     colors.Color(r, g, b))
-                                )
-                        except:
-                            pass  # Skip if color conversion fails
-                    
-                    # Apply text alignment
-                    if cell_format['alignment']:
-                        alignment = cell_format['alignment'].horizontal
-                        if alignment == 'center':
-                            additional_styles.append(
-                                ('ALIGN', (col_idx, row_idx), (col_idx, row_idx), 'CENTER')
-                            )
-                        elif alignment == 'right':
-                            additional_styles.append(
-                                ('ALIGN', (col_idx, row_idx), (col_idx, row_idx), 'RIGHT')
-                            )
+        for row_idx, col_idx, style_id in formatting.iter_cells():
+            if row_idx < num_rows and col_idx < num_cols:
+                for op, value in commands_by_style[style_id]:
+                    additional_styles.append((op, (col_idx, row_idx), (col_idx, row_idx), value))
         
         return additional_styles
 
-    def _create_watermark_element(self, page_size, position, opacity):
-        """
-        Buat watermark element untuk ditambahkan ke PDF
-
-        Args:
-            page_size: Ukuran halaman
-            position (str): Posisi watermark
-            opacity (float): Transparansi watermark
-
-        Returns:
-            Spacer atau Image element untuk watermark
-        """
-        try:
-            if not self.watermark_manager or not self.watermark_manager.watermark_exists:
-                return None
-
-            from reportlab.platypus import Image as RLImage
-            from reportlab.lib.units import mm
-
-            # Load watermark image
-            watermark_path = self.watermark_manager.watermark_path
-
-            # Tentukan ukuran watermark (maksimal 30% dari halaman)
-            page_width, page_height = page_size
-            max_width = page_width * 0.3
-            max_height = page_height * 0.3
-
-            # Buat watermark image element
-            watermark_img = RLImage(
-                watermark_path,
-                width=max_width,
-                height=max_height
-            )
-
-            # Set transparency (simplified - reportlab doesn't support direct opacity)
-            # Watermark akan ditampilkan sebagai image biasa
-
-            return watermark_img
-
-        except Exception as e:
-            print(f"❌ Error creating watermark element: {str(e)}")
-            return None
-    
     def convert_single_sheet_direct(self, excel_file, sheet_name, output_path, folder_prefix=""):
         """
         Konversi single sheet ke PDF tanpa membuka Excel
@@ -403,15 +772,61 @@ class PDFConverterDirect:
                 os.makedirs(output_dir)
             
             # Load workbook
-            workbook = openpyxl.load_workbook(excel_file, data_only=True)
+            workbook = self._open_workbook(excel_file)
             
             # Convert sheet
-            success = self._convert_sheet_to_pdf(workbook, sheet_name, output_path)
+            success = self._convert_sheet_to_pdf(workbook, sheet_name, output_path,
+                                                 get_style_resolver(excel_file))
             
-            workbook.close()
+            self._close_workbook(workbook)
             
             return success
             
         except Exception as e:
             print(f"Error converting sheet '{sheet_name}': {str(e)}")
             return False
+
+
+# State proses worker mode parallel (diisi oleh _init_direct_worker)
+_worker_converter = None
+_worker_workbook = None
+_worker_sheet_names = ()
+_worker_style_resolver = None
+_worker_error = None
+
+
+def _init_direct_worker(settings, excel_file):
+    """Initializer process pool: satu converter dan satu workbook terbuka per proses"""
+    global _worker_converter, _worker_workbook, _worker_sheet_names, _worker_style_resolver, _worker_error
+    try:
+        _worker_converter = PDFConverterDirect(**settings)
+        _worker_workbook = _worker_converter._open_workbook(excel_file)
+        _worker_sheet_names = set(_worker_converter._get_sheet_names(_worker_workbook))
+        _worker_style_resolver = get_style_resolver(excel_file)
+    except Exception as e:
+        # Disimpan agar setiap sheet melaporkan error, bukan pool yang rusak
+        _worker_error = f"Error opening Excel file: {str(e)}"
+
+
+def _direct_worker(task):
+    """
+    Render satu sheet di dalam worker
+
+    Args:
+        task (tuple): (sheet_name, pdf_path)
+
+    Returns:
+        tuple: (sheet_name, pdf_path atau None, pesan error atau None)
+    """
+    sheet_name, pdf_path = task
+    if _worker_error:
+        return sheet_name, None, _worker_error
+    if sheet_name not in _worker_sheet_names:
+        return sheet_name, None, "Sheet not found in workbook"
+
+    try:
+        if _worker_converter._convert_sheet_to_pdf(_worker_workbook, sheet_name, pdf_path, _worker_style_resolver):
+            return sheet_name, pdf_path, None
+        return sheet_name, None, "Conversion failed"
+    except Exception as e:
+        return sheet_name, None, str(e)
@@ -0,0 +1,89 @@
+"""
+PDF Splitter Module
+Pecah PDF master menjadi file per sheet dengan menyalin objek halaman apa
+adanya (tanpa render ulang). Memakai pypdf, atau PyPDF2 jika pypdf tidak ada
+"""
+
+import os
+
+try:
+    from pypdf import PdfReader, PdfWriter
+except ImportError:
+    try:
+        from PyPDF2 import PdfReader, PdfWriter
+    except ImportError:
+        PdfReader = PdfWriter = None
+
+PDF_SPLIT_AVAILABLE = PdfReader is not None
+
+
+class PDFSplitter:
+    def __init__(self, master_path):
+        """
+        Initialize splitter, PDF master dibaca sekali untuk semua file output
+
+        Args:
+            master_path (str): Path ke PDF master
+        """
+        if not PDF_SPLIT_AVAILABLE:
+            raise Exception("Split PDF membutuhkan pypdf atau PyPDF2 (pip install pypdf)")
+
+        self.master_path = master_path
+        self.reader = PdfReader(master_path)
+
+    @property
+    def page_count(self):
+        """Jumlah halaman PDF master"""
+        return len(self.reader.pages)
+
+    def write_pages(self, first_page, last_page, output_path):
+        """
+        Salin rentang halaman ke PDF baru
+
+        Args:
+            first_page (int): Halaman pertama (mulai dari 1)
+            last_page (int): Halaman terakhir (inklusif)
+            output_path (str): Path output PDF
+
+        Returns:
+            str: Path output
+        """
+        if first_page < 1 or last_page < first_page or last_page > self.page_count:
+            raise Exception(f"Rentang halaman tidak valid: {first_page}-{last_page} (total {self.page_count})")
+
+        writer = PdfWriter()
+        for page_index in range(first_page - 1, last_page):
+            writer.add_page(self.reader.pages[page_index])
+
+        with open(output_path, 'wb') as f:
+            writer.write(f)
+
+        return output_path
+
+    def split(self, page_ranges, output_directory):
+        """
+        Pecah PDF master sesuai index rentang halaman
+
+        Args:
+            page_ranges (list): Entry dengan key 'pdf_filename', 'first_page' dan
+                'last_page' (format 'sheets' di index convert_to_combined_pdf)
+            output_directory (str): Direktori output
+
+        Returns:
+            dict: {pdf_filename: path output atau None jika gagal}
+        """
+        if not os.path.exists(output_directory):
+            os.makedirs(output_directory)
+
+        results = {}
+        for entry in page_ranges:
+            pdf_filename = entry['pdf_filename']
+            try:
+                results[pdf_filename] = self.write_pages(
+                    entry['first_page'], entry['last_page'], os.path.join(output_directory, pdf_filename)
+                )
+            except Exception as e:
+                print(f"❌ Error splitting {pdf_filename}: {str(e)}")
+                results[pdf_filename] = None
+
+        return results
@@ -0,0 +1,305 @@
+"""
+Sheet Disk Cache Module
+Cache persisten di disk untuk data sheet yang sudah di-parse, dengan key
+fingerprint XML sheet di dalam xlsx
+
+Penggunaan dari command line:
+    python sheet_disk_cache.py stats
+    python sheet_disk_cache.py clear
+"""
+
+import os
+import sys
+import json
+import zlib
+import argparse
+import tempfile
+import threading
+from collections import OrderedDict
+from xlsx_metadata import XlsxMetadataReader
+
+# Naikkan jika bentuk data yang disimpan berubah, entry lama otomatis tidak terpakai
+CACHE_FORMAT_VERSION = 3
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+CACHE_FILE_SUFFIX = '.sheet.z'
+
+# Jumlah file (versi) yang fingerprint sheet-nya diingat di memori
+MAX_FINGERPRINT_FILES = 64
+
+# Ukuran folder dihitung ulang dari disk setiap sekian kali tulis (proses lain
+# bisa menulis ke folder cache yang sama)
+RESCAN_EVERY_WRITES = 256
+
+# Eviction mengosongkan cache sampai fraksi ini dari batas, agar tulis berikutnya
+# tidak langsung memicu scan lagi
+EVICT_TARGET_RATIO = 0.9
+
+
+def default_cache_dir():
+    """
+    Lokasi default cache di folder cache user
+
+    Returns:
+        str: Path direktori cache
+    """
+    if os.name == 'nt':
+        base = os.environ.get('LOCALAPPDATA') or tempfile.gettempdir()
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'slip-gaji-pdf', 'sheets')
+
+
+class SheetDiskCache:
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Initialize disk cache
+
+        Args:
+            cache_dir (str): Direktori cache (default: folder cache user)
+            max_bytes (int): Batas ukuran total file cache sebelum eviction
+        """
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.max_bytes = max_bytes
+        self._fingerprints = OrderedDict()  # {(path, mtime, size): {sheet_name: fingerprint}}
+        self._total_bytes = None  # Perkiraan ukuran folder cache, None jika belum dihitung
+        self._writes_since_scan = 0
+        self._lock = threading.Lock()
+
+    def _fingerprint(self, file_path, sheet_name):
+        """Fingerprint sheet, di-memo selama file tidak berubah"""
+        stat = os.stat(file_path)
+        file_key = (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
+
+        if file_key not in self._fingerprints:
+            # Hitung semua sheet sekaligus, zip dan shared strings cukup dibaca sekali
+            reader = XlsxMetadataReader(file_path)
+            try:
+                fingerprints = {}
+                for name in reader.get_sheet_names():
+                    try:
+                        fingerprints[name] = reader.get_sheet_fingerprint(name)
+                    except Exception:
+                        pass
+                self._fingerprints[file_key] = fingerprints
+                while len(self._fingerprints) > MAX_FINGERPRINT_FILES:
+                    self._fingerprints.popitem(last=False)
+            finally:
+                reader.close()
+        else:
+            self._fingerprints.move_to_end(file_key)
+
+        fingerprints = self._fingerprints[file_key]
+        if sheet_name not in fingerprints:
+            raise Exception(f"Sheet '{sheet_name}' tidak ditemukan")
+        return fingerprints[sheet_name]
+
+    def _entry_path(self, fingerprint, kind):
+        name = f"{fingerprint}-{kind}-v{CACHE_FORMAT_VERSION}{CACHE_FILE_SUFFIX}"
+        return os.path.join(self.cache_dir, fingerprint[:2], name)
+
+    def load(self, file_path, sheet_name, kind):
+        """
+        Ambil data sheet dari cache disk
+
+        Args:
+            file_path (str): Path ke file Excel
+            sheet_name (str): Nama sheet
+            kind (str): Jenis data, contoh 'data' atau 'formatting'
+
+        Returns:
+            Data yang tersimpan, atau None jika tidak ada / sheet berubah
+        """
+        try:
+            entry_path = self._entry_path(self._fingerprint(file_path, sheet_name), kind)
+            if not os.path.exists(entry_path):
+                return None
+
+            with open(entry_path, 'rb') as f:
+                payload = json.loads(zlib.decompress(f.read()).decode('utf-8'))
+
+            # Tandai sebagai baru dipakai untuk eviction LRU
+            os.utime(entry_path, None)
+            return payload
+
+        except Exception as e:
+            print(f"⚠️  Sheet cache read failed for '{sheet_name}': {str(e)}")
+            return None
+
+    def store(self, file_path, sheet_name, kind, payload):
+        """
+        Simpan data sheet ke cache disk
+
+        Args:
+            file_path (str): Path ke file Excel
+            sheet_name (str): Nama sheet
+            kind (str): Jenis data
+            payload: Data yang bisa di-serialize ke JSON
+
+        Returns:
+            bool: True jika berhasil disimpan
+        """
+        try:
+            entry_path = self._entry_path(self._fingerprint(file_path, sheet_name), kind)
+            os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+
+            raw = json.dumps(payload, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+            compressed = zlib.compress(raw, 6)
+
+            # Tulis ke file sementara lalu rename agar entry tidak pernah setengah jadi
+            temp_path = f"{entry_path}.{os.getpid()}.tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(compressed)
+            try:
+                replaced_size = os.path.getsize(entry_path)
+            except OSError:
+                replaced_size = 0
+            os.replace(temp_path, entry_path)
+
+            self._track_write(len(compressed) - replaced_size)
+            return True
+
+        except Exception as e:
+            print(f"⚠️  Sheet cache write failed for '{sheet_name}': {str(e)}")
+            return False
+
+    def _track_write(self, added_bytes):
+        """
+        Update ukuran total tanpa scan folder; eviction (scan penuh) hanya jika
+        batas terlewati atau sudah RESCAN_EVERY_WRITES kali tulis
+        """
+        with self._lock:
+            self._writes_since_scan += 1
+            if self._total_bytes is not None:
+                self._total_bytes += added_bytes
+                if self._total_bytes <= self.max_bytes and self._writes_since_scan < RESCAN_EVERY_WRITES:
+                    return
+        self.evict()
+
+    def _list_entries(self):
+        """
+        Daftar file cache
+
+        Returns:
+            list: List (path, size, mtime)
+        """
+        entries = []
+        if not os.path.isdir(self.cache_dir):
+            return entries
+
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith(CACHE_FILE_SUFFIX):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((path, stat.st_size, stat.st_mtime))
+
+        return entries
+
+    def evict(self):
+        """
+        Hapus entry paling lama tidak dipakai jika ukuran total melewati batas
+        (sampai EVICT_TARGET_RATIO dari batas)
+
+        Returns:
+            int: Jumlah file yang dihapus
+        """
+        with self._lock:
+            entries = self._list_entries()
+            total = sum(size for _, size, _ in entries)
+            removed = 0
+
+            target = self.max_bytes * EVICT_TARGET_RATIO if total > self.max_bytes else total
+            for path, size, _ in sorted(entries, key=lambda entry: entry[2]):
+                if total <= target:
+                    break
+                try:
+                    os.remove(path)
+                    total -= size
+                    removed += 1
+                except OSError:
+                    pass
+
+            self._total_bytes = total
+            self._writes_since_scan = 0
+            return removed
+
+    def clear(self):
+        """
+        Hapus semua entry cache
+
+        Returns:
+            int: Jumlah file yang dihapus
+        """
+        with self._lock:
+            removed = 0
+            for path, _, _ in self._list_entries():
+                try:
+                    os.remove(path)
+                    removed += 1
+                except OSError:
+                    pass
+            self._fingerprints.clear()
+            self._total_bytes = 0
+            self._writes_since_scan = 0
+            return removed
+
+    def stats(self):
+        """
+        Statistik cache
+
+        Returns:
+            dict: Lokasi, jumlah entry dan ukuran total
+        """
+        entries = self._list_entries()
+        return {
+            'cache_dir': self.cache_dir,
+            'entries': len(entries),
+            'bytes': sum(size for _, size, _ in entries),
+            'max_bytes': self.max_bytes
+        }
+
+
+_sheet_disk_cache = None
+
+
+def get_sheet_disk_cache():
+    """
+    Disk cache default (lokasi folder cache user)
+
+    Returns:
+        SheetDiskCache: Instance bersama
+    """
+    global _sheet_disk_cache
+    if _sheet_disk_cache is None:
+        _sheet_disk_cache = SheetDiskCache()
+    return _sheet_disk_cache
+
+
+def main(argv=None):
+    """Command line untuk melihat atau mengosongkan cache sheet"""
+    parser = argparse.ArgumentParser(description="Kelola cache sheet yang sudah di-parse")
+    parser.add_argument('command', choices=['stats', 'clear'], help="stats: tampilkan info cache, clear: hapus semua entry")
+    parser.add_argument('--cache-dir', default=None, help="Direktori cache (default: folder cache user)")
+    args = parser.parse_args(argv)
+
+    cache = SheetDiskCache(cache_dir=args.cache_dir)
+
+    if args.command == 'clear':
+        removed = cache.clear()
+        print(f"🧹 Removed {removed} cached sheet(s) from {cache.cache_dir}")
+    else:
+        stats = cache.stats()
+        print(f"📁 Cache dir: {stats['cache_dir']}")
+        print(f"📄 Entries: {stats['entries']}")
+        print(f"💾 Size: {stats['bytes'] / (1024 * 1024):.1f} MB / {stats['max_bytes'] / (1024 * 1024):.0f} MB")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
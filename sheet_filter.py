@@ -0,0 +1,96 @@
+"""
+Sheet Filter Module
+Aturan sheet yang tidak dikonversi (payroll adjust, database, summary, dll),
+dipakai bersama oleh aplikasi GUI dan command line
+"""
+
+import re
+from fnmatch import fnmatchcase
+
+# Sheet yang namanya mengandung salah satu teks ini diabaikan (case-insensitive)
+DEFAULT_IGNORED_EXACT = (
+    'payroll adjust',
+    'database',
+    'summary amman',
+    'summary karyawan',
+    'pph 21',
+    'payroll',
+    'payrol',
+    'tarif ter',
+    'hr_libur',
+    'jm_istrht'
+)
+
+# Kata yang harus cocok sebagai kata utuh
+DEFAULT_IGNORED_KEYWORDS = (
+    'adjust',  # But not "adjustment"
+)
+
+
+class SheetFilter:
+    def __init__(self, ignored_exact=DEFAULT_IGNORED_EXACT, ignored_keywords=DEFAULT_IGNORED_KEYWORDS,
+                 include_patterns=None, exclude_patterns=None):
+        """
+        Initialize filter sheet
+
+        Args:
+            ignored_exact (tuple): Teks yang jika terkandung di nama sheet membuat sheet diabaikan
+            ignored_keywords (tuple): Kata utuh yang membuat sheet diabaikan
+            include_patterns (list): Optional, pola glob nama sheet; jika diisi hanya
+                sheet yang cocok yang dikonversi
+            exclude_patterns (list): Optional, pola glob nama sheet yang diabaikan
+        """
+        self.ignored_exact = tuple(text.lower() for text in ignored_exact)
+        self.include_patterns = [pattern.lower() for pattern in include_patterns or []]
+        self.exclude_patterns = [pattern.lower() for pattern in exclude_patterns or []]
+
+        # Use word boundary regex to match whole words only
+        self.keyword_patterns = [re.compile(r'\b' + re.escape(keyword.lower()) + r'\b')
+                                 for keyword in ignored_keywords]
+
+    def is_ignored(self, sheet_name):
+        """
+        Cek apakah sheet diabaikan
+
+        Args:
+            sheet_name (str): Nama sheet
+
+        Returns:
+            bool: True jika sheet tidak dikonversi
+        """
+        # Case-insensitive comparison
+        sheet_name_lower = sheet_name.strip().lower()
+
+        if self.include_patterns and not any(fnmatchcase(sheet_name_lower, pattern)
+                                             for pattern in self.include_patterns):
+            return True
+
+        if any(fnmatchcase(sheet_name_lower, pattern) for pattern in self.exclude_patterns):
+            return True
+
+        # Check exact matches first
+        if any(exact_match in sheet_name_lower for exact_match in self.ignored_exact):
+            return True
+
+        # Check keyword matches (whole word boundaries)
+        return any(pattern.search(sheet_name_lower) for pattern in self.keyword_patterns)
+
+    def filter(self, sheet_names):
+        """
+        Sheet yang dikonversi
+
+        Args:
+            sheet_names (list): Nama sheet
+
+        Returns:
+            list: Nama sheet yang tidak diabaikan, urutan tetap
+        """
+        return [sheet_name for sheet_name in sheet_names if not self.is_ignored(sheet_name)]
+
+
+_default_filter = SheetFilter()
+
+
+def is_sheet_ignored(sheet_name):
+    """Check if sheet should be ignored based on the default keywords"""
+    return _default_filter.is_ignored(sheet_name)
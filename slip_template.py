@@ -0,0 +1,303 @@
+"""
+Slip Template Module
+Fast path untuk sheet slip gaji dengan layout identik: layout halaman
+(background, garis tabel, posisi sel) di-compile sekali dari build platypus
+pertama, slip berikutnya cukup menggambar teks sel di atas template
+"""
+
+import hashlib
+import reportlab
+from reportlab.pdfgen import canvas as pdf_canvas
+from reportlab.platypus import Table, Flowable
+from style_grid import format_key
+
+# Replay template memakai internal reportlab (canv._code, Table._drawCell, _cellvalues,
+# _spanCmds, doc._makeCanvas); hasil identik byte per byte hanya diuji pada versi ini
+TESTED_REPORTLAB_VERSIONS = ('5.0',)
+
+
+def templates_supported(version=None):
+    """
+    Cek apakah versi reportlab termasuk yang sudah diuji untuk template slip
+
+    Args:
+        version (str): Versi reportlab (default versi yang ter-install)
+
+    Returns:
+        bool: True jika major.minor ada di TESTED_REPORTLAB_VERSIONS
+    """
+    version = version or reportlab.Version
+    return '.'.join(version.split('.')[:2]) in TESTED_REPORTLAB_VERSIONS
+
+
+def layout_fingerprint(data, style_grid, page_size, merged_cells=()):
+    """
+    Fingerprint struktur sheet: dimensi, merged range, style grid dan jumlah
+    baris teks per sel (menentukan tinggi baris tabel). Nilai sel tidak ikut
+
+    Args:
+        data (list): Data tabel (list of lists string)
+        style_grid (StyleGrid): Formatting sheet
+        page_size (tuple): Ukuran halaman
+        merged_cells (iterable): Merged range, contoh "A1:C1"
+
+    Returns:
+        str: SHA-1 hex digest
+    """
+    digest = hashlib.sha1()
+    num_cols = len(data[0]) if data else 0
+    digest.update(repr((len(data), num_cols, tuple(page_size), sorted(merged_cells))).encode('utf-8'))
+    digest.update(repr(tuple(format_key(cell_format) for cell_format in style_grid.styles)).encode('utf-8'))
+    for row in style_grid.rows:
+        digest.update(row.tobytes())
+        digest.update(b'|')
+
+    multiline_cells = [(row_idx, col_idx, value.count('\n'))
+                       for row_idx, row in enumerate(data)
+                       for col_idx, value in enumerate(row) if '\n' in value]
+    digest.update(repr(multiline_cells).encode('utf-8'))
+
+    return digest.hexdigest()
+
+
+class _RecordingCanvas(pdf_canvas.Canvas):
+    """Canvas yang menyimpan content stream setiap halaman dan posisi slot per slip"""
+
+    def __init__(self, *args, **kwargs):
+        pdf_canvas.Canvas.__init__(self, *args, **kwargs)
+        self.recorded_pages = []
+        self.slots = []  # [(page_index, start, end, slot)]
+
+    def add_slot(self, start, slot, end=None):
+        if end is None:
+            end = len(self._code)
+        self.slots.append((len(self.recorded_pages), start, end, slot))
+
+    def showPage(self):
+        self.recorded_pages.append(list(self._code))
+        pdf_canvas.Canvas.showPage(self)
+
+
+class TemplateTable(Table):
+    """Table yang mencatat posisi content stream teks sel saat di-draw"""
+
+    def _drawCell(self, cellval, cellstyle, pos, size):
+        if self._cell_code_start is None:
+            self._cell_code_start = len(self.canv._code)
+        Table._drawCell(self, cellval, cellstyle, pos, size)
+        self._cell_code_end = len(self.canv._code)
+        self._cell_calls.append((cellstyle, pos, size))
+
+    def draw(self):
+        # Potongan hasil split (tabel lebih dari satu halaman) juga TemplateTable
+        self._cell_code_start = self._cell_code_end = None
+        self._cell_calls = []
+        Table.draw(self)
+        if isinstance(self.canv, _RecordingCanvas) and self._cell_code_start is not None:
+            if self._spanCmds:
+                # Urutan gambar sel dengan span tidak lagi baris per baris
+                slot = ('invalid', None)
+            else:
+                slot = ('cells', self._cell_calls)
+            # Garis grid digambar setelah sel dan tetap bagian dari template
+            self.canv.add_slot(self._cell_code_start, slot, self._cell_code_end)
+
+
+class LiveFlowable(Flowable):
+    """Pembungkus flowable yang digambar ulang untuk setiap slip (judul, watermark)"""
+
+    def __init__(self, name, flowable):
+        Flowable.__init__(self)
+        self.name = name
+        self.flowable = flowable
+        self.hAlign = getattr(flowable, 'hAlign', 'LEFT')
+        self.available = None
+
+    def wrap(self, availWidth, availHeight):
+        self.available = (availWidth, availHeight)
+        self.width, self.height = self.flowable.wrapOn(self.canv, availWidth, availHeight)
+        return self.width, self.height
+
+    def split(self, availWidth, availHeight):
+        # Tidak dipecah agar seluruh isinya tetap satu slot
+        return []
+
+    def getSpaceBefore(self):
+        return self.flowable.getSpaceBefore()
+
+    def getSpaceAfter(self):
+        return self.flowable.getSpaceAfter()
+
+    def draw(self):
+        start = len(self.canv._code)
+        self.flowable._drawOn(self.canv)
+        if isinstance(self.canv, _RecordingCanvas):
+            self.canv.add_slot(start, ('live', self.name))
+
+
+class LivePageCallback:
+    """Callback halaman (onPage/onPageEnd) yang digambar ulang untuk setiap slip, contoh watermark"""
+
+    def __init__(self, name, callback):
+        self.name = name
+        self.callback = callback
+
+    def __call__(self, canv, doc):
+        start = len(canv._code)
+        self.callback(canv, doc)
+        if isinstance(canv, _RecordingCanvas):
+            canv.add_slot(start, ('live', self.name))
+
+
+class SlipTemplate:
+    def __init__(self, pages, cell_calls, font_order, live_flowables, page_rotation=0, page_callbacks=None):
+        """
+        Initialize template hasil compile (gunakan SlipTemplate.build)
+
+        Args:
+            pages (list): Content stream per halaman, bagian per slip diganti tuple slot
+            cell_calls (list): (cellstyle, pos, size) setiap sel sesuai urutan gambar
+            font_order (list): Urutan registrasi font di dokumen template
+            live_flowables (dict): {nama: LiveFlowable}
+            page_rotation (int): Rotasi halaman
+            page_callbacks (dict): {nama: LivePageCallback} dari page template dokumen
+        """
+        self.pages = pages
+        self.cell_calls = cell_calls
+        self.font_order = font_order
+        self.live_flowables = live_flowables
+        self.page_rotation = page_rotation
+        self.page_callbacks = page_callbacks or {}
+        self.num_rows = 0
+        self.num_cols = 0
+
+    @classmethod
+    def build(cls, doc, elements):
+        """
+        Build PDF secara normal lewat platypus sambil merekam template
+
+        Args:
+            doc (BaseDocTemplate): Dokumen output, callback halaman yang berbeda
+                per slip dibungkus LivePageCallback
+            elements (list): Flowable; tabel harus TemplateTable dan bagian yang
+                berbeda per slip dibungkus LiveFlowable
+
+        Returns:
+            SlipTemplate: Template, atau None jika layout tidak bisa dipakai ulang
+        """
+        canvases = []
+
+        def make_canvas(*args, **kwargs):
+            canv = _RecordingCanvas(*args, **kwargs)
+            canvases.append(canv)
+            return canv
+
+        # doc.build mengosongkan list flowable yang diberikan
+        tables = [element for element in elements if isinstance(element, TemplateTable)]
+        live_flowables = {element.name: element for element in elements if isinstance(element, LiveFlowable)}
+        page_callbacks = {callback.name: callback
+                          for page_template in doc.pageTemplates
+                          for callback in (page_template.onPage, page_template.onPageEnd)
+                          if isinstance(callback, LivePageCallback)}
+
+        doc.build(elements, canvasmaker=make_canvas)
+
+        canv = canvases[-1]
+        if len(tables) != 1 or not tables[0]._cellvalues:
+            return None
+        num_rows = len(tables[0]._cellvalues)
+        num_cols = len(tables[0]._cellvalues[0])
+
+        # Ganti bagian yang berubah per slip dengan slot
+        pages = []
+        cell_calls = []
+        live_seen = set()
+        for page_index, code in enumerate(canv.recorded_pages):
+            page_code = []
+            position = 0
+            for slot_page, start, end, slot in sorted(item for item in canv.slots if item[0] == page_index):
+                if start < position or slot[0] == 'invalid':
+                    return None
+                page_code.extend(code[position:start])
+                if slot[0] == 'cells':
+                    page_code.append(('cells', len(cell_calls), len(slot[1])))
+                    cell_calls.extend(slot[1])
+                else:
+                    page_code.append(slot)
+                    live_seen.add(slot[1])
+                position = end
+            page_code.extend(code[position:])
+            pages.append(page_code)
+
+        if len(cell_calls) != num_rows * num_cols or live_seen != set(live_flowables) | set(page_callbacks):
+            return None
+
+        font_order = list(canv._doc.fontMapping.keys())
+        template = cls(pages, cell_calls, font_order, live_flowables, getattr(doc, 'rotation', 0), page_callbacks)
+        template.num_rows = num_rows
+        template.num_cols = num_cols
+        return template
+
+    def render(self, doc, data, live_replacements=None):
+        """
+        Render slip baru di atas template
+
+        Args:
+            doc (BaseDocTemplate): Dokumen output (dipakai untuk membuat canvas
+                dengan metadata yang sama seperti build platypus)
+            data (list): Data tabel dengan struktur sama seperti template
+            live_replacements (dict): {nama: flowable} pengganti LiveFlowable,
+                contoh judul dengan nama sheet yang berbeda
+
+        Returns:
+            bool: True jika berhasil, False jika slip tidak cocok dengan template
+        """
+        live_replacements = live_replacements or {}
+
+        # Flowable pengganti harus punya ukuran yang sama dengan template
+        live = {}
+        for name, item in self.live_flowables.items():
+            flowable = live_replacements.get(name)
+            if flowable is None:
+                live[name] = item.flowable
+                continue
+            width, height = flowable.wrap(*item.available)
+            if (width, height) != (item.width, item.height):
+                return False
+            live[name] = flowable
+
+        if len(data) != self.num_rows or any(len(row) != self.num_cols for row in data):
+            return False
+
+        canv = doc._makeCanvas(canvasmaker=pdf_canvas.Canvas)
+        # Nama font internal (/F1, /F2, ...) harus sama dengan content stream template
+        for font_name in self.font_order:
+            canv._doc.getInternalFontName(font_name)
+
+        for page_code in self.pages:
+            for chunk in page_code:
+                if isinstance(chunk, str):
+                    canv._code.append(chunk)
+                elif chunk[0] == 'cells':
+                    self._draw_cells(canv, data, chunk[1], chunk[2])
+                elif chunk[1] in live:
+                    live[chunk[1]]._drawOn(canv)
+                else:
+                    self.page_callbacks[chunk[1]](canv, doc)
+
+            canv.setPageRotation(self.page_rotation)
+            canv.showPage()
+
+        canv.save()
+        return True
+
+    def _draw_cells(self, canv, data, first_call, count):
+        """Gambar teks sel dengan urutan dan state yang sama seperti Table.draw"""
+        # Table hanya dipakai sebagai konteks _drawCell (canvas dan style sel aktif)
+        table = Table([[""]])
+        table.canv = canv
+        table._curcellstyle = None
+        for index in range(first_call, first_call + count):
+            cellstyle, pos, size = self.cell_calls[index]
+            row_idx, col_idx = divmod(index, self.num_cols)
+            Table._drawCell(table, data[row_idx][col_idx], cellstyle, pos, size)
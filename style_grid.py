@@ -0,0 +1,138 @@
+"""
+Style Grid Module
+Formatting sheet dalam bentuk ringkas: grid style id (array per baris)
+ditambah tabel style unik yang dipakai bersama oleh semua sel
+"""
+
+from array import array
+
+# Style id 0 berarti sel tanpa informasi formatting
+NO_STYLE = 0
+
+
+def format_key(value):
+    """Bentuk hashable dari dict format (dict bersarang menjadi tuple terurut)"""
+    if isinstance(value, dict):
+        return tuple(sorted((key, format_key(item)) for key, item in value.items()))
+    if isinstance(value, list):
+        return tuple(format_key(item) for item in value)
+    return value
+
+
+class StyleGrid:
+    def __init__(self):
+        """Initialize grid kosong (style id 0 dicadangkan untuk 'tanpa style')"""
+        self.styles = [None]  # {style_id: dict format}
+        self.rows = []  # array('H') per baris, index kolom 0-based
+        self._ids_by_content = {}
+        self._ids_by_key = {}
+
+    def intern(self, cell_format):
+        """
+        Daftarkan format ke tabel style (format identik mendapat id yang sama)
+
+        Args:
+            cell_format (dict): Format sel, atau None
+
+        Returns:
+            int: Style id
+        """
+        if cell_format is None:
+            return NO_STYLE
+
+        content_key = format_key(cell_format)
+        style_id = self._ids_by_content.get(content_key)
+        if style_id is None:
+            style_id = len(self.styles)
+            self.styles.append(cell_format)
+            self._ids_by_content[content_key] = style_id
+        return style_id
+
+    def style_id_for(self, source_key, factory):
+        """
+        Style id untuk style sumber (contoh StyleArray openpyxl atau index cellXfs),
+        factory() hanya dipanggil sekali per source_key
+
+        Args:
+            source_key: Key hashable dari style sumber
+            factory (callable): Fungsi tanpa argumen yang menghasilkan dict format
+
+        Returns:
+            int: Style id
+        """
+        style_id = self._ids_by_key.get(source_key)
+        if style_id is None:
+            style_id = self._ids_by_key[source_key] = self.intern(factory())
+        return style_id
+
+    def append_row(self, style_ids):
+        """
+        Tambahkan satu baris style id
+
+        Args:
+            style_ids (iterable): Style id per kolom
+        """
+        self.rows.append(array('H', style_ids))
+
+    def get(self, row_idx, col_idx):
+        """
+        Format sel pada posisi tertentu (0-based)
+
+        Args:
+            row_idx (int): Index baris
+            col_idx (int): Index kolom
+
+        Returns:
+            dict: Format sel, atau None jika tidak ada
+        """
+        if row_idx < len(self.rows):
+            row = self.rows[row_idx]
+            if col_idx < len(row):
+                return self.styles[row[col_idx]]
+        return None
+
+    def iter_cells(self):
+        """
+        Iterasi sel yang punya formatting
+
+        Yields:
+            tuple: (row_idx, col_idx, style_id) 0-based
+        """
+        for row_idx, row in enumerate(self.rows):
+            for col_idx, style_id in enumerate(row):
+                if style_id != NO_STYLE:
+                    yield row_idx, col_idx, style_id
+
+    def __len__(self):
+        return len(self.rows)
+
+    def to_payload(self):
+        """
+        Bentuk yang bisa di-serialize ke JSON (untuk disk cache)
+
+        Returns:
+            dict: {'styles': [...], 'rows': [[...], ...]}
+        """
+        return {
+            'styles': self.styles,
+            'rows': [row.tolist() for row in self.rows]
+        }
+
+    @classmethod
+    def from_payload(cls, payload):
+        """
+        Kebalikan to_payload
+
+        Args:
+            payload (dict): Hasil to_payload
+
+        Returns:
+            StyleGrid: Grid yang sama
+        """
+        grid = cls()
+        for cell_format in payload['styles'][1:]:
+            grid.styles.append(cell_format)
+            grid._ids_by_content.setdefault(format_key(cell_format), len(grid.styles) - 1)
+        for row in payload['rows']:
+            grid.append_row(row)
+        return grid
@@ -0,0 +1,287 @@
+"""
+Style Resolver Module
+Menerjemahkan format sel Excel (font, fill, alignment) ke nilai reportlab
+sekali per style unik, termasuk resolusi warna theme dan indexed
+"""
+
+import colorsys
+import xml.etree.ElementTree as ET
+from collections import namedtuple
+from reportlab.lib import colors
+from openpyxl.styles.colors import COLOR_INDEX
+from style_grid import format_key
+from xlsx_metadata import XlsxMetadataReader
+from workbook_cache import get_workbook_cache
+
+# Hasil resolve satu style; None berarti pakai default tabel
+ResolvedStyle = namedtuple('ResolvedStyle', ['font_name', 'font_size', 'text_color', 'background', 'align'])
+
+DEFAULT_FONT_SIZE = 11  # Ukuran font default Excel
+MIN_FONT_SIZE = 6
+MAX_FONT_SIZE = 14
+
+ALIGN_MAP = {
+    'left': 'LEFT',
+    'center': 'CENTER',
+    'centerContinuous': 'CENTER',
+    'right': 'RIGHT'
+}
+
+# Urutan elemen clrScheme di theme XML dan index theme yang dipakai Excel
+# (Excel menukar pasangan dk/lt: index 0 = lt1, 1 = dk1, 2 = lt2, 3 = dk2)
+_THEME_SCHEME_ORDER = ['lt1', 'dk1', 'lt2', 'dk2', 'accent1', 'accent2', 'accent3',
+                       'accent4', 'accent5', 'accent6', 'hlink', 'folHlink']
+_DEFAULT_THEME_COLORS = ['FFFFFF', '000000', 'EEECE1', '1F497D', '4F81BD', 'C0504D',
+                         '9BBB59', '8064A2', '4BACC6', 'F79646', '0000FF', '800080']
+
+# Index 64/65 adalah warna sistem foreground/background
+_SYSTEM_INDEXED_COLORS = {64: '000000', 65: 'FFFFFF'}
+
+
+def color_descriptor(rgb=None, theme=None, tint=0.0, indexed=None):
+    """
+    Bentuk string warna yang disimpan di dict format sel
+
+    Args:
+        rgb (str): Warna ARGB/RGB hex
+        theme (int): Index warna theme
+        tint (float): Tint untuk warna theme/indexed (-1.0 - 1.0)
+        indexed (int): Index palet warna legacy
+
+    Returns:
+        str: Contoh 'FF1F497D', 'theme:4:-0.25' atau 'indexed:22', None jika otomatis
+    """
+    if rgb:
+        return str(rgb)
+    if theme is not None:
+        return f"theme:{int(theme)}:{float(tint or 0.0)}"
+    if indexed is not None:
+        return f"indexed:{int(indexed)}"
+    return None
+
+
+def openpyxl_color_descriptor(color):
+    """
+    Deskriptor warna dari object Color openpyxl
+
+    Args:
+        color: openpyxl.styles.colors.Color atau None
+
+    Returns:
+        str: Lihat color_descriptor
+    """
+    if color is None:
+        return None
+    if color.type == 'rgb':
+        return color_descriptor(rgb=color.rgb)
+    if color.type == 'theme':
+        return color_descriptor(theme=color.theme, tint=color.tint)
+    if color.type == 'indexed':
+        return color_descriptor(indexed=color.indexed, tint=color.tint)
+    return None
+
+
+def _apply_tint(rgb_hex, tint):
+    """Terapkan tint Excel (ubah luminance di ruang HLS)"""
+    if not tint:
+        return rgb_hex
+    r, g, b = (int(rgb_hex[i:i + 2], 16) / 255.0 for i in (0, 2, 4))
+    h, l, s = colorsys.rgb_to_hls(r, g, b)
+    if tint < 0:
+        l = l * (1.0 + tint)
+    else:
+        l = l * (1.0 - tint) + tint
+    r, g, b = colorsys.hls_to_rgb(h, l, s)
+    return ''.join(f"{round(channel * 255):02X}" for channel in (r, g, b))
+
+
+def _local_name(tag):
+    return tag.rsplit('}', 1)[-1]
+
+
+class StyleResolver:
+    def __init__(self, theme_colors=None, indexed_colors=None):
+        """
+        Initialize resolver dengan palet warna workbook
+
+        Args:
+            theme_colors (list): 12 warna RGB hex sesuai index theme Excel
+            indexed_colors (list): Palet indexed (default palet bawaan Excel)
+        """
+        self.theme_colors = theme_colors or list(_DEFAULT_THEME_COLORS)
+        self.indexed_colors = indexed_colors or [value[-6:] for value in COLOR_INDEX]
+        self._colors = {}  # {deskriptor: Color atau None}
+        self._resolved = {}  # {key format: ResolvedStyle}
+
+    @classmethod
+    def from_xlsx(cls, file_path):
+        """
+        Buat resolver dari theme dan palet indexed di dalam file xlsx
+
+        Args:
+            file_path (str): Path ke file Excel
+
+        Returns:
+            StyleResolver: Resolver untuk workbook tersebut
+        """
+        theme_colors = None
+        indexed_colors = None
+
+        metadata = XlsxMetadataReader(file_path)
+        try:
+            archive = metadata.archive
+            theme_part = metadata.workbook_parts.get('theme')
+            if theme_part and theme_part in archive.NameToInfo:
+                theme_colors = cls._read_theme_colors(archive.read(theme_part))
+
+            styles_part = metadata.workbook_parts.get('styles')
+            if styles_part and styles_part in archive.NameToInfo:
+                indexed_colors = cls._read_indexed_colors(archive.read(styles_part))
+        except Exception as e:
+            print(f"⚠️  Could not read theme colors: {str(e)}")
+        finally:
+            metadata.close()
+
+        return cls(theme_colors, indexed_colors)
+
+    @staticmethod
+    def _read_theme_colors(theme_xml):
+        """Ambil 12 warna clrScheme dari theme XML, urut sesuai index Excel"""
+        scheme = {}
+        root = ET.fromstring(theme_xml)
+        for element in root.iter():
+            if _local_name(element.tag) != 'clrScheme':
+                continue
+            for entry in element:
+                for color_element in entry:
+                    tag = _local_name(color_element.tag)
+                    if tag == 'srgbClr':
+                        scheme[_local_name(entry.tag)] = color_element.get('val')
+                    elif tag == 'sysClr':
+                        scheme[_local_name(entry.tag)] = color_element.get('lastClr')
+            break
+
+        return [scheme.get(name) or default
+                for name, default in zip(_THEME_SCHEME_ORDER, _DEFAULT_THEME_COLORS)]
+
+    @staticmethod
+    def _read_indexed_colors(styles_xml):
+        """Palet indexed kustom dari <colors><indexedColors> di styles.xml"""
+        root = ET.fromstring(styles_xml)
+        for element in root.iter():
+            if _local_name(element.tag) == 'indexedColors':
+                palette = [rgb_color.get('rgb', '')[-6:] for rgb_color in element]
+                return palette or None
+        return None
+
+    def resolve_color(self, descriptor):
+        """
+        Konversi deskriptor warna ke Color reportlab
+
+        Args:
+            descriptor (str): Hasil color_descriptor
+
+        Returns:
+            Color: Warna reportlab, atau None jika tidak bisa di-resolve
+        """
+        if descriptor in self._colors:
+            return self._colors[descriptor]
+
+        color = None
+        try:
+            if descriptor and descriptor.startswith('theme:'):
+                _, theme, tint = descriptor.split(':')
+                theme = int(theme)
+                if theme < len(self.theme_colors):
+                    color = self._hex_to_color(_apply_tint(self.theme_colors[theme], float(tint)))
+            elif descriptor and descriptor.startswith('indexed:'):
+                indexed = int(descriptor.split(':')[1])
+                if indexed in _SYSTEM_INDEXED_COLORS:
+                    color = self._hex_to_color(_SYSTEM_INDEXED_COLORS[indexed])
+                elif indexed < len(self.indexed_colors):
+                    color = self._hex_to_color(self.indexed_colors[indexed])
+            elif descriptor and len(descriptor) in (6, 8):
+                color = self._hex_to_color(descriptor[-6:])
+        except ValueError:
+            color = None
+
+        self._colors[descriptor] = color
+        return color
+
+    def _hex_to_color(self, rgb_hex):
+        r = int(rgb_hex[0:2], 16) / 255.0
+        g = int(rgb_hex[2:4], 16) / 255.0
+        b = int(rgb_hex[4:6], 16) / 255.0
+        return colors.Color(r, g, b)
+
+    def resolve(self, cell_format):
+        """
+        Resolve format sel ke nilai reportlab (di-memo per format unik)
+
+        Args:
+            cell_format (dict): Format sel (lihat extract_cell_format)
+
+        Returns:
+            ResolvedStyle: font_name, font_size (sudah dibatasi, None jika default),
+                text_color (None jika hitam/otomatis), background (None jika tanpa
+                fill) dan align ('LEFT'/'CENTER'/'RIGHT' atau None)
+        """
+        if cell_format is None:
+            return ResolvedStyle(None, None, None, None, None)
+
+        key = format_key(cell_format)
+        resolved = self._resolved.get(key)
+        if resolved is None:
+            resolved = self._resolved[key] = self._resolve(cell_format)
+        return resolved
+
+    def _resolve(self, cell_format):
+        font_name = 'Helvetica-Bold' if cell_format.get('font_bold') else None
+
+        font_size = cell_format.get('font_size')
+        if font_size and font_size != DEFAULT_FONT_SIZE:
+            font_size = max(MIN_FONT_SIZE, min(font_size, MAX_FONT_SIZE))
+        else:
+            font_size = None
+
+        text_color = self.resolve_color(cell_format.get('font_color'))
+        if text_color is not None and text_color.hexval() == colors.black.hexval():
+            text_color = None
+
+        # '00000000' adalah fill kosong (default openpyxl / tanpa patternFill)
+        fill_color = cell_format.get('fill_color')
+        background = None
+        if fill_color and fill_color != '00000000':
+            background = self.resolve_color(fill_color)
+
+        horizontal = (cell_format.get('alignment') or {}).get('horizontal')
+        return ResolvedStyle(font_name, font_size, text_color, background, ALIGN_MAP.get(horizontal))
+
+    def resolve_grid(self, style_grid):
+        """
+        Resolve semua style di StyleGrid
+
+        Args:
+            style_grid (StyleGrid): Grid formatting sheet
+
+        Returns:
+            list: ResolvedStyle per style id (index sama dengan style_grid.styles)
+        """
+        return [self.resolve(cell_format) for cell_format in style_grid.styles]
+
+
+def get_style_resolver(file_path):
+    """
+    Resolver bersama per workbook (theme dibaca sekali per file)
+
+    Args:
+        file_path (str): Path ke file Excel
+
+    Returns:
+        StyleResolver: Resolver untuk workbook
+    """
+    return get_workbook_cache().get(
+        file_path, ('styles', 'resolver'),
+        lambda: StyleResolver.from_xlsx(file_path),
+        size=4096
+    )
@@ -0,0 +1,139 @@
+"""
+Table Style Compiler Module
+Menggabungkan command TableStyle per sel yang identik menjadi range persegi
+agar jumlah command yang diproses reportlab tetap kecil untuk sheet besar
+"""
+
+from reportlab.platypus import TableStyle
+
+
+def _is_cell_command(command):
+    """Command yang hanya mengenai satu sel dengan koordinat positif"""
+    start, end = command[1], command[2]
+    return (start == end and start[0] >= 0 and start[1] >= 0)
+
+
+class TableStyleCompiler:
+    def __init__(self):
+        """Initialize compiler, statistik diisi setiap kali compile() dipanggil"""
+        self.input_commands = 0
+        self.output_commands = 0
+
+    @property
+    def saved_commands(self):
+        """Jumlah command yang dihemat pada compile terakhir"""
+        return self.input_commands - self.output_commands
+
+    def compile(self, base_commands, cell_commands=(), num_rows=0, row_backgrounds=None, start_row=1):
+        """
+        Susun TableStyle dari command dasar, zebra striping dan command per sel
+
+        Args:
+            base_commands (list): Command untuk range (header, grid, default data)
+            cell_commands (list): Command per sel, contoh
+                ('FONTNAME', (col, row), (col, row), 'Helvetica-Bold').
+                Diterapkan setelah base_commands, untuk op yang sama sel
+                terakhir yang menang
+            num_rows (int): Jumlah baris tabel (untuk zebra striping)
+            row_backgrounds (list): Warna baris bergantian mulai start_row,
+                menjadi satu command ROWBACKGROUNDS
+            start_row (int): Baris pertama zebra striping
+
+        Returns:
+            TableStyle: Style dengan command yang sudah digabung
+        """
+        commands = list(base_commands)
+        self.input_commands = len(base_commands)
+
+        if row_backgrounds and num_rows > start_row:
+            commands.append(('ROWBACKGROUNDS', (0, start_row), (-1, -1), list(row_backgrounds)))
+            # Sebelumnya: satu BACKGROUND per baris yang warnanya bukan warna pertama
+            self.input_commands += sum(
+                1 for row_idx in range(start_row, num_rows)
+                if (row_idx - start_row) % len(row_backgrounds) != 0
+            )
+
+        cell_commands = list(cell_commands)
+        self.input_commands += len(cell_commands)
+        commands.extend(self.merge_cell_commands(cell_commands))
+
+        self.output_commands = len(commands)
+        return TableStyle(commands)
+
+    def merge_cell_commands(self, cell_commands):
+        """
+        Gabungkan command per sel dengan op dan argumen sama menjadi range persegi
+
+        Args:
+            cell_commands (list): Command per sel
+
+        Returns:
+            list: Command hasil penggabungan (urutan op dipertahankan)
+        """
+        # {op: {(row, col): args}}, sel yang sama ditimpa oleh command terakhir
+        cells_by_op = {}
+        passthrough = []
+        for command in cell_commands:
+            if not _is_cell_command(command):
+                passthrough.append(command)
+                continue
+            try:
+                hash(command[3:])
+            except TypeError:
+                passthrough.append(command)
+                continue
+            col, row = command[1]
+            cells_by_op.setdefault(command[0], {})[(row, col)] = tuple(command[3:])
+
+        merged = []
+        for op, cells in cells_by_op.items():
+            for (row0, col0), (row1, col1), args in self._merge_rectangles(cells):
+                merged.append((op, (col0, row0), (col1, row1)) + args)
+
+        return merged + passthrough
+
+    def _merge_rectangles(self, cells):
+        """
+        Gabungkan sel menjadi persegi: run horizontal per baris, lalu run
+        dengan kolom dan argumen sama di baris berturut-turut digabung vertikal
+
+        Args:
+            cells (dict): {(row, col): args}
+
+        Returns:
+            list: List ((row0, col0), (row1, col1), args)
+        """
+        # Run horizontal per baris: {row: [(col0, col1, args)]}
+        runs_by_row = {}
+        for (row, col) in sorted(cells):
+            args = cells[(row, col)]
+            runs = runs_by_row.setdefault(row, [])
+            if runs and runs[-1][1] == col - 1 and runs[-1][2] == args:
+                runs[-1] = (runs[-1][0], col, args)
+            else:
+                runs.append((col, col, args))
+
+        rectangles = []
+        open_rects = {}  # {(col0, col1, args): row_awal}
+        previous_row = None
+
+        for row in sorted(runs_by_row):
+            current = {}
+            for col0, col1, args in runs_by_row[row]:
+                key = (col0, col1, args)
+                if previous_row == row - 1 and key in open_rects:
+                    current[key] = open_rects.pop(key)
+                else:
+                    current[key] = row
+
+            # Persegi yang tidak berlanjut ke baris ini sudah selesai
+            for (col0, col1, args), first_row in open_rects.items():
+                rectangles.append(((first_row, col0), (previous_row, col1), args))
+
+            open_rects = current
+            previous_row = row
+
+        for (col0, col1, args), first_row in open_rects.items():
+            rectangles.append(((first_row, col0), (previous_row, col1), args))
+
+        return rectangles
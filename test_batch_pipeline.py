@@ -0,0 +1,337 @@
+"""
+Test script untuk pipeline batch: manifest, job queue (resume dan batas percobaan),
+folder watcher dan restart worker pool scheduler
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+import subprocess
+import multiprocessing
+from contextlib import contextmanager
+
+import openpyxl
+import openpyxl.styles
+
+from batch_converter import convert_batch
+from conversion_scheduler import ConversionScheduler
+from folder_watcher import FolderWatcher
+from job_queue import JobQueue, run_job
+from pdf_converter_direct import PDFConverterDirect
+
+CONVERTER_SETTINGS = {'enable_watermark': False}
+
+
+def create_test_workbook(file_path, sheet_count=4):
+    """Workbook kecil dengan sheet 'Slip 1' .. 'Slip N'"""
+    workbook = openpyxl.Workbook()
+    workbook.remove(workbook.active)
+    for index in range(1, sheet_count + 1):
+        sheet = workbook.create_sheet(f"Slip {index}")
+        sheet.append(["Nama", f"Karyawan {index}"])
+        sheet.append(["Gaji", 5000000 + index * 100000])
+    workbook.save(file_path)
+
+
+def is_valid_pdf(file_path):
+    try:
+        with open(file_path, 'rb') as f:
+            return f.read(4) == b'%PDF'
+    except OSError:
+        return False
+
+
+def check(condition, message):
+    """Cetak hasil satu pengecekan"""
+    print(f"   {'✅' if condition else '❌'} {message}")
+    return bool(condition)
+
+
+def fork_available():
+    """Sheet yang mematikan worker disimulasikan lewat patch yang diwarisi proses fork"""
+    if multiprocessing.get_start_method() != 'fork':
+        print("   ⏭️  Skipped: needs the 'fork' start method")
+        return False
+    return True
+
+
+@contextmanager
+def crash_on_sheet(sheet_name):
+    """Worker yang dibuat di dalam blok ini mati (os._exit) saat mengkonversi sheet_name"""
+    original = PDFConverterDirect.convert_excel_to_pdf_direct
+
+    def crashing(self, excel_file, selected_sheets, *args, **kwargs):
+        if sheet_name in selected_sheets:
+            os._exit(1)
+        return original(self, excel_file, selected_sheets, *args, **kwargs)
+
+    PDFConverterDirect.convert_excel_to_pdf_direct = crashing
+    try:
+        yield
+    finally:
+        PDFConverterDirect.convert_excel_to_pdf_direct = original
+
+
+def test_manifest_skip_rebuild(work_dir):
+    """Run kedua melewati sheet yang tidak berubah, sheet yang berubah dibuat ulang"""
+    workbook_path = os.path.join(work_dir, 'gaji.xlsx')
+    output_dir = os.path.join(work_dir, 'output')
+    create_test_workbook(workbook_path)
+    scheduler = ConversionScheduler('direct', CONVERTER_SETTINGS, max_workers=2)
+
+    ok = True
+    first = convert_batch([workbook_path], output_dir, scheduler)['totals']
+    ok = check(first['converted'] == 4 and first['skipped'] == 0, f"First run converts all: {first}") and ok
+
+    second = convert_batch([workbook_path], output_dir, scheduler)['totals']
+    ok = check(second['converted'] == 0 and second['skipped'] == 4, f"Unchanged run skips all: {second}") and ok
+
+    workbook = openpyxl.load_workbook(workbook_path)
+    workbook["Slip 2"]["B2"] = 9999999
+    workbook.save(workbook_path)
+    os.remove(os.path.join(output_dir, 'gaji', 'gaji_Slip 4.pdf'))
+    summary = convert_batch([workbook_path], output_dir, scheduler)
+    rebuilt = sorted(sheet['sheet'] for sheet in summary['sheets'] if sheet['status'] == 'converted')
+    ok = check(rebuilt == ["Slip 2", "Slip 4"], f"Edited sheet and deleted PDF rebuilt: {rebuilt}") and ok
+
+    forced = convert_batch([workbook_path], output_dir, scheduler, force=True)['totals']
+    ok = check(forced['converted'] == 4, f"Force rebuilds all: {forced}") and ok
+
+    pdfs = [os.path.join(output_dir, 'gaji', name) for name in os.listdir(os.path.join(output_dir, 'gaji'))
+            if name.endswith('.pdf')]
+    ok = check(len(pdfs) == 4 and all(is_valid_pdf(path) for path in pdfs), f"{len(pdfs)} valid PDF(s)") and ok
+    return ok
+
+
+def create_job(job_queue, workbook_path, output_dir, sheet_names):
+    return job_queue.create_job('direct', CONVERTER_SETTINGS, [
+        {'file_path': workbook_path, 'sheet_name': sheet_name, 'output_directory': output_dir}
+        for sheet_name in sheet_names
+    ])
+
+
+def task_states(job_queue, job_id):
+    return {task['sheet_name']: (task['status'], task['attempts']) for task in job_queue.job_tasks(job_id)}
+
+
+def test_interrupted_resume(work_dir):
+    """Sheet yang tercatat 'running' saat proses berhenti dilanjutkan tanpa mengulang sheet selesai"""
+    workbook_path = os.path.join(work_dir, 'gaji.xlsx')
+    output_dir = os.path.join(work_dir, 'output')
+    create_test_workbook(workbook_path)
+    job_queue = JobQueue(os.path.join(work_dir, 'jobs.sqlite3'))
+    ok = True
+
+    try:
+        # Beberapa sheet berjalan bersamaan: percobaannya tidak dihitung
+        job_id = create_job(job_queue, workbook_path, output_dir, ["Slip 1", "Slip 2", "Slip 3"])
+        tasks = job_queue.job_tasks(job_id)
+        job_queue.start_tasks([task['id'] for task in tasks])
+        job_queue.finish_task(tasks[0]['id'], {'success': True, 'output_file': None, 'error': None, 'seconds': 0.1})
+        reset = job_queue.reset_interrupted(job_id)
+        states = task_states(job_queue, job_id)
+        ok = check(reset == 2 and states["Slip 2"] == ('pending', 0) and states["Slip 3"] == ('pending', 0),
+                   f"Interrupted batch refunded: {states}") and ok
+
+        with ConversionScheduler('direct', CONVERTER_SETTINGS, max_workers=2, isolate=True) as scheduler:
+            status = run_job(job_queue, job_id, scheduler)
+        states = task_states(job_queue, job_id)
+        ok = check(status == 'done' and states["Slip 1"] == ('done', 1) and states["Slip 2"] == ('done', 1),
+                   f"Resumed job done, finished sheet not rerun: {states}") and ok
+
+        # Sheet yang berjalan sendirian: percobaannya tetap dihitung
+        job_id = create_job(job_queue, workbook_path, output_dir, ["Slip 4"])
+        job_queue.start_tasks([task['id'] for task in job_queue.job_tasks(job_id)])
+        job_queue.reset_interrupted(job_id)
+        states = task_states(job_queue, job_id)
+        ok = check(states["Slip 4"] == ('failed', 1), f"Sole running sheet keeps its attempt: {states}") and ok
+
+        with ConversionScheduler('direct', CONVERTER_SETTINGS, max_workers=1, isolate=True) as scheduler:
+            status = run_job(job_queue, job_id, scheduler, max_attempts=1)
+        ok = check(status == 'failed' and task_states(job_queue, job_id)["Slip 4"] == ('failed', 1),
+                   "Sole running sheet is capped by max_attempts") and ok
+    finally:
+        job_queue.close()
+    return ok
+
+
+def test_retry_cap(work_dir):
+    """Sheet yang mematikan worker berhenti dicoba setelah max_attempts, sheet lain tidak kena"""
+    if not fork_available():
+        return True
+
+    workbook_path = os.path.join(work_dir, 'gaji.xlsx')
+    output_dir = os.path.join(work_dir, 'output')
+    create_test_workbook(workbook_path)
+    job_queue = JobQueue(os.path.join(work_dir, 'jobs.sqlite3'))
+    ok = True
+
+    try:
+        for workers, sheet_names in ((2, ["Slip 1", "Slip 2", "Slip 3", "Slip 4"]), (1, ["Slip 2"])):
+            job_id = create_job(job_queue, workbook_path, output_dir, sheet_names)
+            with crash_on_sheet("Slip 2"):
+                with ConversionScheduler('direct', CONVERTER_SETTINGS, max_workers=workers,
+                                         isolate=True) as scheduler:
+                    status = run_job(job_queue, job_id, scheduler, max_attempts=3)
+            states = task_states(job_queue, job_id)
+            others = [state for sheet_name, state in states.items() if sheet_name != "Slip 2"]
+            ok = check(status == 'failed' and states["Slip 2"] == ('failed', 3),
+                       f"{workers} worker(s): crashing sheet capped at 3 attempts: {states['Slip 2']}") and ok
+            ok = check(all(state == ('done', 1) for state in others),
+                       f"{workers} worker(s): other sheets charged one attempt: {others}") and ok
+    finally:
+        job_queue.close()
+    return ok
+
+
+def test_watcher_debounce(work_dir):
+    """File baru atau yang masih ditulis baru dikonversi setelah stabil selama settle_seconds"""
+    input_dir = os.path.join(work_dir, 'input')
+    os.makedirs(input_dir)
+    scheduler = ConversionScheduler('direct', CONVERTER_SETTINGS, max_workers=1)
+    watcher = FolderWatcher(input_dir, os.path.join(work_dir, 'output'), scheduler, settle_seconds=2.0)
+    workbook_path = os.path.abspath(os.path.join(input_dir, 'gaji.xlsx'))
+    ok = True
+
+    create_test_workbook(workbook_path)
+    with open(os.path.join(input_dir, '~$gaji.xlsx'), 'wb') as f:
+        f.write(b'lock')
+    ok = check(watcher.poll(now=0.0) == [], "New file not ready immediately") and ok
+    ok = check(watcher.poll(now=1.9) == [], "Not ready before settle time") and ok
+    ok = check(watcher.poll(now=2.0) == [workbook_path], "Ready after settle time, lock file ignored") and ok
+
+    # Masih ditulis: ukuran berubah, waktu stabil dihitung ulang
+    create_test_workbook(workbook_path, sheet_count=6)
+    ok = check(watcher.poll(now=3.0) == [], "Changed file waits again") and ok
+    ok = check(watcher.poll(now=5.0) == [workbook_path], "Changed file ready after settling") and ok
+
+    # File setengah tertulis (bukan zip utuh) tidak dikonversi
+    partial_path = os.path.abspath(os.path.join(input_dir, 'partial.xlsx'))
+    with open(partial_path, 'wb') as f:
+        f.write(b'PK\x03\x04 not finished')
+    watcher.poll(now=10.0)
+    ok = check(partial_path not in watcher.poll(now=20.0), "Incomplete workbook not ready") and ok
+    return ok
+
+
+def test_scheduler_pool_restart(work_dir):
+    """Pool yang rusak karena worker mati diganti, run berikutnya tetap berhasil"""
+    workbook_path = os.path.join(work_dir, 'gaji.xlsx')
+    output_dir = os.path.join(work_dir, 'output')
+    create_test_workbook(workbook_path)
+    files = [(workbook_path, ["Slip 1", "Slip 2", "Slip 3", "Slip 4"], output_dir, "", {})]
+    ok = True
+
+    with ConversionScheduler('direct', CONVERTER_SETTINGS, max_workers=2) as scheduler:
+        # Worker mati saat idle: pool rusak terdeteksi saat task dikirim
+        executor = scheduler._executor
+        for process in list(executor._processes.values()):
+            process.kill()
+            process.join()
+        # Thread manager pool menandai pool rusak setelah melihat proses mati
+        for _ in range(50):
+            if executor._broken:
+                break
+            time.sleep(0.1)
+        results = scheduler.run(files)
+        ok = check(all(result['success'] for result in results) and len(results) == 4,
+                   "Run after idle worker death converts all sheets") and ok
+        ok = check(scheduler._executor is not None and scheduler._executor is not executor, "Pool replaced") and ok
+
+    if fork_available():
+        # Worker mati di tengah task: sheet yang sedang berjalan ditandai worker_crashed
+        with crash_on_sheet("Slip 3"):
+            scheduler = ConversionScheduler('direct', CONVERTER_SETTINGS, max_workers=2).start()
+        try:
+            results = scheduler.run(files)
+            crashed = sorted(result['sheet_name'] for result in results if result.get('worker_crashed'))
+            ok = check("Slip 3" in crashed, f"Crashed sheets reported: {crashed}") and ok
+            results = scheduler.run(files)
+            ok = check(all(result['success'] for result in results), "Restarted pool converts all sheets") and ok
+        finally:
+            scheduler.shutdown()
+    return ok
+
+
+def test_cli_json_spawn(work_dir):
+    """Dengan start method spawn (default Windows) stdout cli tetap hanya berisi ringkasan JSON"""
+    workbook_path = os.path.join(work_dir, 'gaji.xlsx')
+    create_test_workbook(workbook_path)
+    # Formatting yang sama per baris membuat converter di worker mencetak log style tabel
+    workbook = openpyxl.load_workbook(workbook_path)
+    for sheet in workbook.worksheets:
+        for row in sheet.iter_rows():
+            for cell in row:
+                cell.font = openpyxl.styles.Font(bold=True)
+                cell.fill = openpyxl.styles.PatternFill(start_color="DDEBF7", end_color="DDEBF7", fill_type="solid")
+    workbook.save(workbook_path)
+    repo_dir = os.path.dirname(os.path.abspath(__file__))
+    script = (
+        "import multiprocessing, sys\n"
+        "multiprocessing.set_start_method('spawn')\n"
+        "import cli\n"
+        "sys.exit(cli.main(sys.argv[1:]))\n"
+    )
+    process = subprocess.run(
+        [sys.executable, '-c', script, workbook_path, '-o', os.path.join(work_dir, 'output'),
+         '--method', 'table', '--workers', '2'],
+        cwd=repo_dir, capture_output=True, text=True, encoding='utf-8', timeout=300
+    )
+
+    ok = check(process.returncode == 0, f"CLI exit code {process.returncode}")
+    try:
+        summary = json.loads(process.stdout)
+    except ValueError:
+        print(f"   stdout: {process.stdout[:200]!r}")
+        return check(False, "stdout parses as JSON")
+    ok = check(True, "stdout parses as JSON") and ok
+    ok = check(summary['totals']['converted'] == 4, f"Converted {summary['totals']['converted']}/4 sheets") and ok
+    ok = check('Table style' in process.stderr, "Worker logs go to stderr") and ok
+    return ok
+
+
+def main():
+    """Main test function"""
+    print("🧪 Batch Pipeline Test Suite")
+    print("=" * 60)
+
+    tests = [
+        ("Manifest Skip/Rebuild", test_manifest_skip_rebuild),
+        ("Interrupted Resume", test_interrupted_resume),
+        ("Retry Cap", test_retry_cap),
+        ("Watcher Debounce", test_watcher_debounce),
+        ("Scheduler Pool Restart", test_scheduler_pool_restart),
+        ("CLI JSON With Spawn", test_cli_json_spawn)
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        print(f"\n🔬 Running {test_name} test...")
+        work_dir = tempfile.mkdtemp(prefix='batch-test-')
+        try:
+            results.append((test_name, test_func(work_dir)))
+        except Exception as e:
+            print(f"❌ {test_name} test crashed: {str(e)}")
+            results.append((test_name, False))
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    print("\n" + "=" * 60)
+    print("📋 BATCH PIPELINE TEST SUMMARY")
+    print("=" * 60)
+
+    passed = 0
+    for test_name, result in results:
+        print(f"{test_name:.<30} {'✅ PASSED' if result else '❌ FAILED'}")
+        if result:
+            passed += 1
+
+    print(f"\nOverall: {passed}/{len(results)} tests passed")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
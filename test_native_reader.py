@@ -0,0 +1,298 @@
+"""
+Test script untuk backend pembaca native (XlsxNativeReader): nilai, merged cells,
+lebar kolom, tinggi baris dan format sel harus sama dengan backend openpyxl
+"""
+
+import os
+import re
+import sys
+import shutil
+import zipfile
+import tempfile
+from datetime import datetime, date, time as dt_time
+
+import openpyxl
+import openpyxl.styles
+from openpyxl.utils.datetime import CALENDAR_MAC_1904
+
+from excel_reader import create_reader, load_cached_workbook
+from pdf_converter_direct import PDFConverterDirect
+from style_grid import StyleGrid
+from workbook_cache import get_workbook_cache
+
+SAMPLE_WORKBOOK = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sample_data.xlsx")
+
+# Sel yang tetap inline string (t="inlineStr"), string lain dipindah ke sharedStrings.xml
+INLINE_CELLS = {"D2": "Teks inline", "H9": "Inline & <khusus>"}
+
+SHARED_STRINGS_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"
+SHARED_STRINGS_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/sharedStrings"
+INLINE_CELL_PATTERN = re.compile(r'<c r="([A-Z]+[0-9]+)"([^>]*?) t="inlineStr"([^>]*)><is><t>(.*?)</t></is></c>')
+
+
+def write_shared_strings(file_path):
+    """
+    Pindahkan string ke tabel shared string (openpyxl menulis semua string sebagai
+    inline string), kecuali INLINE_CELLS yang tetap inline
+
+    Args:
+        file_path (str): Path workbook, ditulis ulang di tempat
+    """
+    with zipfile.ZipFile(file_path) as source:
+        parts = [(info, source.read(info.filename)) for info in source.infolist()]
+
+    shared = {}  # {teks XML: index}, string sama memakai index yang sama
+
+    def to_shared(match):
+        ref, before, after, text = match.groups()
+        if ref in INLINE_CELLS:
+            return match.group(0)
+        index = shared.setdefault(text, len(shared))
+        return f'<c r="{ref}"{before} t="s"{after}><v>{index}</v></c>'
+
+    rewritten = []
+    for info, content in parts:
+        xml = content.decode('utf-8') if info.filename.endswith(('.xml', '.rels')) else None
+        if info.filename.startswith('xl/worksheets/sheet'):
+            xml = INLINE_CELL_PATTERN.sub(to_shared, xml)
+        elif info.filename == '[Content_Types].xml':
+            xml = xml.replace('</Types>', f'<Override PartName="/xl/sharedStrings.xml" '
+                                          f'ContentType="{SHARED_STRINGS_TYPE}"/></Types>')
+        elif info.filename == 'xl/_rels/workbook.xml.rels':
+            xml = xml.replace('</Relationships>', f'<Relationship Id="rIdShared" Type="{SHARED_STRINGS_REL}" '
+                                                  f'Target="sharedStrings.xml"/></Relationships>')
+        rewritten.append((info, xml.encode('utf-8') if xml is not None else content))
+
+    items = "".join(f"<si><t>{text}</t></si>" for text in shared)
+    shared_xml = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                  '<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+                  f'count="{len(shared)}" uniqueCount="{len(shared)}">{items}</sst>')
+
+    with zipfile.ZipFile(file_path, 'w', zipfile.ZIP_DEFLATED) as target:
+        for info, content in rewritten:
+            target.writestr(info, content)
+        target.writestr('xl/sharedStrings.xml', shared_xml)
+
+
+def create_edge_case_workbook(file_path):
+    """
+    Workbook dengan shared string, inline string, tanggal date1904, baris jarang,
+    merged cells, lebar kolom, tinggi baris dan beberapa style
+    """
+    workbook = openpyxl.Workbook()
+    workbook.epoch = CALENDAR_MAC_1904
+
+    sheet = workbook.active
+    sheet.title = "Kasus Khusus"
+    header_font = openpyxl.styles.Font(bold=True, size=13, color="FFFFFF")
+    header_fill = openpyxl.styles.PatternFill('solid', fgColor="1F4E78")
+    thin = openpyxl.styles.Side(style='thin')
+
+    sheet.append(["Nama", "Tanggal", "Jam", "Inline", "Jumlah", "Aktif"])
+    for cell in sheet[1]:
+        cell.font = header_font
+        cell.fill = header_fill
+        cell.alignment = openpyxl.styles.Alignment(horizontal='center', vertical='center')
+
+    rows = [
+        ["Andi", date(2024, 1, 31), dt_time(8, 30), None, 1500000, True],
+        ["Budi", datetime(1904, 1, 2, 12, 0), dt_time(17, 45, 30), None, 2.5, False],
+        ["Andi", datetime(2031, 12, 31, 23, 59, 59), None, "Andi", -42, None],
+    ]
+    for row in rows:
+        sheet.append(row)
+    for cell in sheet['B'][1:]:
+        cell.number_format = 'yyyy-mm-dd'
+    for cell in sheet['E'][1:]:
+        cell.number_format = '#,##0.00'
+        cell.alignment = openpyxl.styles.Alignment(horizontal='right')
+        cell.border = openpyxl.styles.Border(left=thin, right=thin, top=thin, bottom=thin)
+
+    # Baris jarang: celah baris dan kolom, sel terakhir jauh dari data lain
+    sheet["A7"] = "Setelah celah"
+    sheet["C7"] = 7
+    sheet["H9"] = INLINE_CELLS["H9"]
+    sheet["H9"].font = openpyxl.styles.Font(italic=True, color="C00000")
+    sheet["B12"] = "Baris terakhir"
+    sheet["B12"].fill = openpyxl.styles.PatternFill('solid', fgColor="FFF2CC")
+
+    sheet["D2"] = INLINE_CELLS["D2"]
+
+    sheet.merge_cells("A10:C11")
+    sheet["A10"] = "Sel gabungan"
+    sheet.merge_cells("J1:K1")
+
+    sheet.column_dimensions['A'].width = 18.5
+    sheet.column_dimensions['H'].width = 30
+    sheet.row_dimensions[1].height = 24
+    sheet.row_dimensions[9].height = 40
+
+    second = workbook.create_sheet("Kosong Sebagian")
+    second["C3"] = "Satu sel"
+    second["C3"].alignment = openpyxl.styles.Alignment(horizontal='left', vertical='top')
+
+    workbook.save(file_path)
+    write_shared_strings(file_path)
+
+
+def check(condition, message):
+    print(f"{'✅' if condition else '❌'} {message}")
+    return condition
+
+
+def first_difference(expected, actual):
+    """Posisi dan isi perbedaan pertama dua grid (untuk pesan test)"""
+    for row_idx, (expected_row, actual_row) in enumerate(zip(expected, actual)):
+        if expected_row != actual_row:
+            return row_idx, expected_row, actual_row
+    if len(expected) != len(actual):
+        return "rows", len(expected), len(actual)
+    return None
+
+
+def grid_formats(style_grid, num_rows, num_cols):
+    """Format tiap sel sebagai grid (style id berbeda per backend, format harus sama)"""
+    return [[style_grid.get(row_idx, col_idx) for col_idx in range(num_cols)] for row_idx in range(num_rows)]
+
+
+def compare_sheet(file_path, sheet_name):
+    """Bandingkan satu sheet antara backend native dan openpyxl"""
+    ok = True
+    label = f"{os.path.basename(file_path)} [{sheet_name}]"
+
+    # Nilai mentah (termasuk datetime dengan epoch workbook) seperti yang dipakai converter
+    native = create_reader(file_path, 'native')
+    try:
+        native_values, _ = native.get_sheet_values(sheet_name)
+        native_formatted = native.get_sheet_with_formatting(sheet_name)
+    finally:
+        native.close()
+
+    worksheet = load_cached_workbook(file_path)[sheet_name]
+    openpyxl_values = [[cell.value for cell in row] for row in worksheet.iter_rows()]
+    ok = check(native_values == openpyxl_values,
+               f"{label}: raw values equal {first_difference(openpyxl_values, native_values)}") and ok
+
+    reader = create_reader(file_path, 'openpyxl')
+    try:
+        expected = reader.get_sheet_with_formatting(sheet_name)
+    finally:
+        reader.close()
+
+    ok = check(native_formatted['data'] == expected['data'],
+               f"{label}: data equal {first_difference(expected['data'], native_formatted['data'])}") and ok
+    ok = check(sorted(native_formatted['merged_cells']) == sorted(expected['merged_cells']),
+               f"{label}: merged cells {sorted(native_formatted['merged_cells'])}") and ok
+    ok = check(native_formatted['column_widths'] == expected['column_widths'],
+               f"{label}: column widths {native_formatted['column_widths']}") and ok
+    ok = check(native_formatted['row_heights'] == expected['row_heights'],
+               f"{label}: row heights {native_formatted['row_heights']}") and ok
+
+    num_rows = len(expected['data'])
+    num_cols = len(expected['data'][0]) if expected['data'] else 0
+    expected_formats = grid_formats(expected['formatting'], num_rows, num_cols)
+    native_formats = grid_formats(native_formatted['formatting'], num_rows, num_cols)
+    ok = check(native_formats == expected_formats,
+               f"{label}: cell formats equal {first_difference(expected_formats, native_formats)}") and ok
+
+    # Jalur converter: iter baris + map_style_ids ke StyleGrid bersama
+    converter = PDFConverterDirect(enable_watermark=False)
+    converter_formats = []
+    for backend in ('openpyxl', 'native'):
+        converter.reader_backend = backend
+        workbook = converter._open_workbook(file_path)
+        try:
+            style_grid = StyleGrid()
+            data = converter._extract_sheet_data(converter._iter_sheet_rows(workbook, sheet_name, style_grid),
+                                                 style_grid)
+            width = max((len(row) for row in data), default=0)
+            converter_formats.append((data, grid_formats(style_grid, len(data), width)))
+        finally:
+            converter._close_workbook(workbook)
+    ok = check(converter_formats[0] == converter_formats[1],
+               f"{label}: converter rows and style grid equal") and ok
+
+    return ok
+
+
+def compare_workbook(file_path):
+    """Bandingkan semua sheet workbook antara dua backend"""
+    native = create_reader(file_path, 'native')
+    try:
+        sheet_names = native.get_sheet_names()
+    finally:
+        native.close()
+
+    ok = check(sheet_names == load_cached_workbook(file_path).sheetnames, f"Sheet names {sheet_names}")
+    for sheet_name in sheet_names:
+        ok = compare_sheet(file_path, sheet_name) and ok
+    get_workbook_cache().invalidate(file_path)
+    return ok
+
+
+def test_sample_workbook(work_dir):
+    """sample_data.xlsx dibaca sama oleh kedua backend"""
+    if not os.path.exists(SAMPLE_WORKBOOK):
+        return check(False, f"Sample workbook not found: {SAMPLE_WORKBOOK}")
+    return compare_workbook(SAMPLE_WORKBOOK)
+
+
+def test_edge_case_workbook(work_dir):
+    """Shared/inline string, tanggal date1904, baris jarang dan merged cells"""
+    file_path = os.path.join(work_dir, "kasus_khusus.xlsx")
+    create_edge_case_workbook(file_path)
+
+    # Pastikan kasus yang diuji memang ada di file
+    with zipfile.ZipFile(file_path) as archive:
+        sheet_xml = archive.read("xl/worksheets/sheet1.xml").decode('utf-8')
+        workbook_xml = archive.read("xl/workbook.xml").decode('utf-8')
+    ok = check(sheet_xml.count('t="inlineStr"') == len(INLINE_CELLS) and 't="s"' in sheet_xml,
+               "Workbook mixes inline and shared strings")
+    ok = check('date1904="1"' in workbook_xml, "Workbook uses the 1904 date system") and ok
+
+    values = load_cached_workbook(file_path)["Kasus Khusus"]
+    ok = check(values["D2"].value == INLINE_CELLS["D2"] and values["B2"].value == datetime(2024, 1, 31),
+               f"openpyxl reads inline string and 1904 date: {values['D2'].value!r}, {values['B2'].value!r}") and ok
+    get_workbook_cache().invalidate(file_path)
+
+    return compare_workbook(file_path) and ok
+
+
+def main():
+    """Main test function"""
+    print("🧪 Native Reader Test Suite")
+    print("=" * 60)
+
+    tests = [
+        ("Sample Workbook", test_sample_workbook),
+        ("Edge Case Workbook", test_edge_case_workbook)
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        print(f"\n🔬 Running {test_name} test...")
+        work_dir = tempfile.mkdtemp(prefix='native-reader-test-')
+        try:
+            results.append((test_name, test_func(work_dir)))
+        except Exception as e:
+            print(f"❌ {test_name} test crashed: {str(e)}")
+            results.append((test_name, False))
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    print("\n" + "=" * 60)
+    print("📋 NATIVE READER TEST SUMMARY")
+    print("=" * 60)
+
+    passed = 0
+    for test_name, result in results:
+        print(f"{test_name:.<30} {'✅ PASSED' if result else '❌ FAILED'}")
+        if result:
+            passed += 1
+
+    print(f"\nOverall: {passed}/{len(results)} tests passed")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,212 @@
+"""
+Test script untuk template slip: slip yang digambar di atas template harus berisi
+teks yang sama dengan slip yang dibangun lewat Table biasa, dan sheet dengan
+layout berbeda harus jatuh ke jalur Table biasa
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+from contextlib import contextmanager
+
+import openpyxl
+import openpyxl.styles
+from pypdf import PdfReader
+
+import slip_template
+from pdf_converter_direct import PDFConverterDirect
+
+SLIP_SHEETS = ["Slip 1", "Slip 2", "Slip 3", "Slip 4"]
+# Layout berbeda: baris tambahan dan sel multi-baris (fingerprint tidak cocok)
+EXTRA_ROW_SHEET = "Slip Lembur"
+MULTILINE_SHEET = "Slip Catatan"
+
+
+def slip_rows(index):
+    """Isi slip gaji; nilai berbeda per sheet, struktur sama"""
+    return [
+        ["Keterangan", "Nilai"],
+        ["Nama", f"Karyawan {index} {'Panjang ' * index}".strip()],
+        ["Jabatan", ["Staff", "Supervisor", "Manager", "Direktur"][(index - 1) % 4]],
+        ["Gaji Pokok", f"Rp {5000000 + index * 125000:,}"],
+        ["Tunjangan", f"Rp {750000 * index:,}"],
+        ["Potongan (BPJS)", f"Rp {index * 41234:,}"],
+    ]
+
+
+def style_slip(sheet):
+    """Header tebal berlatar, kolom nilai rata kanan"""
+    header_fill = openpyxl.styles.PatternFill('solid', fgColor='DDEBF7')
+    for cell in sheet[1]:
+        cell.font = openpyxl.styles.Font(bold=True)
+        cell.fill = header_fill
+    for row in sheet.iter_rows(min_row=2, min_col=2, max_col=2):
+        for cell in row:
+            cell.alignment = openpyxl.styles.Alignment(horizontal='right')
+
+
+def create_slip_workbook(file_path):
+    """Workbook slip: empat sheet dengan layout sama dan dua sheet dengan layout berbeda"""
+    workbook = openpyxl.Workbook()
+    workbook.remove(workbook.active)
+
+    expected = {}
+    for index, sheet_name in enumerate(SLIP_SHEETS, start=1):
+        rows = slip_rows(index)
+        sheet = workbook.create_sheet(sheet_name)
+        for row in rows:
+            sheet.append(row)
+        style_slip(sheet)
+        expected[sheet_name] = rows
+
+    rows = slip_rows(5) + [["Lembur", "Rp 480,000"]]
+    sheet = workbook.create_sheet(EXTRA_ROW_SHEET)
+    for row in rows:
+        sheet.append(row)
+    style_slip(sheet)
+    expected[EXTRA_ROW_SHEET] = rows
+
+    rows = slip_rows(6)
+    rows[2][1] = "Manager\nCabang Bandung"
+    sheet = workbook.create_sheet(MULTILINE_SHEET)
+    for row in rows:
+        sheet.append(row)
+    style_slip(sheet)
+    expected[MULTILINE_SHEET] = rows
+
+    workbook.save(file_path)
+    return expected
+
+
+@contextmanager
+def record_template_renders():
+    """Catat nama output PDF yang berhasil digambar lewat SlipTemplate.render"""
+    original_render = slip_template.SlipTemplate.render
+    rendered = []
+
+    def render(self, doc, data, live_replacements=None):
+        success = original_render(self, doc, data, live_replacements)
+        if success:
+            rendered.append(os.path.basename(doc.filename))
+        return success
+
+    slip_template.SlipTemplate.render = render
+    try:
+        yield rendered
+    finally:
+        slip_template.SlipTemplate.render = original_render
+
+
+def extract_text(pdf_path):
+    """Teks semua halaman PDF"""
+    return "\n".join(page.extract_text() for page in PdfReader(pdf_path).pages)
+
+
+def check(condition, message):
+    print(f"{'✅' if condition else '❌'} {message}")
+    return condition
+
+
+def convert(workbook_path, output_dir, use_slip_templates):
+    """Konversi semua sheet berurutan (satu converter, template dipakai ulang)"""
+    converter = PDFConverterDirect(enable_watermark=False, use_slip_templates=use_slip_templates)
+    sheet_names = SLIP_SHEETS + [EXTRA_ROW_SHEET, MULTILINE_SHEET]
+    with record_template_renders() as rendered:
+        results = converter.convert_excel_to_pdf_direct(workbook_path, sheet_names, output_dir)
+    return converter, results, rendered
+
+
+def test_template_matches_table(work_dir):
+    """Slip dari template dan dari Table biasa berisi teks yang sama untuk setiap nilai"""
+    workbook_path = os.path.join(work_dir, "slip.xlsx")
+    expected = create_slip_workbook(workbook_path)
+
+    template_converter, template_results, rendered = convert(
+        workbook_path, os.path.join(work_dir, "template"), True)
+    _, plain_results, plain_rendered = convert(workbook_path, os.path.join(work_dir, "plain"), False)
+
+    ok = check(all(template_results.values()) and all(plain_results.values()),
+               f"All sheets converted: {template_results}, {plain_results}")
+    if not ok:
+        return False
+
+    # Slip 1 membangun template, Slip 2-4 digambar di atasnya
+    template_files = {os.path.basename(template_results[name]): name for name in template_results}
+    rendered_sheets = sorted(template_files[file_name] for file_name in rendered)
+    ok = check(rendered_sheets == SLIP_SHEETS[1:], f"Same-layout slips use the template: {rendered_sheets}") and ok
+    ok = check(plain_rendered == [], "Plain converter never renders from a template") and ok
+
+    for sheet_name, rows in expected.items():
+        template_text = extract_text(template_results[sheet_name])
+        plain_text = extract_text(plain_results[sheet_name])
+        ok = check(template_text == plain_text, f"{sheet_name}: template and table text identical") and ok
+
+        missing = [value for row in rows for value in row
+                   if any(line not in template_text for line in str(value).split("\n"))]
+        ok = check(not missing and sheet_name in template_text,
+                   f"{sheet_name}: every value and the title present {missing}") and ok
+
+    return ok
+
+
+def test_fingerprint_mismatch_fallback(work_dir):
+    """Sheet dengan layout berbeda tidak memakai template yang ada dan membangun template baru"""
+    workbook_path = os.path.join(work_dir, "slip.xlsx")
+    create_slip_workbook(workbook_path)
+
+    converter, results, rendered = convert(workbook_path, os.path.join(work_dir, "template"), True)
+    rendered_files = set(rendered)
+
+    ok = True
+    for sheet_name in (EXTRA_ROW_SHEET, MULTILINE_SHEET):
+        ok = check(bool(results.get(sheet_name)) and os.path.basename(results[sheet_name]) not in rendered_files,
+                   f"{sheet_name}: built through the plain Table path") and ok
+    # Satu template untuk slip biasa dan satu untuk masing-masing layout berbeda
+    ok = check(len(converter.slip_templates) == 3, f"Templates per layout: {len(converter.slip_templates)}") and ok
+
+    # Fingerprint sama tetapi ukuran data tidak cocok: render menolak, tanpa menggambar apa pun
+    template = next(iter(converter.slip_templates.values()))
+    ok = check(template.render(None, [["Keterangan", "Nilai"]]) is False,
+               "Render rejects data with a different shape") and ok
+    return ok
+
+
+def main():
+    """Main test function"""
+    print("🧪 Slip Template Test Suite")
+    print("=" * 60)
+
+    tests = [
+        ("Template Matches Table", test_template_matches_table),
+        ("Fingerprint Mismatch Fallback", test_fingerprint_mismatch_fallback)
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        print(f"\n🔬 Running {test_name} test...")
+        work_dir = tempfile.mkdtemp(prefix='slip-test-')
+        try:
+            results.append((test_name, test_func(work_dir)))
+        except Exception as e:
+            print(f"❌ {test_name} test crashed: {str(e)}")
+            results.append((test_name, False))
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    print("\n" + "=" * 60)
+    print("📋 SLIP TEMPLATE TEST SUMMARY")
+    print("=" * 60)
+
+    passed = 0
+    for test_name, result in results:
+        print(f"{test_name:.<30} {'✅ PASSED' if result else '❌ FAILED'}")
+        if result:
+            passed += 1
+
+    print(f"\nOverall: {passed}/{len(results)} tests passed")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
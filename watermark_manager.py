@@ -4,28 +4,113 @@ Modul untuk menambahkan watermark ke PDF files
 """
 
 import os
+import sys
+import math
+import time
+import argparse
 from reportlab.pdfgen import canvas
+from reportlab.pdfbase.pdfmetrics import stringWidth
 from reportlab.lib.pagesizes import A4, landscape
 from reportlab.lib.utils import ImageReader
-# from PyPDF2 import PdfReader, PdfWriter  # Optional dependency
-import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from collections import OrderedDict, namedtuple
 from PIL import Image
 import io
 
+try:
+    from pypdf import PdfReader, PdfWriter
+except ImportError:
+    try:
+        from PyPDF2 import PdfReader, PdfWriter
+    except ImportError:
+        PdfReader = PdfWriter = None
+
+PDF_MERGE_AVAILABLE = PdfReader is not None
+
+# Watermark yang sudah di-resize dan diberi opacity, dipakai ulang antar PDF
+PreparedWatermark = namedtuple('PreparedWatermark', ['image', 'reader', 'x', 'y', 'width', 'height'])
+
+MAX_PREPARED_WATERMARKS = 32
+
+# 'image': gambar watermark.png, 'text': teks vektor (operator teks PDF, tanpa raster)
+WATERMARK_MODES = ('image', 'text')
+# Posisi yang dikenal _calculate_watermark_position
+WATERMARK_POSITIONS = ('center', 'bottom-right', 'bottom-left', 'top-right', 'top-left')
+DEFAULT_WATERMARK_TEXT = "CONFIDENTIAL"
+
+_prepared_watermarks = OrderedDict()  # {(path, mtime, ukuran halaman, posisi): PreparedWatermark}
+_prepared_lock = threading.Lock()
+
+
+def _page_display_transform(page):
+    """
+    Ukuran halaman seperti yang ditampilkan dan matrix dari koordinat tampilan ke user space
+
+    Args:
+        page (PageObject): Halaman pypdf/PyPDF2
+
+    Returns:
+        tuple: (lebar, tinggi, matrix (a, b, c, d, e, f)), matrix None jika halaman
+            tidak diputar dan crop box dimulai di (0, 0)
+    """
+    box = page.cropbox
+    x0, y0 = float(box.left), float(box.bottom)
+    width, height = float(box.width), float(box.height)
+    rotation = int(page.get('/Rotate', 0) or 0) % 360
+
+    # /Rotate memutar tampilan searah jarum jam
+    if rotation == 90:
+        return height, width, (0, 1, -1, 0, x0 + width, y0)
+    if rotation == 180:
+        return width, height, (-1, 0, 0, -1, x0 + width, y0 + height)
+    if rotation == 270:
+        return height, width, (0, -1, 1, 0, x0, y0 + height)
+    if x0 or y0:
+        return width, height, (1, 0, 0, 1, x0, y0)
+    return width, height, None
+
+
 class WatermarkManager:
-    def __init__(self, watermark_path="watermark.png"):
+    def __init__(self, watermark_path="watermark.png", mode="image", text=DEFAULT_WATERMARK_TEXT,
+                 rotation=45, tile=False, font_name="Helvetica-Bold", font_size=48, color=(0.5, 0.5, 0.5)):
         """
         Initialize watermark manager
         
         Args:
-            watermark_path (str): Path ke file watermark
+            watermark_path (str): Path ke file watermark (mode 'image')
+            mode (str): 'image' atau 'text'
+            text (str): Teks watermark (mode 'text')
+            rotation (float): Rotasi teks dalam derajat
+            tile (bool): Ulangi teks di seluruh halaman, bukan satu kali di posisi watermark
+            font_name (str): Font standar PDF untuk teks
+            font_size (float): Ukuran font teks
+            color (tuple): Warna teks (r, g, b) 0.0-1.0
         """
+        if mode not in WATERMARK_MODES:
+            raise Exception(f"Mode watermark tidak dikenal: {mode}")
+
         self.watermark_path = watermark_path
-        self.watermark_exists = os.path.exists(watermark_path)
+        self.mode = mode
+        self.text = text
+        self.rotation = rotation
+        self.tile = tile
+        self.font_name = font_name
+        self.font_size = font_size
+        self.color = color
+        # Watermark teks tidak butuh file gambar
+        self.watermark_exists = mode == 'text' or os.path.exists(watermark_path)
+        # Argumen constructor, untuk membuat manager yang sama di worker process
+        self.settings = {
+            'watermark_path': watermark_path, 'mode': mode, 'text': text, 'rotation': rotation,
+            'tile': tile, 'font_name': font_name, 'font_size': font_size, 'color': color
+        }
+        self._overlay_pages = {}  # {(ukuran halaman, opacity, posisi): halaman PDF watermark}
         
     def add_watermark_to_pdf(self, pdf_path, output_path=None, opacity=0.3, position="center"):
         """
-        Tambahkan watermark ke PDF file menggunakan reportlab
+        Tambahkan watermark ke setiap halaman PDF yang sudah ada (overlay merge
+        dengan pypdf/PyPDF2, isi halaman asli tetap utuh)
 
         Args:
             pdf_path (str): Path ke PDF yang akan diberi watermark
@@ -44,80 +129,237 @@ class WatermarkManager:
             print(f"❌ PDF file not found: {pdf_path}")
             return False
 
+        if not PDF_MERGE_AVAILABLE:
+            print("❌ Watermark merge requires pypdf or PyPDF2 (pip install pypdf)")
+            return False
+
         try:
             # Set output path
             if output_path is None:
                 output_path = pdf_path
 
-            # Buat PDF baru dengan watermark menggunakan reportlab
-            success = self._add_watermark_with_reportlab(pdf_path, output_path, opacity, position)
-
-            if success:
-                print(f"✅ Watermark added to: {os.path.basename(output_path)}")
-                return True
-            else:
-                print(f"❌ Failed to add watermark to: {os.path.basename(pdf_path)}")
-                return False
+            self._merge_watermark(pdf_path, output_path, opacity, position)
+            print(f"✅ Watermark added to: {os.path.basename(output_path)}")
+            return True
 
         except Exception as e:
             print(f"❌ Error adding watermark: {str(e)}")
             return False
+
+    def _merge_watermark(self, pdf_path, output_path, opacity, position):
+        """
+        Merge halaman watermark di atas setiap halaman PDF
+
+        Args:
+            pdf_path (str): Path ke PDF original
+            output_path (str): Path output PDF (boleh sama dengan pdf_path)
+            opacity (float): Transparansi watermark
+            position (str): Posisi watermark
+
+        Returns:
+            int: Jumlah halaman yang diberi watermark
+        """
+        reader = PdfReader(pdf_path)
+        writer = PdfWriter()
+
+        for page in reader.pages:
+            page_width, page_height, transform = _page_display_transform(page)
+            overlay_page = self._get_overlay_page(page_width, page_height, opacity, position)
+            if transform is None:
+                page.merge_page(overlay_page)
+            else:
+                # Halaman diputar (/Rotate) atau origin box tidak di (0, 0): overlay digambar
+                # dalam koordinat tampilan lalu dipetakan ke user space halaman
+                page.merge_transformed_page(overlay_page, transform)
+            writer.add_page(page)
+
+        # Tulis ke file sementara lalu rename agar PDF asli tidak rusak jika gagal
+        temp_path = f"{output_path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, 'wb') as f:
+                writer.write(f)
+            os.replace(temp_path, output_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+        return len(reader.pages)
+
+    def _get_overlay_page(self, page_width, page_height, opacity, position):
+        """
+        Halaman PDF berisi watermark saja, dibuat sekali per ukuran halaman
+
+        Returns:
+            PageObject: Halaman overlay untuk merge_page
+        """
+        key = (round(page_width, 2), round(page_height, 2), opacity, position)
+        overlay_page = self._overlay_pages.get(key)
+        if overlay_page is None:
+            buffer = io.BytesIO()
+            c = canvas.Canvas(buffer, pagesize=(page_width, page_height))
+            self.draw_watermark(c, opacity, position)
+            c.showPage()
+            c.save()
+            buffer.seek(0)
+            overlay_page = self._overlay_pages[key] = PdfReader(buffer).pages[0]
+        return overlay_page
     
-    def _create_watermark_pdf(self, page_width, page_height, opacity, position):
+    def get_prepared_watermark(self, page_width, page_height, position):
         """
-        Buat PDF watermark untuk ukuran halaman tertentu
+        Watermark siap pakai untuk ukuran halaman dan posisi tertentu
+        
+        Hasil resize dan ImageReader (data RGB yang sudah di-encode) di-cache untuk
+        semua WatermarkManager dengan file watermark yang sama; opacity diterapkan
+        saat menggambar (setFillAlpha), bukan di gambar
         
         Args:
             page_width (float): Lebar halaman
             page_height (float): Tinggi halaman
-            opacity (float): Transparansi watermark
             position (str): Posisi watermark
             
         Returns:
-            str: Path ke temporary watermark PDF
+            PreparedWatermark: Gambar, ImageReader, posisi dan ukuran; None jika gagal
         """
         try:
-            # Buat temporary file untuk watermark PDF
-            temp_pdf = tempfile.NamedTemporaryFile(delete=False, suffix='.pdf')
-            temp_pdf.close()
-            
-            # Buat canvas untuk watermark
-            c = canvas.Canvas(temp_pdf.name, pagesize=(page_width, page_height))
-            
-            # Load dan resize watermark image
-            watermark_img = self._prepare_watermark_image(page_width, page_height, opacity)
-            
-            if watermark_img:
-                # Hitung posisi watermark
-                img_width, img_height = watermark_img.size
-                x, y = self._calculate_watermark_position(
-                    page_width, page_height, img_width, img_height, position
-                )
-                
-                # Tambahkan watermark ke canvas
-                c.drawImage(
-                    ImageReader(watermark_img), 
-                    x, y, 
-                    width=img_width, 
-                    height=img_height,
-                    mask='auto'
-                )
-            
-            c.save()
-            return temp_pdf.name
-            
-        except Exception as e:
-            print(f"❌ Error creating watermark PDF: {str(e)}")
+            mtime = os.path.getmtime(self.watermark_path)
+        except OSError:
             return None
+        
+        key = (os.path.abspath(self.watermark_path), mtime, round(page_width, 2), round(page_height, 2),
+               position)
+        with _prepared_lock:
+            prepared = _prepared_watermarks.get(key)
+            if prepared is not None:
+                _prepared_watermarks.move_to_end(key)
+                return prepared
+        
+        watermark_img = self._prepare_watermark_image(page_width, page_height)
+        if watermark_img is None:
+            return None
+        
+        img_width, img_height = watermark_img.size
+        x, y = self._calculate_watermark_position(page_width, page_height, img_width, img_height, position)
+        reader = ImageReader(watermark_img)
+        reader.getRGBData()  # Encode sekali, data disimpan di ImageReader
+        prepared = PreparedWatermark(watermark_img, reader, x, y, img_width, img_height)
+        
+        with _prepared_lock:
+            _prepared_watermarks[key] = prepared
+            while len(_prepared_watermarks) > MAX_PREPARED_WATERMARKS:
+                _prepared_watermarks.popitem(last=False)
+        
+        return prepared
     
-    def _prepare_watermark_image(self, page_width, page_height, opacity):
+    def draw_watermark(self, canv, opacity=0.3, position="center"):
         """
-        Prepare watermark image dengan opacity dan ukuran yang sesuai
-        
+        Gambar watermark di halaman canvas yang sedang dibuat (dipanggil dari
+        callback page template saat build PDF)
+
+        Watermark didefinisikan sekali per dokumen sebagai form XObject untuk
+        setiap ukuran halaman, halaman berikutnya cukup memanggil form tersebut
+
+        Args:
+            canv (Canvas): Canvas reportlab
+            opacity (float): Transparansi watermark (0.0-1.0), lewat setFillAlpha
+            position (str): Posisi watermark
+
+        Returns:
+            bool: True jika watermark digambar
+        """
+        if not self.watermark_exists:
+            return False
+
+        page_width, page_height = canv._pagesize
+        form_name = f"Watermark_{page_width:.0f}x{page_height:.0f}_{position.replace('-', '_')}_{opacity:.3f}"
+        if self.mode == 'text':
+            form_name = f"Text{form_name}_{self.rotation:g}{'_tiled' if self.tile else ''}"
+
+        if not canv._doc.hasForm(form_name):
+            canv.beginForm(form_name)
+            if self.mode == 'text':
+                self._draw_text_watermark(canv, page_width, page_height, opacity, position)
+            else:
+                self._draw_image_watermark(canv, page_width, page_height, opacity, position)
+            canv.endForm()
+
+        canv.doForm(form_name)
+        return True
+
+    def _draw_image_watermark(self, canv, page_width, page_height, opacity, position):
+        """Gambar watermark gambar, opacity lewat graphics state (gambar tetap dengan alpha aslinya)"""
+        prepared = self.get_prepared_watermark(page_width, page_height, position)
+        if not prepared:
+            return
+
+        canv.saveState()
+        canv.setFillAlpha(opacity)
+        canv.drawImage(
+            prepared.reader,
+            prepared.x, prepared.y,
+            width=prepared.width,
+            height=prepared.height,
+            mask='auto'
+        )
+        canv.restoreState()
+
+    def _draw_text_watermark(self, canv, page_width, page_height, opacity, position):
+        """
+        Gambar watermark teks vektor (operator teks PDF)
+
         Args:
+            canv (Canvas): Canvas reportlab
             page_width (float): Lebar halaman
             page_height (float): Tinggi halaman
             opacity (float): Transparansi watermark
+            position (str): Posisi watermark (diabaikan jika tile)
+        """
+        text_width = stringWidth(self.text, self.font_name, self.font_size)
+        angle = math.radians(self.rotation)
+
+        canv.saveState()
+        canv.setFillColorRGB(*self.color)
+        canv.setFillAlpha(opacity)
+
+        if self.tile:
+            # Putar seluruh halaman di titik tengah lalu isi grid yang menutup diagonal halaman
+            canv.translate(page_width / 2, page_height / 2)
+            canv.rotate(self.rotation)
+            extent = math.hypot(page_width, page_height) / 2
+            step_x = text_width + self.font_size * 2
+            step_y = self.font_size * 4
+
+            text = canv.beginText()
+            text.setFont(self.font_name, self.font_size)
+            row_y = -extent
+            row = 0
+            while row_y <= extent:
+                x = -extent - (step_x / 2 if row % 2 else 0)
+                while x <= extent:
+                    text.setTextOrigin(x, row_y)
+                    text.textOut(self.text)
+                    x += step_x
+                row_y += step_y
+                row += 1
+            canv.drawText(text)
+        else:
+            # Bounding box teks setelah diputar menentukan posisi di halaman
+            box_width = abs(text_width * math.cos(angle)) + abs(self.font_size * math.sin(angle))
+            box_height = abs(text_width * math.sin(angle)) + abs(self.font_size * math.cos(angle))
+            x, y = self._calculate_watermark_position(page_width, page_height, box_width, box_height, position)
+            canv.translate(x + box_width / 2, y + box_height / 2)
+            canv.rotate(self.rotation)
+            canv.setFont(self.font_name, self.font_size)
+            canv.drawCentredString(0, -self.font_size * 0.35, self.text)
+
+        canv.restoreState()
+
+    def _prepare_watermark_image(self, page_width, page_height):
+        """
+        Prepare watermark image dengan ukuran yang sesuai
+        
+        Args:
+            page_width (float): Lebar halaman
+            page_height (float): Tinggi halaman
             
         Returns:
             PIL.Image: Processed watermark image
@@ -144,13 +386,6 @@ class WatermarkManager:
             
             img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
             
-            # Apply opacity
-            if opacity < 1.0:
-                # Buat alpha channel dengan opacity
-                alpha = img.split()[-1]  # Get alpha channel
-                alpha = alpha.point(lambda p: int(p * opacity))
-                img.putalpha(alpha)
-            
             return img
             
         except Exception as e:
@@ -194,129 +429,46 @@ class WatermarkManager:
         
         return x, y
 
-    def _add_watermark_with_reportlab(self, pdf_path, output_path, opacity, position):
-        """
-        Tambahkan watermark menggunakan reportlab dengan membaca PDF original
-
-        Args:
-            pdf_path (str): Path ke PDF original
-            output_path (str): Path output PDF
-            opacity (float): Transparansi watermark
-            position (str): Posisi watermark
-
-        Returns:
-            bool: True jika berhasil
-        """
-        try:
-            # Baca PDF original untuk mendapatkan ukuran halaman
-            from reportlab.lib.pagesizes import A4
-            from reportlab.pdfgen import canvas
-            from reportlab.lib.utils import ImageReader
-
-            # Estimasi ukuran halaman (default A4)
-            page_width, page_height = A4
-
-            # Buat temporary file untuk PDF dengan watermark
-            temp_pdf = tempfile.NamedTemporaryFile(delete=False, suffix='.pdf')
-            temp_pdf.close()
-
-            # Buat canvas untuk PDF baru
-            c = canvas.Canvas(temp_pdf.name, pagesize=(page_width, page_height))
-
-            # Load dan prepare watermark image
-            watermark_img = self._prepare_watermark_image(page_width, page_height, opacity)
-
-            if watermark_img:
-                # Hitung posisi watermark
-                img_width, img_height = watermark_img.size
-                x, y = self._calculate_watermark_position(
-                    page_width, page_height, img_width, img_height, position
-                )
-
-                # Tambahkan watermark ke canvas
-                c.drawImage(
-                    ImageReader(watermark_img),
-                    x, y,
-                    width=img_width,
-                    height=img_height,
-                    mask='auto'
-                )
-
-            # Simpan PDF dengan watermark
-            c.save()
-
-            # Copy PDF dengan watermark ke output path
-            import shutil
-            shutil.copy2(temp_pdf.name, output_path)
-
-            # Cleanup temporary file
-            try:
-                os.remove(temp_pdf.name)
-            except:
-                pass
-
-            return True
-
-        except Exception as e:
-            print(f"❌ Error adding watermark with reportlab: {str(e)}")
-            return False
-
-    def _create_simple_watermark_overlay(self, pdf_path, opacity, position):
-        """
-        Buat simple watermark overlay (placeholder for full implementation)
-
-        Args:
-            pdf_path (str): Path ke PDF original
-            opacity (float): Transparansi watermark
-            position (str): Posisi watermark
-
-        Returns:
-            str: Path ke watermark overlay (or None if failed)
+    def add_watermark_to_multiple_pdfs(self, pdf_paths, opacity=0.3, position="center", max_workers=None):
         """
-        try:
-            # For now, just validate that watermark image exists
-            if os.path.exists(self.watermark_path):
-                print(f"   🎨 Watermark image found: {self.watermark_path}")
-                print(f"   📍 Position: {position}, Opacity: {opacity}")
-                return self.watermark_path
-            else:
-                print(f"   ❌ Watermark image not found: {self.watermark_path}")
-                return None
-
-        except Exception as e:
-            print(f"❌ Error creating watermark overlay: {str(e)}")
-            return None
-    
-    def add_watermark_to_multiple_pdfs(self, pdf_paths, opacity=0.3, position="center"):
-        """
-        Tambahkan watermark ke multiple PDF files
+        Tambahkan watermark ke multiple PDF files secara paralel (process pool)
+        
+        Setiap worker membuat halaman watermark sekali lalu merge ke semua
+        PDF yang dikerjakannya
         
         Args:
             pdf_paths (list): List path ke PDF files
             opacity (float): Transparansi watermark
             position (str): Posisi watermark
+            max_workers (int): Jumlah proses (default jumlah CPU, 1 = tanpa pool)
             
         Returns:
-            dict: Dictionary hasil {pdf_path: success_status}
+            dict: Dictionary hasil {pdf_path: {'success', 'pages', 'seconds', 'error'}}
         """
-        results = {}
-        
         if not self.watermark_exists:
             print(f"⚠️  Watermark file not found: {self.watermark_path}")
-            return {path: False for path in pdf_paths}
+            return {path: {'success': False, 'pages': 0, 'seconds': 0.0, 'error': "Watermark file not found"}
+                    for path in pdf_paths}
         
         print(f"🎨 Adding watermark to {len(pdf_paths)} PDF files...")
+        start = time.perf_counter()
         
-        for pdf_path in pdf_paths:
-            try:
-                success = self.add_watermark_to_pdf(pdf_path, opacity=opacity, position=position)
-                results[pdf_path] = success
-            except Exception as e:
-                print(f"❌ Error processing {pdf_path}: {str(e)}")
-                results[pdf_path] = False
+        max_workers = min(max_workers or os.cpu_count() or 1, len(pdf_paths))
+        tasks = [(pdf_path, opacity, position) for pdf_path in pdf_paths]
+        
+        if max_workers <= 1:
+            _init_watermark_worker(self.settings)
+            results = dict(map(_watermark_worker, tasks))
+        else:
+            # Chunk besar agar overhead antar proses kecil dibanding merge per file
+            chunksize = max(1, len(tasks) // (max_workers * 4))
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_watermark_worker,
+                                     initargs=(self.settings,)) as executor:
+                results = dict(executor.map(_watermark_worker, tasks, chunksize=chunksize))
         
-        success_count = sum(1 for success in results.values() if success)
-        print(f"📊 Watermark results: {success_count}/{len(pdf_paths)} files processed")
+        success_count = sum(1 for result in results.values() if result['success'])
+        print(f"📊 Watermark results: {success_count}/{len(pdf_paths)} files processed "
+              f"in {time.perf_counter() - start:.2f}s ({max_workers} worker(s))")
         
         return results
     
@@ -373,6 +525,34 @@ class WatermarkManager:
             print(f"❌ Error creating sample watermark: {str(e)}")
             return False
 
+_worker_manager = None
+
+
+def _init_watermark_worker(settings):
+    """Initializer process pool: satu WatermarkManager (dan cache overlay) per proses"""
+    global _worker_manager
+    _worker_manager = WatermarkManager(**settings)
+
+
+def _watermark_worker(task):
+    """
+    Merge watermark ke satu PDF di dalam worker
+
+    Args:
+        task (tuple): (pdf_path, opacity, position)
+
+    Returns:
+        tuple: (pdf_path, dict hasil dengan waktu proses)
+    """
+    pdf_path, opacity, position = task
+    start = time.perf_counter()
+    try:
+        pages = _worker_manager._merge_watermark(pdf_path, pdf_path, opacity, position)
+        return pdf_path, {'success': True, 'pages': pages, 'seconds': time.perf_counter() - start, 'error': None}
+    except Exception as e:
+        return pdf_path, {'success': False, 'pages': 0, 'seconds': time.perf_counter() - start, 'error': str(e)}
+
+
 def test_watermark():
     """Test watermark functionality"""
     print("🧪 Testing Watermark Functionality...")
@@ -422,5 +602,46 @@ def test_watermark():
     else:
         print("❌ No PDF files found for testing")
 
+def main(argv=None):
+    """Command line untuk memberi watermark ke PDF yang sudah ada (tanpa argumen: test)"""
+    parser = argparse.ArgumentParser(description="Tambahkan watermark ke PDF yang sudah ada")
+    parser.add_argument('paths', nargs='*', help="File PDF atau folder berisi PDF")
+    parser.add_argument('--watermark', default="watermark.png", help="File gambar watermark")
+    parser.add_argument('--text', default=None, help="Pakai watermark teks vektor dengan teks ini")
+    parser.add_argument('--rotation', type=float, default=45, help="Rotasi watermark teks (derajat)")
+    parser.add_argument('--tile', action='store_true', help="Ulangi watermark teks di seluruh halaman")
+    parser.add_argument('--opacity', type=float, default=0.3, help="Transparansi watermark (0.0-1.0)")
+    parser.add_argument('--position', default="bottom-right", help="Posisi watermark")
+    parser.add_argument('--workers', type=int, default=None, help="Jumlah proses (default jumlah CPU)")
+    args = parser.parse_args(argv)
+
+    if not args.paths:
+        test_watermark()
+        return 0
+
+    pdf_paths = []
+    for path in args.paths:
+        if os.path.isdir(path):
+            pdf_paths.extend(os.path.join(path, name) for name in sorted(os.listdir(path))
+                             if name.lower().endswith('.pdf'))
+        else:
+            pdf_paths.append(path)
+
+    if args.text:
+        manager = WatermarkManager(args.watermark, mode='text', text=args.text, rotation=args.rotation, tile=args.tile)
+    else:
+        manager = WatermarkManager(args.watermark)
+
+    results = manager.add_watermark_to_multiple_pdfs(
+        pdf_paths, opacity=args.opacity, position=args.position, max_workers=args.workers
+    )
+    for pdf_path, result in results.items():
+        if result['success']:
+            print(f"   ✅ {os.path.basename(pdf_path)}: {result['pages']} page(s), {result['seconds']:.3f}s")
+        else:
+            print(f"   ❌ {os.path.basename(pdf_path)}: {result['error']}")
+
+    return 0 if all(result['success'] for result in results.values()) else 1
+
 if __name__ == "__main__":
-    test_watermark()
+    sys.exit(main())
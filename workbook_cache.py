@@ -0,0 +1,227 @@
+"""
+Workbook Cache Module
+Cache LRU untuk workbook dan data sheet yang sudah di-parse, dipakai bersama
+oleh semua reader dalam satu proses
+"""
+
+import os
+import sys
+import threading
+import zipfile
+from collections import OrderedDict
+
+# Batas memori default untuk seluruh isi cache
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# Perkiraan rasio ukuran object model openpyxl terhadap ukuran XML sheet
+OPENPYXL_SIZE_FACTOR = 10
+
+
+def file_key(file_path):
+    """
+    Key identitas file: (path absolut, mtime, size)
+
+    Args:
+        file_path (str): Path ke file
+
+    Returns:
+        tuple: Key yang berubah setiap kali isi file berubah
+    """
+    stat = os.stat(file_path)
+    return (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
+
+
+def estimate_xlsx_bytes(file_path, factor=OPENPYXL_SIZE_FACTOR):
+    """
+    Perkiraan memori untuk workbook yang sudah di-parse
+
+    Args:
+        file_path (str): Path ke file xlsx
+        factor (int): Pengali terhadap ukuran XML (tidak terkompresi)
+
+    Returns:
+        int: Perkiraan ukuran dalam bytes
+    """
+    try:
+        with zipfile.ZipFile(file_path) as archive:
+            xml_size = sum(info.file_size for info in archive.infolist())
+    except Exception:
+        xml_size = os.path.getsize(file_path)
+    return xml_size * factor
+
+
+def estimate_data_bytes(value):
+    """
+    Perkiraan kasar ukuran memori struktur data (list/dict/string)
+
+    Args:
+        value: Data sheet (list of lists, dict formatting, dst)
+
+    Returns:
+        int: Perkiraan ukuran dalam bytes
+    """
+    size = 0
+    stack = [value]
+    seen = set()
+    while stack:
+        item = stack.pop()
+        if isinstance(item, (list, tuple, dict, set)):
+            # Objek yang dipakai bersama (misal dict style) dihitung sekali
+            if id(item) in seen:
+                continue
+            seen.add(id(item))
+            size += sys.getsizeof(item)
+            if isinstance(item, dict):
+                stack.extend(item.values())
+            else:
+                stack.extend(item)
+        elif hasattr(item, '__dict__') and not isinstance(item, type):
+            # Objek data sederhana (misal StyleGrid): hitung atributnya
+            if id(item) in seen:
+                continue
+            seen.add(id(item))
+            size += sys.getsizeof(item)
+            stack.append(vars(item))
+        else:
+            size += sys.getsizeof(item)
+    return size
+
+
+class WorkbookCache:
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Initialize cache
+
+        Args:
+            max_bytes (int): Batas memori (perkiraan) sebelum entry lama di-evict
+        """
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # {(file_key, kind): (value, size)}
+        self._loading = {}  # {key: threading.Event} item yang sedang di-parse
+        self._lock = threading.RLock()
+
+    def get(self, file_path, kind, loader, size=None):
+        """
+        Ambil item dari cache, atau load lalu simpan jika belum ada
+
+        Args:
+            file_path (str): Path file sumber
+            kind (tuple): Jenis item, contoh ('openpyxl', 'workbook') atau
+                ('native', 'values', sheet_name)
+            loader (callable): Fungsi tanpa argumen untuk mem-parse item
+            size (int/callable): Ukuran item dalam bytes, atau fungsi
+                size(value); default memakai estimate_data_bytes
+
+        Returns:
+            Item yang di-cache
+        """
+        key = (file_key(file_path), kind)
+
+        while True:
+            with self._lock:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return self._entries[key][0]
+
+                loading = self._loading.get(key)
+                if loading is None:
+                    # Thread ini yang mem-parse, thread lain untuk key yang sama menunggu
+                    self._loading[key] = loading = threading.Event()
+                    self.misses += 1
+                    break
+
+            # Parse oleh thread lain: tunggu lalu cek cache lagi (atau parse sendiri
+            # jika parse tersebut gagal atau hasilnya terlalu besar untuk di-cache)
+            loading.wait()
+
+        # Parse di luar lock agar cache hit dan load file lain tidak ikut menunggu
+        try:
+            value = loader()
+
+            if size is None:
+                size = estimate_data_bytes(value)
+            elif callable(size):
+                size = size(value)
+
+            with self._lock:
+                # Entry dari versi file lama tidak akan dipakai lagi
+                self._drop_stale(key[0])
+
+                if size <= self.max_bytes:
+                    self._entries[key] = (value, size)
+                    self.current_bytes += size
+                    self._evict()
+
+            return value
+        finally:
+            with self._lock:
+                del self._loading[key]
+            loading.set()
+
+    def _drop_stale(self, current_file_key):
+        """Hapus entry untuk path yang sama dengan mtime/size berbeda"""
+        path = current_file_key[0]
+        for key in list(self._entries):
+            if key[0][0] == path and key[0] != current_file_key:
+                self._remove(key)
+
+    def _remove(self, key):
+        _, size = self._entries.pop(key)
+        self.current_bytes -= size
+
+    def _evict(self):
+        """Evict entry paling lama tidak dipakai sampai di bawah batas memori"""
+        while self.current_bytes > self.max_bytes and self._entries:
+            self._remove(next(iter(self._entries)))
+
+    def invalidate(self, file_path):
+        """
+        Hapus semua entry untuk file tertentu
+
+        Args:
+            file_path (str): Path file
+        """
+        path = os.path.abspath(file_path)
+        with self._lock:
+            for key in list(self._entries):
+                if key[0][0] == path:
+                    self._remove(key)
+
+    def clear(self):
+        """Kosongkan seluruh cache"""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        """
+        Statistik cache
+
+        Returns:
+            dict: Jumlah entry, memori terpakai, hits dan misses
+        """
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses
+            }
+
+
+_workbook_cache = WorkbookCache()
+
+
+def get_workbook_cache():
+    """
+    Cache workbook bersama untuk seluruh proses
+
+    Returns:
+        WorkbookCache: Instance cache global
+    """
+    return _workbook_cache
@@ -0,0 +1,263 @@
+"""
+XLSX Metadata Module
+Modul untuk membaca metadata sheet (nama dan used range) langsung dari zip xlsx
+tanpa mem-parse isi sel
+"""
+
+import os
+import re
+import hashlib
+import posixpath
+import zipfile
+import xml.etree.ElementTree as ET
+from openpyxl.utils.cell import range_boundaries
+from workbook_cache import get_workbook_cache
+
+# Perkiraan rata-rata ukuran XML satu sel terisi, contoh: <c r="B12" s="3" t="s"><v>17</v></c>
+APPROX_BYTES_PER_CELL = 36
+
+# <dimension> selalu berada sebelum <sheetData>, cukup baca bagian awal part sheet
+_DIMENSION_RE = re.compile(rb'<(?:\w+:)?dimension\s+ref="([^"]+)"')
+_SHEET_DATA_RE = re.compile(rb'<(?:\w+:)?sheetData[\s>/]')
+_HEAD_CHUNK_SIZE = 16 * 1024
+_HEAD_MAX_SIZE = 256 * 1024
+
+
+def _local_name(tag):
+    """Nama tag/atribut XML tanpa namespace"""
+    return tag.rsplit('}', 1)[-1]
+
+
+class XlsxMetadataReader:
+    def __init__(self, file_path):
+        """
+        Initialize metadata reader dengan file path
+
+        Args:
+            file_path (str): Path ke file Excel (.xlsx/.xlsm)
+        """
+        self.file_path = file_path
+        self.archive = None
+        self.sheet_parts = {}  # {sheet_name: path part di dalam zip}
+        self.workbook_parts = {}  # {tipe relasi: path part}, contoh 'sharedStrings', 'styles'
+        self.sheet_defined_names = {}  # {sheet_name: [(nama, formula)]}, contoh print area
+        self.date1904 = False
+        self._shared_parts_digest = None
+        self.load_archive()
+
+    def load_archive(self):
+        """Buka zip xlsx dan baca daftar sheet dari xl/workbook.xml"""
+        try:
+            if not os.path.exists(self.file_path):
+                raise FileNotFoundError(f"File tidak ditemukan: {self.file_path}")
+
+            self.archive = zipfile.ZipFile(self.file_path)
+            self.sheet_parts = self._read_sheet_parts()
+
+        except Exception as e:
+            self.close()
+            raise Exception(f"Error reading Excel metadata: {str(e)}")
+
+    def _read_sheet_parts(self):
+        """
+        Petakan nama sheet ke part XML-nya lewat workbook.xml dan relasinya
+
+        Returns:
+            dict: {sheet_name: part_path} sesuai urutan sheet di workbook
+        """
+        workbook_part = 'xl/workbook.xml'
+        rels_part = 'xl/_rels/workbook.xml.rels'
+
+        # Relationship id -> target part
+        targets = {}
+        self.workbook_parts = {}
+        rels_root = ET.fromstring(self.archive.read(rels_part))
+        for rel in rels_root:
+            if _local_name(rel.tag) != 'Relationship':
+                continue
+            target = rel.get('Target', '')
+            if target.startswith('/'):
+                target = target.lstrip('/')
+            else:
+                target = posixpath.normpath(posixpath.join(posixpath.dirname(workbook_part), target))
+            targets[rel.get('Id')] = target
+            rel_type = rel.get('Type', '').rsplit('/', 1)[-1]
+            self.workbook_parts.setdefault(rel_type, target)
+
+        sheet_parts = {}
+        local_names = []  # [(index sheet, nama, formula)] definedName dengan localSheetId
+        workbook_root = ET.fromstring(self.archive.read(workbook_part))
+        for element in workbook_root.iter():
+            tag = _local_name(element.tag)
+            if tag == 'workbookPr':
+                self.date1904 = element.get('date1904', '0').lower() in ('1', 'true')
+                continue
+            if tag == 'definedName':
+                if element.get('localSheetId') is not None:
+                    local_names.append((int(element.get('localSheetId')), element.get('name'), element.text or ""))
+                continue
+            if tag != 'sheet':
+                continue
+            rel_id = None
+            for attr_name, attr_value in element.attrib.items():
+                if _local_name(attr_name) == 'id' and attr_name != 'id':
+                    rel_id = attr_value
+                    break
+            sheet_parts[element.get('name')] = targets.get(rel_id)
+
+        # Print area dan print titles disimpan sebagai nama lokal per index sheet
+        sheet_names = list(sheet_parts)
+        self.sheet_defined_names = {}
+        for sheet_index, name, formula in local_names:
+            if sheet_index < len(sheet_names):
+                self.sheet_defined_names.setdefault(sheet_names[sheet_index], []).append((name, formula))
+
+        return sheet_parts
+
+    def get_sheet_names(self):
+        """
+        Mendapatkan daftar nama sheet
+
+        Returns:
+            list: List nama sheet
+        """
+        return list(self.sheet_parts.keys())
+
+    def get_sheet_part(self, sheet_name):
+        """
+        Mendapatkan path part XML untuk sheet tertentu
+
+        Args:
+            sheet_name (str): Nama sheet
+
+        Returns:
+            str: Path part di dalam zip (contoh: xl/worksheets/sheet1.xml)
+        """
+        if sheet_name not in self.sheet_parts:
+            raise Exception(f"Sheet '{sheet_name}' tidak ditemukan")
+
+        part = self.sheet_parts[sheet_name]
+        if not part or part not in self.archive.NameToInfo:
+            raise Exception(f"Part untuk sheet '{sheet_name}' tidak ditemukan")
+
+        return part
+
+    def _get_shared_parts_digest(self):
+        """
+        Digest part yang dipakai bersama semua sheet (shared strings, styles, epoch)
+
+        Returns:
+            bytes: SHA-1 digest
+        """
+        if self._shared_parts_digest is None:
+            digest = hashlib.sha1()
+            digest.update(b'date1904=1' if self.date1904 else b'date1904=0')
+            for rel_type in ('sharedStrings', 'styles'):
+                part = self.workbook_parts.get(rel_type)
+                if part and part in self.archive.NameToInfo:
+                    digest.update(rel_type.encode('ascii'))
+                    digest.update(self.archive.read(part))
+            self._shared_parts_digest = digest.digest()
+
+        return self._shared_parts_digest
+
+    def get_sheet_fingerprint(self, sheet_name):
+        """
+        Fingerprint isi sheet: hash XML mentah sheet ditambah shared strings
+        dan styles (nilai dan formatting sheet bergantung pada keduanya)
+
+        Args:
+            sheet_name (str): Nama sheet
+
+        Returns:
+            str: SHA-1 hex digest, berubah jika nilai atau formatting sheet berubah
+        """
+        part = self.get_sheet_part(sheet_name)
+
+        digest = hashlib.sha1(self._get_shared_parts_digest())
+        with self.archive.open(part) as stream:
+            for chunk in iter(lambda: stream.read(1024 * 1024), b""):
+                digest.update(chunk)
+
+        return digest.hexdigest()
+
+    def _read_dimension(self, part):
+        """
+        Baca atribut ref dari <dimension> di awal part sheet
+
+        Args:
+            part (str): Path part sheet
+
+        Returns:
+            str: Range seperti "A1:E9", atau None jika tidak ada
+        """
+        head = b""
+        with self.archive.open(part) as stream:
+            while len(head) < _HEAD_MAX_SIZE:
+                chunk = stream.read(_HEAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                head += chunk
+
+                match = _DIMENSION_RE.search(head)
+                if match:
+                    return match.group(1).decode('ascii')
+                if _SHEET_DATA_RE.search(head):
+                    break
+
+        return None
+
+    def get_sheets_info(self):
+        """
+        Mendapatkan informasi semua sheet tanpa membaca isi sel
+
+        Returns:
+            dict: Dictionary dengan nama sheet sebagai key dan info sheet sebagai value.
+                'filled_cells' adalah perkiraan dari ukuran XML sheet (bukan hitungan pasti)
+        """
+        sheets_info = get_workbook_cache().get(
+            self.file_path, ('metadata', 'sheets_info'), self._read_sheets_info
+        )
+        return {sheet_name: dict(info) for sheet_name, info in sheets_info.items()}
+
+    def _read_sheets_info(self):
+        """Baca info semua sheet dari zip (tanpa cache)"""
+        sheets_info = {}
+
+        for sheet_name in self.sheet_parts:
+            max_row = 0
+            max_col = 0
+            dimension = None
+            xml_size = 0
+
+            try:
+                part = self.get_sheet_part(sheet_name)
+                xml_size = self.archive.getinfo(part).file_size
+                dimension = self._read_dimension(part)
+
+                if dimension:
+                    _, _, max_col, max_row = range_boundaries(dimension)
+                    max_row = max_row or 0
+                    max_col = max_col or 0
+            except Exception as e:
+                print(f"⚠️  Could not read dimension for '{sheet_name}': {str(e)}")
+
+            approx_cells = xml_size // APPROX_BYTES_PER_CELL
+            if max_row and max_col:
+                approx_cells = min(approx_cells, max_row * max_col)
+
+            sheets_info[sheet_name] = {
+                'max_row': max_row,
+                'max_col': max_col,
+                'dimension': dimension,
+                'filled_cells': approx_cells,
+                'approximate': True
+            }
+
+        return sheets_info
+
+    def close(self):
+        """Tutup file zip"""
+        if self.archive:
+            self.archive.close()
+            self.archive = None
@@ -0,0 +1,480 @@
+"""
+XLSX Native Reader Module
+Backend pembaca Excel alternatif yang mem-parse XML sheet langsung dari zip
+(zipfile + iterparse) tanpa membangun object model openpyxl
+"""
+
+import xml.etree.ElementTree as ET
+from openpyxl.utils import get_column_letter, column_index_from_string
+from openpyxl.utils.cell import range_boundaries
+from openpyxl.utils.datetime import from_excel, from_ISO8601, CALENDAR_WINDOWS_1900, CALENDAR_MAC_1904
+from openpyxl.styles.numbers import BUILTIN_FORMATS, is_date_format, is_timedelta_format
+from xlsx_metadata import XlsxMetadataReader, _local_name
+from workbook_cache import get_workbook_cache
+from style_grid import StyleGrid
+from style_resolver import color_descriptor
+
+# Elemen sheet (di luar nilai sel) yang menentukan tampilan hasil print/export
+PRINT_LAYOUT_TAGS = ('col', 'sheetFormatPr', 'pageSetUpPr', 'printOptions', 'pageMargins', 'pageSetup',
+                     'headerFooter', 'oddHeader', 'oddFooter', 'evenHeader', 'evenFooter',
+                     'firstHeader', 'firstFooter', 'brk')
+
+SPREADSHEET_NAMESPACES = (
+    'http://schemas.openxmlformats.org/spreadsheetml/2006/main',
+    'http://purl.oclc.org/ooxml/spreadsheetml/main',
+)
+
+
+def _cast_number(value):
+    """Konversi angka dalam string ke int/float (sama seperti openpyxl)"""
+    if "." in value or "E" in value or "e" in value:
+        return float(value)
+    return int(value)
+
+
+class XlsxNativeReader:
+    def __init__(self, file_path):
+        """
+        Initialize native reader dengan file path
+
+        Args:
+            file_path (str): Path ke file Excel (.xlsx/.xlsm)
+        """
+        self.file_path = file_path
+        self.metadata = XlsxMetadataReader(file_path)
+        self.archive = self.metadata.archive
+        self.epoch = CALENDAR_MAC_1904 if self.metadata.date1904 else CALENDAR_WINDOWS_1900
+        self.ns = self._detect_namespace()
+
+        self.shared_strings = None  # Di-decode sekali saat pertama dibutuhkan
+        self.styles = None  # List format per style id (index cellXfs)
+        self.date_styles = set()
+        self.timedelta_styles = set()
+        self.load_workbook()
+
+    def _detect_namespace(self):
+        """Cari namespace SpreadsheetML yang dipakai workbook (transitional/strict)"""
+        head = self.archive.read('xl/workbook.xml')[:2048]
+        for ns in SPREADSHEET_NAMESPACES:
+            if ns.encode('ascii') in head:
+                return ns
+        return SPREADSHEET_NAMESPACES[0]
+
+    def _tag(self, name):
+        return f"{{{self.ns}}}{name}"
+
+    def load_workbook(self):
+        """Decode tabel shared strings dan styles sekali untuk seluruh workbook"""
+        try:
+            (self.shared_strings, self.styles,
+             self.date_styles, self.timedelta_styles) = get_workbook_cache().get(
+                self.file_path, ('native', 'tables'), self._read_tables
+            )
+        except Exception as e:
+            self.close()
+            raise Exception(f"Error loading Excel file: {str(e)}")
+
+    def _read_tables(self):
+        """
+        Parse tabel shared strings dan styles
+
+        Returns:
+            tuple: (shared_strings, styles, date_styles, timedelta_styles)
+        """
+        self.date_styles = set()
+        self.timedelta_styles = set()
+        shared_strings = self._read_shared_strings()
+        styles = self._read_styles()
+        return shared_strings, styles, self.date_styles, self.timedelta_styles
+
+    def _read_shared_strings(self):
+        """
+        Decode xl/sharedStrings.xml
+
+        Returns:
+            list: List string sesuai index shared string
+        """
+        part = self.metadata.workbook_parts.get('sharedStrings')
+        if not part or part not in self.archive.NameToInfo:
+            return []
+
+        si_tag = self._tag('si')
+        t_tag = self._tag('t')
+        rph_tag = self._tag('rPh')
+        strings = []
+
+        with self.archive.open(part) as stream:
+            for _, element in ET.iterparse(stream, events=('end',)):
+                if element.tag != si_tag:
+                    continue
+                # Gabungkan semua run <t>, abaikan teks phonetic (<rPh>)
+                text = []
+                for child in element:
+                    if child.tag == t_tag:
+                        text.append(child.text or "")
+                    elif child.tag != rph_tag:
+                        text.extend(t.text or "" for t in child.iter(t_tag))
+                strings.append("".join(text))
+                element.clear()
+
+        return strings
+
+    def _read_color(self, element):
+        """Deskriptor warna dari elemen warna (rgb, theme atau indexed)"""
+        if element is None:
+            return None
+        theme = element.get('theme')
+        indexed = element.get('indexed')
+        return color_descriptor(
+            rgb=element.get('rgb'),
+            theme=int(theme) if theme is not None else None,
+            tint=float(element.get('tint', 0)),
+            indexed=int(indexed) if indexed is not None else None
+        )
+
+    def _read_styles(self):
+        """
+        Parse xl/styles.xml menjadi tabel format per style id
+
+        Returns:
+            list: List dict format (bentuk sama dengan formatting ExcelReader)
+        """
+        part = self.metadata.workbook_parts.get('styles')
+        default_style = {
+            'font_bold': None,
+            'font_size': 11,
+            'font_color': None,
+            'fill_color': '00000000',
+            'alignment': {'horizontal': None, 'vertical': None},
+            'border': False
+        }
+        if not part or part not in self.archive.NameToInfo:
+            return [default_style]
+
+        root = ET.fromstring(self.archive.read(part))
+
+        num_formats = {}
+        for num_fmt in root.iter(self._tag('numFmt')):
+            num_formats[int(num_fmt.get('numFmtId'))] = num_fmt.get('formatCode', '')
+
+        fonts = []
+        fonts_element = root.find(self._tag('fonts'))
+        for font in (fonts_element if fonts_element is not None else []):
+            bold = font.find(self._tag('b'))
+            size = font.find(self._tag('sz'))
+            fonts.append({
+                'bold': bold is not None and bold.get('val', '1').lower() not in ('0', 'false'),
+                'size': float(size.get('val')) if size is not None and size.get('val') else None,
+                'color': self._read_color(font.find(self._tag('color')))
+            })
+
+        fills = []
+        fills_element = root.find(self._tag('fills'))
+        for fill in (fills_element if fills_element is not None else []):
+            pattern = fill.find(self._tag('patternFill'))
+            fg_color = pattern.find(self._tag('fgColor')) if pattern is not None else None
+            if fg_color is None:
+                fills.append('00000000')
+            else:
+                fills.append(self._read_color(fg_color))
+
+        borders = []
+        borders_element = root.find(self._tag('borders'))
+        for border in (borders_element if borders_element is not None else []):
+            has_border = False
+            for side in ('left', 'right', 'top', 'bottom'):
+                side_element = border.find(self._tag(side))
+                if side_element is not None and side_element.get('style'):
+                    has_border = True
+                    break
+            borders.append(has_border)
+
+        styles = []
+        cell_xfs = root.find(self._tag('cellXfs'))
+        for style_id, xf in enumerate(cell_xfs if cell_xfs is not None else []):
+            font = fonts[int(xf.get('fontId', 0))] if fonts else None
+            fill_id = int(xf.get('fillId', 0))
+            border_id = int(xf.get('borderId', 0))
+            alignment = xf.find(self._tag('alignment'))
+
+            num_fmt_id = int(xf.get('numFmtId', 0))
+            number_format = num_formats.get(num_fmt_id, BUILTIN_FORMATS.get(num_fmt_id, 'General'))
+            if is_date_format(number_format):
+                self.date_styles.add(style_id)
+                if is_timedelta_format(number_format):
+                    self.timedelta_styles.add(style_id)
+
+            styles.append({
+                'font_bold': font['bold'] if font else None,
+                'font_size': font['size'] if font else 11,
+                'font_color': font['color'] if font else None,
+                'fill_color': fills[fill_id] if fill_id < len(fills) else None,
+                'alignment': {
+                    'horizontal': alignment.get('horizontal') if alignment is not None else None,
+                    'vertical': alignment.get('vertical') if alignment is not None else None
+                },
+                'border': borders[border_id] if border_id < len(borders) else False
+            })
+
+        return styles or [default_style]
+
+    def get_sheet_names(self):
+        """
+        Mendapatkan daftar nama sheet
+
+        Returns:
+            list: List nama sheet
+        """
+        return self.metadata.get_sheet_names()
+
+    def get_sheets_info(self):
+        """
+        Mendapatkan informasi semua sheet (dari metadata, tanpa membaca sel)
+
+        Returns:
+            dict: Dictionary dengan nama sheet sebagai key dan info sheet sebagai value
+        """
+        return self.metadata.get_sheets_info()
+
+    def _parse_value(self, element, data_type, style_id, value_tag, inline_tag, t_tag):
+        """Konversi elemen <c> menjadi nilai Python (sama seperti openpyxl data_only)"""
+        if data_type == 'inlineStr':
+            inline = element.find(inline_tag)
+            if inline is None:
+                return None
+            return "".join(t.text or "" for t in inline.iter(t_tag))
+
+        value = element.findtext(value_tag, None) or None
+        if value is None:
+            return None
+
+        if data_type == 'n':
+            value = _cast_number(value)
+            if style_id in self.date_styles:
+                try:
+                    value = from_excel(value, self.epoch, timedelta=style_id in self.timedelta_styles)
+                except (OverflowError, ValueError):
+                    value = "#VALUE!"
+        elif data_type == 's':
+            value = self.shared_strings[int(value)]
+        elif data_type == 'b':
+            value = bool(int(value))
+        elif data_type == 'd':
+            value = from_ISO8601(value)
+
+        return value
+
+    def iter_rows(self, sheet_name, layout=None):
+        """
+        Iterasi baris sheet dengan iterparse (lazy)
+
+        Args:
+            sheet_name (str): Nama sheet
+            layout (dict): Optional, diisi 'merged_cells', 'column_widths', 'row_heights'
+                dan 'print_layout' selama parsing (satu kali baca XML)
+
+        Yields:
+            tuple: (values, style_ids) - list nilai sel dan list style id per baris,
+                dimulai dari baris 1 tanpa celah (baris kosong diisi list kosong)
+        """
+        part = self.metadata.get_sheet_part(sheet_name)
+        if layout is None:
+            layout = {}
+        merged_cells = layout.setdefault('merged_cells', [])
+        column_widths = layout.setdefault('column_widths', {})
+        row_heights = layout.setdefault('row_heights', {})
+        # Kolom, baris tersembunyi dan pengaturan halaman (memengaruhi hasil export Excel)
+        print_layout = layout.setdefault('print_layout', [])
+
+        row_tag = self._tag('row')
+        cell_tag = self._tag('c')
+        value_tag = self._tag('v')
+        inline_tag = self._tag('is')
+        t_tag = self._tag('t')
+        col_tag = self._tag('col')
+        merge_tag = self._tag('mergeCell')
+        print_layout_tags = {self._tag(name) for name in PRINT_LAYOUT_TAGS}
+        column_cache = {}
+
+        next_row = 1
+        with self.archive.open(part) as stream:
+            for _, element in ET.iterparse(stream, events=('end',)):
+                if element.tag != row_tag:
+                    if element.tag == merge_tag:
+                        merged_cells.append(element.get('ref'))
+                    elif element.tag in print_layout_tags:
+                        if element.tag == col_tag and element.get('width'):
+                            column_widths[get_column_letter(int(element.get('min')))] = float(element.get('width'))
+                        # Atribut relasi (r:id ke printerSettings) dan style id kolom (index
+                        # cellXfs, bergeser jika sheet lain menambah style) diabaikan
+                        print_layout.append((_local_name(element.tag), element.text,
+                                             sorted((name, value) for name, value in element.attrib.items()
+                                                    if not name.startswith('{') and name != 'style')))
+                    continue
+
+                row_ref = element.get('r')
+                row_idx = int(row_ref) if row_ref else next_row
+                if element.get('ht'):
+                    row_heights[row_idx] = float(element.get('ht'))
+                if element.get('hidden') in ('1', 'true'):
+                    print_layout.append(('row', None, [('hidden', '1'), ('r', str(row_idx))]))
+
+                # Isi baris yang tidak ada di XML
+                while next_row < row_idx:
+                    yield [], []
+                    next_row += 1
+
+                values = []
+                style_ids = []
+                col_counter = 0
+                for cell in element.iter(cell_tag):
+                    ref = cell.get('r')
+                    if ref:
+                        letters = ref.rstrip('0123456789')
+                        col_idx = column_cache.get(letters)
+                        if col_idx is None:
+                            col_idx = column_cache[letters] = column_index_from_string(letters)
+                    else:
+                        col_idx = col_counter + 1
+                    col_counter = col_idx
+
+                    if col_idx > len(values) + 1:
+                        gap = col_idx - len(values) - 1
+                        values.extend([None] * gap)
+                        style_ids.extend([0] * gap)
+
+                    style = cell.get('s')
+                    style_id = int(style) if style else 0
+                    values.append(self._parse_value(cell, cell.get('t', 'n'), style_id,
+                                                    value_tag, inline_tag, t_tag))
+                    style_ids.append(style_id)
+
+                element.clear()
+                yield values, style_ids
+                next_row = row_idx + 1
+
+    def get_sheet_values(self, sheet_name, layout=None):
+        """
+        Mendapatkan nilai dan style id sheet sebagai grid persegi
+
+        Args:
+            sheet_name (str): Nama sheet
+            layout (dict): Optional, diisi merged cells dan dimensi (lihat iter_rows)
+
+        Returns:
+            tuple: (values, style_ids) - list of lists dengan lebar kolom yang sama.
+                Hasil dipakai bersama lewat cache, jangan diubah
+        """
+        values, style_ids, sheet_layout = get_workbook_cache().get(
+            self.file_path, ('native', 'values', sheet_name),
+            lambda: self._load_sheet_values(sheet_name)
+        )
+        if layout is not None:
+            layout.update(sheet_layout)
+        return values, style_ids
+
+    def _load_sheet_values(self, sheet_name):
+        """Parse nilai, style id dan layout sheet (tanpa cache)"""
+        layout = {}
+        values = []
+        style_ids = []
+        for row_values, row_styles in self.iter_rows(sheet_name, layout):
+            values.append(row_values)
+            style_ids.append(row_styles)
+
+        # Merged range ikut menentukan ukuran sheet (seperti MergedCell di openpyxl)
+        width = max((len(row) for row in values), default=0)
+        height = len(values)
+        for merged_range in layout['merged_cells']:
+            _, _, max_col, max_row = range_boundaries(merged_range)
+            width = max(width, max_col)
+            height = max(height, max_row)
+
+        while len(values) < height:
+            values.append([])
+            style_ids.append([])
+
+        for row_values, row_styles in zip(values, style_ids):
+            if len(row_values) < width:
+                gap = width - len(row_values)
+                row_values.extend([None] * gap)
+                row_styles.extend([0] * gap)
+
+        return values, style_ids, layout
+
+    def get_sheet_data(self, sheet_name):
+        """
+        Mendapatkan data dari sheet tertentu
+
+        Args:
+            sheet_name (str): Nama sheet
+
+        Returns:
+            list: List of lists berisi data sheet
+        """
+        values, _ = self.get_sheet_values(sheet_name)
+        return [[str(cell) if cell is not None else "" for cell in row] for row in values]
+
+    def get_sheet_with_formatting(self, sheet_name):
+        """
+        Mendapatkan sheet dengan informasi formatting
+
+        Args:
+            sheet_name (str): Nama sheet
+
+        Returns:
+            dict: Dictionary berisi data dan formatting info (bentuk sama dengan ExcelReader,
+                'formatting' adalah StyleGrid)
+        """
+        layout = {}
+        values, style_ids = self.get_sheet_values(sheet_name, layout)
+
+        formatted_data = {
+            'data': [],
+            'formatting': StyleGrid(),
+            'merged_cells': layout['merged_cells'],
+            'column_widths': layout['column_widths'],
+            'row_heights': layout['row_heights'],
+            'print_layout': layout['print_layout']
+        }
+
+        style_grid = formatted_data['formatting']
+        for row_values, row_styles in zip(values, style_ids):
+            formatted_data['data'].append([str(cell) if cell is not None else "" for cell in row_values])
+            style_grid.append_row(self.map_style_ids(row_styles, style_grid))
+
+        return formatted_data
+
+    def map_style_ids(self, row_styles, style_grid):
+        """
+        Petakan style id cellXfs satu baris ke style id StyleGrid
+
+        Args:
+            row_styles (list): Style id cellXfs per sel
+            style_grid (StyleGrid): Tabel style tujuan
+
+        Returns:
+            list: Style id di style_grid
+        """
+        return [style_grid.style_id_for(style_id, lambda: self.get_style(style_id))
+                for style_id in row_styles]
+
+    def get_style(self, style_id):
+        """
+        Mendapatkan format untuk style id tertentu
+
+        Args:
+            style_id (int): Index cellXfs
+
+        Returns:
+            dict: Format dengan bentuk sama seperti formatting ExcelReader
+        """
+        if style_id < len(self.styles):
+            return self.styles[style_id]
+        return self.styles[0]
+
+    def close(self):
+        """Tutup file zip"""
+        if self.metadata:
+            self.metadata.close()
+        self.archive = None